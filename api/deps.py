@@ -6,13 +6,35 @@ from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from core import config, security, context
 from db.session import SessionLocal
-from models.user import User, Role, ApiKey
+from models.user import User, Role, ApiKey, Organization
 from schemas.user import TokenPayload
 from uuid import UUID
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{config.settings.API_V1_STR}/auth/login")
 api_key_header = APIKeyHeader(name="X-API-KEY", auto_error=False)
 
+_tenant_tiers = None # org_id -> plan name, bounded and expiring so plan changes are picked up
+
+def get_tenant_tier(db: Session, org_id: Optional[UUID]) -> str:
+    """Resolve the subscription plan name used to label tenant metrics and select rate limits."""
+    global _tenant_tiers
+    if not org_id:
+        return "unknown"
+    from services.cache import CacheService, InMemoryCache
+    if _tenant_tiers is None:
+        _tenant_tiers = InMemoryCache(max_entries=config.settings.TENANT_TIER_CACHE_MAX_ENTRIES)
+    key = str(org_id)
+    tier = _tenant_tiers.get(key)
+    if tier is None:
+        from models.platform import Plan
+        plan_name = db.query(Plan.name).join(
+            Organization, Organization.subscription_plan_id == Plan.id
+        ).filter(Organization.id == org_id).scalar()
+        tier = plan_name or "free"
+        _tenant_tiers.setex(key, config.settings.TENANT_TIER_CACHE_TTL_SECONDS, tier)
+        CacheService.register_tenant_tier(key, tier)
+    return tier
+
 def get_db() -> Generator:
     db = SessionLocal()
     try:
@@ -55,7 +77,8 @@ def get_current_user(
         user_id=user.id,
         org_id=user.org_id,
         role=user.role,
-        request_id=request_id
+        request_id=request_id,
+        tier=get_tenant_tier(db, user.org_id)
     )
     context.set_context(ctx)
     return user
@@ -92,7 +115,8 @@ def get_api_key(
             org_id=key_obj.org_id,
             api_key_id=key_obj.id,
             role=Role.ENGINEER, # API Keys typically imply engineer/system access
-            request_id=request_id
+            request_id=request_id,
+            tier=get_tenant_tier(db, key_obj.org_id)
         )
         context.set_context(ctx)
         return key_obj
@@ -112,3 +136,19 @@ def require_admin(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=403, detail="Admin privileges required")
     return current_user
 
+
+def rate_limit(endpoint_class: str):
+    """Per-tenant token bucket for one endpoint class; 429 with Retry-After once it is empty."""
+    def limiter(current_user: User = Depends(get_current_user)):
+        if not config.settings.RATE_LIMIT_ENABLED:
+            return
+        from core.ratelimit import rate_limiter, retry_after_header
+        ctx = context.get_context()
+        decision = rate_limiter.acquire(current_user.org_id, endpoint_class, tier=ctx.tier if ctx else None)
+        if not decision.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded for {endpoint_class} requests",
+                headers=retry_after_header(decision)
+            )
+    return limiter
@@ -105,3 +105,53 @@ class TenantMiddleware(BaseHTTPMiddleware):
                 logger.warning(f"Tenant extraction failed: {e}")
 
         return await call_next(request)
+
+class AdmissionMiddleware:
+    """
+    Priority admission control for API routes (see core.admission).
+    Shed requests get 503 with Retry-After before reaching auth, the database or the thread pool.
+    Plain ASGI rather than BaseHTTPMiddleware so a slot is held until the response,
+    including streamed bodies such as /predict/batch, has been fully sent.
+    """
+    def __init__(self, app, controller=None):
+        self.app = app
+        from core.admission import AdmissionController
+        self.controller = controller or AdmissionController(
+            max_in_flight=config.settings.ADMISSION_MAX_IN_FLIGHT,
+            shares=config.settings.ADMISSION_CAPACITY_SHARES,
+            queue_timeouts=config.settings.ADMISSION_QUEUE_TIMEOUTS,
+            target_delays=config.settings.ADMISSION_TARGET_DELAYS,
+            max_queue=config.settings.ADMISSION_MAX_QUEUE
+        )
+        self.routes = {
+            f"{config.settings.API_V1_STR}{prefix}": priority
+            for prefix, priority in config.settings.ADMISSION_ROUTE_PRIORITIES.items()
+        }
+
+    async def __call__(self, scope, receive, send):
+        # Health, metrics and docs are never shed
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not config.settings.ADMISSION_CONTROL_ENABLED or not path.startswith(config.settings.API_V1_STR):
+            await self.app(scope, receive, send)
+            return
+
+        from core.admission import classify
+        priority = classify(path, self.routes)
+        if not await self.controller.acquire(priority):
+            retry_after = self.controller.retry_after()
+            response = JSONResponse(
+                status_code=503,
+                content={
+                    "error_code": "SERVICE_OVERLOADED",
+                    "message": f"Server is busy; retry {priority.name.lower()} priority requests in {retry_after}s."
+                },
+                headers={"Retry-After": str(retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        start = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(priority, time.monotonic() - start)
@@ -7,6 +7,7 @@ from api import deps
 from models.ml import Asset
 from models.user import User, Role
 from schemas.ml import Asset as AssetSchema, AssetCreate, AssetUpdate
+from services.asset_status_service import AssetStatusService
 
 router = APIRouter()
 
@@ -32,6 +33,8 @@ def create_asset(
         org_id=current_user.org_id
     )
     db.add(asset)
+    db.flush()
+    AssetStatusService.sync_asset(db, asset)
     db.commit()
     db.refresh(asset)
     return asset
@@ -53,6 +56,7 @@ def update_asset(
         setattr(asset, field, value)
     
     db.add(asset)
+    AssetStatusService.sync_asset(db, asset)
     db.commit()
     db.refresh(asset)
     return asset
@@ -74,5 +78,6 @@ def delete_asset(
     from datetime import datetime
     asset.deleted_at = datetime.utcnow()
     db.add(asset)
+    AssetStatusService.remove_asset(db, asset.id)
     db.commit()
     return asset
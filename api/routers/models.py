@@ -1,4 +1,4 @@
-from typing import Any, List
+from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from uuid import UUID
@@ -20,6 +20,15 @@ def read_models(
     models = db.query(MLModel).filter(MLModel.org_id == current_user.org_id).offset(skip).limit(limit).all()
     return models
 
+@router.get("/drift")
+def read_drift_status(
+    asset_type: Optional[str] = None,
+    current_user: User = Depends(deps.require_role([Role.ADMIN, Role.ENGINEER])),
+) -> Any:
+    """Latest scheduled KS/PSI drift status of live telemetry (per asset type, or a summary)."""
+    from ml.inference import inference_engine
+    return inference_engine.drift.status(asset_type)
+
 @router.post("/register", response_model=MLModelSchema)
 def register_model(
     *,
@@ -30,7 +39,8 @@ def register_model(
     model = MLModel(
         **model_in.dict(),
         org_id=current_user.org_id,
-        active=False # Inactive by default
+        active=False, # Inactive by default
+        deployment_stage="registered" # Gets no traffic until activated or shadowed
     )
     db.add(model)
     db.commit()
@@ -59,10 +69,55 @@ def activate_model(
     
     for other in others:
         other.active = False
+        other.deployment_stage = "retired" # Must not start receiving shadow traffic
         db.add(other)
     
     model.active = True
+    model.deployment_stage = "active"
     db.add(model)
     db.commit()
     db.refresh(model)
+    
+    # Serve the new model from this worker immediately; others re-resolve after the pool TTL
+    from ml.inference import inference_engine
+    inference_engine.model_pool.invalidate(model.org_id, model.asset_type, model.model_type)
     return model
+
+@router.post("/{id}/shadow", response_model=MLModelSchema)
+def shadow_model(
+    *,
+    db: Session = Depends(deps.get_db),
+    id: UUID,
+    current_user: User = Depends(deps.require_role([Role.ADMIN, Role.ENGINEER])),
+) -> Any:
+    """Mirror live traffic to an inactive model so it can be compared before activation."""
+    model = db.query(MLModel).filter(MLModel.id == id, MLModel.org_id == current_user.org_id).first()
+    if not model:
+        raise HTTPException(status_code=404, detail="Model not found")
+    if model.active:
+        raise HTTPException(status_code=409, detail="Model is already active")
+    
+    model.deployment_stage = "shadow_evaluation"
+    db.add(model)
+    db.commit()
+    db.refresh(model)
+    
+    from ml.inference import inference_engine
+    inference_engine.model_pool.invalidate(model.org_id, model.asset_type, model.model_type)
+    return model
+
+@router.get("/{id}/shadow")
+def read_shadow_stats(
+    *,
+    db: Session = Depends(deps.get_db),
+    id: UUID,
+    current_user: User = Depends(deps.require_role([Role.ADMIN, Role.ENGINEER, Role.VIEWER])),
+) -> Any:
+    """Live-traffic agreement and latency of a shadow model versus the active one (this worker)."""
+    model = db.query(MLModel).filter(MLModel.id == id, MLModel.org_id == current_user.org_id).first()
+    if not model:
+        raise HTTPException(status_code=404, detail="Model not found")
+    
+    from ml.inference import inference_engine
+    stats = inference_engine.shadow.stats(str(model.id)) if inference_engine.shadow else {}
+    return {"model_id": str(model.id), "deployment_stage": model.deployment_stage, "shadow": stats}
@@ -1,18 +1,26 @@
-from typing import Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from api import deps
+from db.session import SessionLocal
 from models.ml import Asset, Prediction
 from models.registry import TaskType
 from models.user import User, Organization, Role
 from models.platform import AuditLog, Alert
 from ml.inference import inference_engine as engine
-from schemas.prediction import PredictionRequest, PredictionResponse
+from ml.batching import BatcherOverloadedError
+from schemas.prediction import PredictionRequest, PredictionResponse, BatchPredictionRequest
 from services.data_quality import data_quality_service
-from core.ratelimit import limiter
-from starlette.requests import Request
+from services.intelligence import IntelligenceService
+from services.prediction_writer import prediction_writer
+from services.monitoring_service import MonitoringService, drift_monitor
+from core.config import settings
+from starlette.responses import StreamingResponse
 from datetime import datetime
+from uuid import UUID
+import asyncio
 import json
 import logging
 
@@ -21,113 +29,261 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+def _parse_task_type(model_type: str) -> TaskType:
+    try:
+        task_type_str = model_type.upper()
+        # Handle simple mapping if frontend sends different strings
+        if "RUL" in task_type_str:
+            return TaskType.RUL
+        elif "PRECURSOR" in task_type_str:
+            return TaskType.PRECURSOR
+        elif "CLUSTER" in task_type_str:
+            return TaskType.CLUSTERING
+        elif "DRIFT" in task_type_str:
+            return TaskType.DRIFT
+        # Fallback or strict match
+        return TaskType(model_type.lower())
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid model type: {model_type}")
+
+def _compose_result(asset_type: str, health_state: Any, prob_rul: Dict[str, Any], ml_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine physics health, probabilistic RUL and the ML output, plus the explanation."""
+    final_result = {
+        "health_vectors": {
+            "mechanical": health_state.mechanical_health_score,
+            "thermal": health_state.thermal_health_score,
+            "electrical": health_state.electrical_health_score,
+            "operational": health_state.operational_health_score
+        },
+        "cumulative_damage": health_state.total_cumulative_damage,
+        "rul_estimate": prob_rul,
+        "ml_prediction": ml_result,
+        "confidence_score": health_state.confidence_score
+    }
+    try:
+        from services.explanation_simulation import ExplanationEngine
+        final_result["explanation"] = ExplanationEngine.generate_explanation(
+            asset_type,
+            final_result["health_vectors"],
+            ml_result,
+            health_state.confidence_score
+        )
+    except Exception as e:
+        logger.error(f"Explanation Engine Error: {e}")
+    return final_result
+
+def _serving_model_id(task_type: TaskType, org_id: Any, asset_type: str) -> Optional[UUID]:
+    """Tenant MLModel that served the last prediction for this key (None for global models); no query."""
+    model_id = engine.model_pool.resolved_model_id(org_id, asset_type, task_type)
+    return UUID(model_id) if model_id else None
+
+def _record_prediction(task_type: TaskType, org_id: Any, asset_id: Any, model_id: Optional[UUID], ml_result: Dict[str, Any]):
+    """Hand the ML output to the buffered prediction writer (never blocks on the database)."""
+    if not settings.PREDICTION_WRITER_ENABLED or task_type == TaskType.DRIFT:
+        return
+    prediction_writer.record(org_id, asset_id, model_id, ml_result)
+
+def _ingest_health_and_rul(db: Session, asset: Asset, data: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+    """Stage on the request session: queue ingestion, fetch health, derive RUL from the same objects."""
+    # A. Physical Degradation Processing (ASYNC INGESTION)
+    IntelligenceService.ingest_sensor_data(db, asset.id, data)
+    # Fetch CURRENT state (without waiting for this batch to process)
+    health_state = IntelligenceService.get_asset_health_state(db, asset.id)
+    # C. Probabilistic RUL (Physically Derived)
+    prob_rul = IntelligenceService.get_probabilistic_rul(db, asset.id, asset=asset, health=health_state)
+    db.commit()
+    # Reload here so the event loop never triggers a lazy refresh of the expired state
+    db.refresh(health_state)
+    return health_state, prob_rul
+
+def _infer(task_type: TaskType, data: Dict[str, Any], org_id: Any, asset_type: str, asset_id: Any) -> Dict[str, Any]:
+    """Stage on its own session (Session objects aren't thread-safe); tenant model lookups are TTL-cached."""
+    db = SessionLocal()
+    try:
+        return engine.predict_for_asset(db, task_type, data, org_id=org_id, asset_type=asset_type, asset_id=asset_id)
+    finally:
+        db.close()
+
+def _decay_confidence(asset_id: Any):
+    db = SessionLocal()
+    try:
+        MonitoringService.decay_confidence(db, asset_id)
+    except Exception as e:
+        logger.error(f"Monitoring Service Error: {e}")
+    finally:
+        db.close()
+
+def _raise_alert(asset_id: Any, final_result: Dict[str, Any]):
+    db = SessionLocal()
+    try:
+        from services.alert_engine import alert_engine
+        health_state = IntelligenceService.get_asset_health_state(db, asset_id)
+        alert_engine.process_health_and_alert(db, asset_id, health_state, final_result)
+    except Exception as e:
+        logger.error(f"Alert Engine Error: {e}")
+    finally:
+        db.close()
+
 @router.post("/", response_model=PredictionResponse)
-@limiter.limit("60/minute") 
-def predict(
-    request: Request,
+async def predict(
+    background_tasks: BackgroundTasks,
     *,
     db: Session = Depends(deps.get_db),
     pred_in: PredictionRequest,
     current_user: User = Depends(deps.require_role([Role.ADMIN, Role.ENGINEER, Role.VIEWER])),
 ) -> Any:
+    """
+    Ingestion/health/RUL and model inference run concurrently in the threadpool;
+    drift monitoring and alert persistence run after the response is sent.
+    """
     # 0. Data Quality Check
     errors = data_quality_service.validate_input(pred_in.data)
     if errors:
         raise HTTPException(status_code=400, detail={"message": "Data Quality check failed", "errors": errors})
 
-    # 1. Validate Asset
-    asset = db.query(Asset).filter(Asset.id == pred_in.asset_id, Asset.org_id == current_user.org_id).first()
+    # 1. Map Model Type to TaskType
+    task_type = _parse_task_type(pred_in.model_type)
+
+    # 2. Validate Asset
+    asset = await run_in_threadpool(
+        lambda: db.query(Asset).filter(Asset.id == pred_in.asset_id, Asset.org_id == current_user.org_id).first()
+    )
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
-
-    # 2. Map Model Type to TaskType
-    try:
-        task_type_str = pred_in.model_type.upper()
-        # Handle simple mapping if frontend sends different strings
-        if "RUL" in task_type_str:
-            task_type = TaskType.RUL
-        elif "PRECURSOR" in task_type_str:
-            task_type = TaskType.PRECURSOR
-        elif "CLUSTER" in task_type_str:
-            task_type = TaskType.CLUSTERING
-        elif "DRIFT" in task_type_str:
-            task_type = TaskType.DRIFT
-        else:
-             # Fallback or strict match
-             task_type = TaskType(pred_in.model_type.lower())
-    except ValueError:
-        raise HTTPException(status_code=400, detail=f"Invalid model type: {pred_in.model_type}")
+    asset_id, org_id, asset_type = asset.id, asset.org_id, asset.type
 
     # 3. Predict & Update Health
-    try:
-        # A. Physical Degradation Processing (ASYNC INGESTION)
-        # Convert telemetry + context into degradation estimates via Kafka
-        # health_state = IntelligenceService.process_telemetry_window(db, asset.id, pred_in.data)
-        
-        # Queue ingestion event
-        IntelligenceService.ingest_sensor_data(db, asset.id, pred_in.data)
-        
-        # Fetch CURRENT state (without waiting for this batch to process)
-        health_state = IntelligenceService.get_asset_health_state(db, asset.id)
-        
+    # Both stages always run to completion before we respond: the request session
+    # must not be closed by get_db while ingestion is still using it in another thread
+    ingested, ml_result = await asyncio.gather(
+        run_in_threadpool(_ingest_health_and_rul, db, asset, pred_in.data),
         # B. ML Model Inference (If requested or as secondary signal)
-        ml_result = engine.predict(task_type, pred_in.data)
-        
-        # C. Probabilistic RUL (Physically Derived)
-        prob_rul = IntelligenceService.get_probabilistic_rul(db, asset.id)
-        
-        # Combine results
-        final_result = {
-            "health_vectors": {
-                "mechanical": health_state.mechanical_health_score,
-                "thermal": health_state.thermal_health_score,
-                "electrical": health_state.electrical_health_score,
-                "operational": health_state.operational_health_score
-            },
-            "cumulative_damage": health_state.total_cumulative_damage,
-            "rul_estimate": prob_rul,
-            "ml_prediction": ml_result,
-            "confidence_score": health_state.confidence_score
-        }
-
-        # D. Explanation Engine
-        try:
-            from services.explanation_simulation import ExplanationEngine
-            explanation = ExplanationEngine.generate_explanation(
-                asset.type, 
-                final_result["health_vectors"], 
-                ml_result, 
-                health_state.confidence_score
-            )
-            final_result["explanation"] = explanation
-        except Exception as e:
-            logger.error(f"Explanation Engine Error: {e}")
-            
-        # E. Drift Monitoring (Background Logic)
-        try:
-            from services.monitoring_service import MonitoringService
-            rul_val = prob_rul.get("mean", 0)
-            MonitoringService.monitor_model_drift(db, asset.id, rul_val)
-        except Exception as e:
-            logger.error(f"Monitoring Service Error: {e}")
-        
-    except ValueError as e:
+        run_in_threadpool(_infer, task_type, pred_in.data, org_id, asset_type, asset_id),
+        return_exceptions=True
+    )
+    try:
+        for outcome in (ingested, ml_result):
+            if isinstance(outcome, BaseException):
+                raise outcome
+        health_state, prob_rul = ingested
+    except (ValueError, BatcherOverloadedError) as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Prediction Error: {e}")
         raise HTTPException(status_code=500, detail=f"Intelligence layer failure: {e}")
-        
-    # 4. Thresholds & Alerts
+
+    model_id = _serving_model_id(task_type, org_id, asset_type)
+    _record_prediction(task_type, org_id, asset_id, model_id, ml_result)
+
+    # Combine results (D. Explanation Engine included)
+    final_result = _compose_result(asset_type, health_state, prob_rul, ml_result)
+
+    # E. Drift Monitoring: O(1) in-memory update; only a detected shift touches the database.
+    # Off the event loop: the first update for a key restores its state from Redis
+    drift_detected, _ = await run_in_threadpool(drift_monitor.update, org_id, asset_id, model_id, prob_rul.get("mean", 0))
+    if drift_detected:
+        background_tasks.add_task(_decay_confidence, asset_id)
+
+    # 4. Thresholds & Alerts: decided on the loaded state, persisted in the background
+    from services.alert_engine import alert_engine
+    draft = alert_engine.assess(health_state)
+    if draft:
+        final_result["active_alert"] = {"id": None, "severity": draft["severity"], "title": draft["title"], "pending": True}
+        background_tasks.add_task(_raise_alert, asset_id, final_result)
+
+    return {"prediction": final_result, "asset_id": str(asset_id)}
+
+def _apply_batch_side_effects(org_id: Any, drifted_asset_ids: List[Any], alert_candidates: List[Tuple[Any, float, Dict[str, Any]]]):
+    """Confidence decay and alert persistence for a whole batch: one UPDATE and one alert commit."""
+    db = SessionLocal()
     try:
         from services.alert_engine import alert_engine
-        alert = alert_engine.process_health_and_alert(db, asset.id, health_state, final_result)
-        if alert:
-            final_result["active_alert"] = {
-                "id": str(alert.id),
-                "severity": alert.severity,
-                "title": alert.title
-            }
+        MonitoringService.decay_confidence_many(db, drifted_asset_ids)
+        alert_engine.raise_alerts(db, org_id, alert_candidates)
     except Exception as e:
-        logger.error(f"Alert Engine Error: {e}")
+        logger.error(f"Batch side effects failed: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+@router.post("/batch", dependencies=[Depends(deps.rate_limit("batch"))])
+def predict_batch(
+    background_tasks: BackgroundTasks,
+    *,
+    db: Session = Depends(deps.get_db),
+    batch_in: BatchPredictionRequest,
+    current_user: User = Depends(deps.require_role([Role.ADMIN, Role.ENGINEER, Role.VIEWER])),
+) -> Any:
+    """
+    Predictions for many assets of the caller's org in one request.
+    Assets and health states are loaded with bulk queries, inference runs as one batch per
+    asset type, RUL is estimated in one vectorized pass and outbox events are bulk inserted.
+    Confidence decay and alerts are applied in bulk after the response is sent.
+    All results are computed before responding; the body is NDJSON in request order:
+    {"asset_id", "prediction"} or {"asset_id", "error"}.
+    """
+    items = batch_in.items
+    if len(items) > settings.PREDICTION_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.PREDICTION_BATCH_MAX_ITEMS} items per batch")
+    task_type = _parse_task_type(batch_in.model_type)
+    org_id = current_user.org_id
+
+    errors: Dict[int, Any] = {}
+    for i, item in enumerate(items):
+        dq_errors = data_quality_service.validate_input(item.data)
+        if dq_errors:
+            errors[i] = {"message": "Data Quality check failed", "errors": dq_errors}
+
+    asset_ids = list({item.asset_id for item in items})
+    assets = {a.id: a for a in db.query(Asset).filter(Asset.id.in_(asset_ids), Asset.org_id == org_id).all()}
+    for i, item in enumerate(items):
+        if i not in errors and item.asset_id not in assets:
+            errors[i] = "Asset not found"
+    valid = [i for i in range(len(items)) if i not in errors]
+
+    results: Dict[int, Dict[str, Any]] = {}
+    if valid:
+        try:
+            IntelligenceService.ingest_sensor_batch(db, org_id, [(items[i].asset_id, items[i].data) for i in valid])
+            health_states = IntelligenceService.get_asset_health_states(db, org_id, [items[i].asset_id for i in valid])
+            ml_results = engine.predict_for_assets(
+                db, task_type, org_id, [(items[i].asset_id, assets[items[i].asset_id].type, items[i].data) for i in valid]
+            )
+            rul_estimates = IntelligenceService.get_probabilistic_rul_batch(db, org_id, health_states)
+            db.commit()
+        except (ValueError, BatcherOverloadedError) as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except Exception as e:
+            logger.error(f"Batch Prediction Error: {e}")
+            raise HTTPException(status_code=500, detail=f"Intelligence layer failure: {e}")
+
+        from services.alert_engine import alert_engine
+        drifted, alert_candidates, assessed = [], [], set()
+        for i, ml_result in zip(valid, ml_results):
+            asset = assets[items[i].asset_id]
+            health_state = health_states[asset.id]
+            model_id = _serving_model_id(task_type, org_id, asset.type)
+            _record_prediction(task_type, org_id, asset.id, model_id, ml_result)
+            drift_detected, _ = drift_monitor.update(org_id, asset.id, model_id, rul_estimates.get(asset.id, {}).get("mean", 0))
+            if drift_detected:
+                drifted.append(asset.id)
+            results[i] = _compose_result(asset.type, health_state, rul_estimates.get(asset.id, {}), ml_result)
+            if asset.id not in assessed:
+                assessed.add(asset.id)
+                draft = alert_engine.assess(health_state)
+                if draft:
+                    results[i]["active_alert"] = {"id": None, "severity": draft["severity"], "title": draft["title"], "pending": True}
+                    alert_candidates.append((asset.id, health_state.confidence_score, draft))
+        if drifted or alert_candidates:
+            background_tasks.add_task(_apply_batch_side_effects, org_id, list(set(drifted)), alert_candidates)
+
+    def _lines():
+        for i, item in enumerate(items):
+            line = {"asset_id": str(item.asset_id)}
+            if i in results:
+                line["prediction"] = results[i]
+            else:
+                line["error"] = errors[i]
+            yield json.dumps(line, default=str) + "\n"
 
-    return {"prediction": final_result, "asset_id": str(asset.id)}
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
@@ -0,0 +1,168 @@
+import math
+import time
+import heapq
+import asyncio
+import itertools
+import logging
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+# --- Metrics ---
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight_requests",
+    "Requests currently admitted and being served",
+    ["priority"]
+)
+ADMISSION_DECISIONS = Counter(
+    "admission_decisions_total",
+    "Admission control outcomes by request priority",
+    ["priority", "result"] # admitted, queued, shed, timeout
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds",
+    "Time admitted requests spent waiting for a slot",
+    ["priority"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+class Priority(IntEnum):
+    CRITICAL = 0 # Ingestion, alerting and safety paths
+    NORMAL = 1
+    LOW = 2 # Analytics and reporting
+
+def classify(path: str, routes: Dict[str, str]) -> Priority:
+    """Priority of a path: the longest matching prefix in routes wins, NORMAL otherwise."""
+    best, priority = -1, Priority.NORMAL
+    for prefix, name in routes.items():
+        if len(prefix) > best and (path == prefix or path.startswith(prefix.rstrip("/") + "/")):
+            best, priority = len(prefix), Priority[name.upper()]
+    return priority
+
+class AdmissionController:
+    """
+    Bounds concurrent requests and decides who waits when the API is saturated.
+
+    - Each priority may use a share of max_in_flight slots (CRITICAL the whole pool,
+      LOW only part of it), so critical traffic always finds headroom.
+    - Requests beyond their share wait in a priority queue; a freed slot goes to
+      the highest-priority waiter. Waiting is bounded by a per-priority timeout
+      (0 = never wait).
+    - An EWMA of queue wait drives early shedding: once it exceeds a priority's
+      target delay, new requests of that priority are rejected instead of queued.
+    Rejections carry a Retry-After estimate from the queue delay and service time.
+    All state is touched from the event loop only, so no locks are needed.
+    """
+    def __init__(
+        self,
+        max_in_flight: int = 40,
+        shares: Optional[Dict[str, float]] = None,
+        queue_timeouts: Optional[Dict[str, float]] = None,
+        target_delays: Optional[Dict[str, float]] = None,
+        max_queue: int = 1000,
+        alpha: float = 0.1
+    ):
+        shares = shares or {"critical": 1.0, "normal": 0.8, "low": 0.5}
+        queue_timeouts = queue_timeouts or {"critical": 5.0, "normal": 1.0, "low": 0.0}
+        target_delays = target_delays or {"critical": 2.0, "normal": 0.5, "low": 0.1}
+        self.max_in_flight = max_in_flight
+        self.limits = [max(1, int(max_in_flight * shares[p.name.lower()])) for p in Priority]
+        self.queue_timeouts = [queue_timeouts[p.name.lower()] for p in Priority]
+        self.target_delays = [target_delays[p.name.lower()] for p in Priority]
+        self.max_queue = max_queue
+        self.alpha = alpha
+        self.in_flight = 0
+        self.in_flight_by_priority = [0] * len(Priority)
+        self.queue_delay = 0.0 # EWMA seconds spent waiting for a slot
+        self.service_time = 0.0 # EWMA seconds a request holds its slot
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def queued(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.queue_delay + self.service_time))
+
+    def _reserve(self, priority: int):
+        self.in_flight += 1
+        self.in_flight_by_priority[priority] += 1
+        ADMISSION_IN_FLIGHT.labels(priority=Priority(priority).name.lower()).inc()
+
+    def _record_wait(self, priority: Priority, waited: float):
+        self.queue_delay += self.alpha * (waited - self.queue_delay)
+        ADMISSION_QUEUE_WAIT.labels(priority=priority.name.lower()).observe(waited)
+
+    def _can_run(self, priority: Priority) -> bool:
+        if self.in_flight >= self.limits[priority]:
+            return False
+        # Don't overtake waiters of the same or higher priority
+        return not any(p <= priority and not fut.done() for p, _, fut in self._waiters)
+
+    async def acquire(self, priority: Priority) -> bool:
+        """Take a slot, waiting if allowed. False means the request should be rejected."""
+        label = priority.name.lower()
+        if self._can_run(priority):
+            self._reserve(priority)
+            self._record_wait(priority, 0.0)
+            ADMISSION_DECISIONS.labels(priority=label, result="admitted").inc()
+            return True
+        timeout = self.queue_timeouts[priority]
+        if timeout <= 0 or self.queue_delay > self.target_delays[priority] or self.queued() >= self.max_queue:
+            ADMISSION_DECISIONS.labels(priority=label, result="shed").inc()
+            return False
+
+        start = time.monotonic()
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), fut))
+        ADMISSION_DECISIONS.labels(priority=label, result="queued").inc()
+        try:
+            await asyncio.wait({fut}, timeout=timeout)
+        except asyncio.CancelledError:
+            # Client went away: give back a slot that was already handed over
+            if fut.done():
+                self.release(priority, 0.0)
+            fut.cancel()
+            raise
+        # A timed-out request still tells us how long the queue is
+        self._record_wait(priority, time.monotonic() - start)
+        if fut.done():
+            # The slot was reserved for us by _wake()
+            ADMISSION_DECISIONS.labels(priority=label, result="admitted").inc()
+            return True
+        fut.cancel()
+        ADMISSION_DECISIONS.labels(priority=label, result="timeout").inc()
+        return False
+
+    def release(self, priority: Priority, duration: float):
+        self.in_flight -= 1
+        self.in_flight_by_priority[priority] -= 1
+        self.service_time += self.alpha * (duration - self.service_time)
+        ADMISSION_IN_FLIGHT.labels(priority=priority.name.lower()).dec()
+        self._wake()
+
+    def _wake(self):
+        """Hand freed slots to the highest-priority waiters that fit within their share."""
+        while self._waiters:
+            p, _, fut = self._waiters[0]
+            if fut.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.in_flight >= self.limits[p]:
+                break
+            heapq.heappop(self._waiters)
+            self._reserve(p)
+            fut.set_result(True)
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "in_flight": self.in_flight,
+            "in_flight_by_priority": {p.name.lower(): self.in_flight_by_priority[p] for p in Priority},
+            "queued": self.queued(),
+            "queue_delay_seconds": round(self.queue_delay, 4),
+            "service_time_seconds": round(self.service_time, 4)
+        }
@@ -0,0 +1,119 @@
+import time
+import threading
+import logging
+from enum import Enum
+from typing import Any, Callable, Tuple, Type
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+# --- Metrics ---
+
+BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0=closed, 1=half_open, 2=open)",
+    ["dependency"]
+)
+BREAKER_CALLS = Counter(
+    "circuit_breaker_calls_total",
+    "Calls routed through a circuit breaker by outcome",
+    ["dependency", "outcome"] # success, failure, rejected
+)
+
+class CircuitState(str, Enum):
+    CLOSED = "CLOSED"
+    HALF_OPEN = "HALF_OPEN"
+    OPEN = "OPEN"
+
+_STATE_VALUE = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the breaker is open."""
+
+class CircuitBreaker:
+    """
+    Guards calls to an external dependency (Redis, Kafka).
+    - CLOSED: calls pass through; consecutive failures are counted.
+    - OPEN: calls are rejected immediately until reset_timeout elapses.
+    - HALF_OPEN: a single probe call is let through; success closes, failure re-opens.
+    """
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        expected_exceptions: Tuple[Type[BaseException], ...] = (Exception,)
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.expected_exceptions = expected_exceptions
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        BREAKER_STATE.labels(dependency=name).set(0)
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def _set_state(self, state: CircuitState):
+        if state != self._state:
+            logger.warning(f"Circuit breaker '{self.name}' {self._state.value} -> {state.value}")
+        self._state = state
+        BREAKER_STATE.labels(dependency=self.name).set(_STATE_VALUE[state])
+
+    def _acquire(self) -> bool:
+        """Decide whether a call may proceed. Returns True if the call is the half-open probe."""
+        with self._lock:
+            if self._state == CircuitState.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError(f"Circuit '{self.name}' is open")
+                self._set_state(CircuitState.HALF_OPEN)
+            if self._state == CircuitState.HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError(f"Circuit '{self.name}' is probing")
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def _on_success(self, probe: bool):
+        with self._lock:
+            self._failures = 0
+            if probe:
+                self._probe_in_flight = False
+                self._set_state(CircuitState.CLOSED)
+
+    def _on_failure(self, probe: bool):
+        with self._lock:
+            self._failures += 1
+            if probe:
+                self._probe_in_flight = False
+            if probe or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(CircuitState.OPEN)
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        try:
+            probe = self._acquire()
+        except CircuitOpenError:
+            BREAKER_CALLS.labels(dependency=self.name, outcome="rejected").inc()
+            raise
+        try:
+            result = func(*args, **kwargs)
+        except self.expected_exceptions:
+            self._on_failure(probe)
+            BREAKER_CALLS.labels(dependency=self.name, outcome="failure").inc()
+            raise
+        except BaseException:
+            # Unexpected errors are not the dependency's fault; release the probe slot
+            if probe:
+                with self._lock:
+                    self._probe_in_flight = False
+            raise
+        self._on_success(probe)
+        BREAKER_CALLS.labels(dependency=self.name, outcome="success").inc()
+        return result
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Forsee Predictive Maintenance Platform"
@@ -25,6 +25,134 @@ class Settings(BaseSettings):
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: Optional[str] = None
+    REDIS_SOCKET_TIMEOUT_MS: float = 8.0
+    REDIS_CONNECT_TIMEOUT_MS: float = 50.0
+    
+    # Kafka
+    KAFKA_MAX_BLOCK_MS: int = 8 # Producers on the request path
+    KAFKA_WORKER_MAX_BLOCK_SECONDS: float = 10.0 # Outbox worker: first send waits for broker metadata
+    
+    # Circuit Breaker (Redis / Kafka)
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RESET_TIMEOUT_SECONDS: float = 10.0
+    
+    # In-Memory Cache (fallback when Redis is unreachable)
+    CACHE_MEMORY_MAX_ENTRIES: int = 10000
+    CACHE_MEMORY_MAX_BYTES: int = 64 * 1024 * 1024
+    
+    # Inference Micro-Batching
+    INFERENCE_BATCHING_ENABLED: bool = True
+    INFERENCE_MAX_BATCH_SIZE: int = 32
+    INFERENCE_MAX_BATCH_WAIT_MS: float = 5.0
+    INFERENCE_MAX_QUEUE_SIZE: int = 1024
+    INFERENCE_TIMEOUT_SECONDS: float = 5.0
+    # Worker processes for CPU-bound inference (0 = run in the API process)
+    INFERENCE_PROCESS_WORKERS: int = 0
+    INFERENCE_PROCESS_MAX_PENDING: int = 64
+    # Result cache for repeated inputs (keyed by model id + quantized features)
+    INFERENCE_RESULT_CACHE_ENABLED: bool = True
+    INFERENCE_RESULT_CACHE_MAX_ENTRIES: int = 10000
+    INFERENCE_RESULT_CACHE_DECIMALS: int = 4
+    # Per-model latency/error aggregates written to ModelMetric / registry metrics (0 = off)
+    INFERENCE_METRICS_FLUSH_SECONDS: float = 60.0
+    
+    # Shadow Evaluation (MLModel rows in deployment_stage 'shadow_evaluation' see copies of live inputs)
+    SHADOW_EVALUATION_ENABLED: bool = True
+    SHADOW_QUEUE_SIZE: int = 256
+    SHADOW_SAMPLE_RATE: float = 1.0
+    SHADOW_MAX_CANDIDATES: int = 2
+    SHADOW_RUL_TOLERANCE: float = 0.1 # Relative difference still counted as agreement
+    SHADOW_POOL_MAX_BYTES: int = 512 * 1024 * 1024 # Separate from MODEL_POOL_MAX_BYTES; shadow loads never evict live models
+    
+    # Model Hot Reload
+    MODEL_HOT_RELOAD_ENABLED: bool = True
+    MODEL_RELOAD_POLL_SECONDS: float = 10.0
+    
+    # Model Artifacts (read-only mmap shares page cache across workers)
+    MODEL_ARTIFACT_MMAP: bool = True
+    
+    # Post-training CPU optimization (ONNX export / int8); requires onnx, onnxruntime, skl2onnx
+    MODEL_OPTIMIZATION_ENABLED: bool = False
+    MODEL_OPTIMIZATION_MAX_FIDELITY_LOSS: float = 0.01
+    ONNX_INTRA_OP_THREADS: int = 0 # 0 = ONNX Runtime default
+    
+    # Serving SLO for model selection (unset = newly trained models are always activated)
+    MODEL_SELECTION_LATENCY_BUDGET_MS: Optional[float] = None
+    MODEL_SELECTION_MEMORY_BUDGET_BYTES: Optional[int] = None
+    
+    # Per-Tenant Model Pool
+    MODEL_POOL_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    MODEL_POOL_RESOLVE_TTL_SECONDS: float = 30.0
+    MODEL_POOL_MAX_KEYS: int = 10000 # Cached (org, asset type, task) resolutions and compiled feature layouts
+    
+    # Sequence RUL Inference (per-asset window; matches the training sequence length)
+    RUL_SEQUENCE_LENGTH: int = 30
+    SEQUENCE_BUFFER_MAX_ASSETS: int = 50000
+    
+    # Online Rolling Features (window matches RULRegressionPipeline's compute_rolling_features)
+    ONLINE_FEATURE_WINDOW: int = 10
+    ONLINE_FEATURE_MAX_ASSETS: int = 50000
+    
+    # Batch Predictions
+    PREDICTION_BATCH_MAX_ITEMS: int = 500
+    
+    # Prediction History (buffered writes to the prediction hypertable)
+    PREDICTION_WRITER_ENABLED: bool = True
+    PREDICTION_WRITER_MAX_BUFFER: int = 50000 # Rows held in memory; new rows are dropped beyond this
+    PREDICTION_WRITER_BATCH_SIZE: int = 1000
+    PREDICTION_WRITER_FLUSH_SECONDS: float = 1.0
+    
+    # Prediction Drift (EWMA per asset and model; alpha 0.04 ~ the previous 50-prediction window)
+    DRIFT_EWMA_ALPHA: float = 0.04
+    DRIFT_WARMUP_OBSERVATIONS: int = 20
+    DRIFT_ZSCORE_THRESHOLD: float = 3.0
+    DRIFT_STATE_MAX_KEYS: int = 100000
+    DRIFT_STATE_FLUSH_SECONDS: float = 30.0
+    DRIFT_STATE_TTL_SECONDS: int = 7 * 24 * 3600
+    
+    # Streaming Distribution Drift (live telemetry vs. the DRIFT model's reference sketch)
+    DRIFT_SKETCH_BINS: int = 20
+    DRIFT_SKETCH_MIN_SAMPLES: int = 50
+    DRIFT_SKETCH_DECAY: float = 0.5 # Applied to live counts after every evaluation
+    DRIFT_SKETCH_EVAL_SECONDS: float = 60.0
+    DRIFT_SKETCH_MAX_ASSET_TYPES: int = 1000
+    DRIFT_PSI_THRESHOLD: float = 0.2
+    DRIFT_KS_THRESHOLD: float = 0.15
+    
+    # Rate Limiting (token buckets per org and endpoint class, "<requests>/<second|minute|hour|day>")
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: Dict[str, str] = {
+        "ingestion": "600/minute",
+        "standard": "1200/minute",
+        "analytics": "120/minute",
+        "training": "20/minute",
+        "batch": "10/minute" # On top of "ingestion" for /predict/batch
+    }
+    RATE_LIMIT_OVERRIDES: Dict[str, Dict[str, str]] = {} # org id or plan name -> {endpoint class: limit}
+    # Resolved plan names are cached per worker; plan changes take effect within the TTL
+    TENANT_TIER_CACHE_TTL_SECONDS: int = 60
+    TENANT_TIER_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Admission Control (priority load shedding in front of the routers; prefixes are relative to API_V1_STR)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_MAX_IN_FLIGHT: int = 40 # Matches the default worker thread pool
+    ADMISSION_MAX_QUEUE: int = 1000
+    ADMISSION_CAPACITY_SHARES: Dict[str, float] = {"critical": 1.0, "normal": 0.8, "low": 0.5}
+    ADMISSION_QUEUE_TIMEOUTS: Dict[str, float] = {"critical": 5.0, "normal": 1.0, "low": 0.0} # 0 = reject instead of queueing
+    ADMISSION_TARGET_DELAYS: Dict[str, float] = {"critical": 2.0, "normal": 0.5, "low": 0.1} # Queue delay at which new requests are shed
+    ADMISSION_ROUTE_PRIORITIES: Dict[str, str] = {
+        "/predict": "critical",
+        "/inspections": "critical",
+        "/feedback": "critical",
+        "/admin": "low",
+        "/admin/policy": "normal",
+        "/admin/simulation/control": "normal",
+        "/simulation": "low",
+        "/intelligence": "low",
+        "/intelligence/decisions": "normal",
+        "/train": "low",
+        "/models/drift": "low"
+    }
     
     # Environment
     ENVIRONMENT: str = "development"
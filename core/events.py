@@ -6,13 +6,20 @@ import json
 import os
 import logging
 
+from core.config import settings
+from core.circuit_breaker import CircuitBreaker
+
 # Check for Kafka library (graceful fallback for dev)
 try:
     from kafka import KafkaProducer
+    from kafka.errors import KafkaTimeoutError
     KAFKA_AVAILABLE = True
 except ImportError:
     KAFKA_AVAILABLE = False
 
+    class KafkaTimeoutError(Exception):
+        """Stand-in so callers can catch send() timeouts without kafka installed."""
+
 logger = logging.getLogger(__name__)
 
 # --- Event Schemas ---
@@ -63,20 +70,44 @@ class ProducerFactory:
     _instance = None
     
     @staticmethod
-    def get_producer():
+    def get_producer(max_block_ms: Optional[int] = None):
+        """max_block_ms overrides KAFKA_MAX_BLOCK_MS for callers off the request path (set on first use)."""
         if ProducerFactory._instance is None:
             bootstrap = os.getenv("KAFKA_BOOTSTRAP_SERVERS")
             if KAFKA_AVAILABLE and bootstrap:
                 logger.info(f"Connecting to Kafka at {bootstrap}")
-                ProducerFactory._instance = KafkaProducer(
+                # max_block_ms bounds how long send() may block on metadata or a full buffer
+                producer = KafkaProducer(
                     bootstrap_servers=bootstrap,
-                    value_serializer=lambda v: json.dumps(v, default=str).encode('utf-8')
+                    value_serializer=lambda v: json.dumps(v, default=str).encode('utf-8'),
+                    max_block_ms=max_block_ms or settings.KAFKA_MAX_BLOCK_MS
                 )
+                ProducerFactory._instance = CircuitBreakingProducer(producer)
             else:
                 logger.warning("Kafka not available or configured. Using MockProducer.")
                 ProducerFactory._instance = MockProducer()
         return ProducerFactory._instance
 
+class CircuitBreakingProducer:
+    """
+    Wraps a KafkaProducer so a degraded broker fails fast.
+    send() raises CircuitOpenError while the breaker is open; callers (e.g. the
+    outbox worker) keep events PENDING and retry later.
+    """
+    def __init__(self, producer):
+        self._producer = producer
+        self.breaker = CircuitBreaker(
+            "kafka",
+            failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.CIRCUIT_BREAKER_RESET_TIMEOUT_SECONDS
+        )
+
+    def send(self, topic, value):
+        return self.breaker.call(self._producer.send, topic, value)
+
+    def flush(self, timeout=None):
+        return self._producer.flush(timeout=timeout)
+
 class MockProducer:
     def send(self, topic, value):
         logger.info(f"[MOCK KAFKA] Topic: {topic} | Payload: {value}")
@@ -1,7 +1,152 @@
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+import math
+import time
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
 
-# Global Limiter
-# In production, use Redis storage backend
-limiter = Limiter(key_func=get_remote_address)
+import redis
+from prometheus_client import Counter
+
+from core.config import settings
+from core.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions_total",
+    "Token bucket decisions by endpoint class",
+    ["endpoint_class", "result", "backend"] # allowed/limited, redis/local
+)
+
+# Refill and take atomically, using the Redis clock so all API workers agree on time.
+# Returns {allowed, tokens left, seconds until `cost` tokens are available}.
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+_PERIOD_SECONDS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+def parse_rate(spec: str) -> Tuple[float, float]:
+    """'600/minute' -> (refill tokens per second, bucket capacity)."""
+    amount, period = spec.split("/")
+    capacity = float(amount)
+    return capacity / _PERIOD_SECONDS[period.strip().rstrip("s")], capacity
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float # Seconds until the request would be admitted
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by (org_id, endpoint class), so each tenant gets its own
+    quota per class instead of sharing per-IP buckets.
+    Buckets live in Redis and are updated by one atomic script, so every API worker
+    and gateway sees the same state. If Redis is unreachable (or its breaker is open)
+    a local in-process bucket with the same parameters is used instead.
+    Quotas: RATE_LIMITS per class, overridden per org id or plan name via RATE_LIMIT_OVERRIDES.
+    """
+    def __init__(self, limits: Dict[str, str], overrides: Dict[str, Dict[str, str]], max_local_buckets: int = 100000):
+        self.limits = {name: parse_rate(spec) for name, spec in limits.items()}
+        self.overrides = {
+            str(tenant): {name: parse_rate(spec) for name, spec in specs.items()}
+            for tenant, specs in overrides.items()
+        }
+        self.max_local_buckets = max_local_buckets
+        self._local: "OrderedDict[str, list]" = OrderedDict() # key -> [tokens, monotonic ts]
+        self._lock = threading.Lock()
+        self._script = None
+        self._breaker = CircuitBreaker(
+            "redis-ratelimit",
+            failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.CIRCUIT_BREAKER_RESET_TIMEOUT_SECONDS,
+            expected_exceptions=(redis.RedisError, OSError)
+        )
+
+    def limit_for(self, org_id: Any, endpoint_class: str, tier: Optional[str] = None) -> Optional[Tuple[float, float]]:
+        """(rate per second, capacity) for a tenant and class; org overrides win over plan overrides."""
+        for tenant in (str(org_id), tier):
+            override = self.overrides.get(tenant) if tenant else None
+            if override and endpoint_class in override:
+                return override[endpoint_class]
+        return self.limits.get(endpoint_class)
+
+    def _redis_script(self):
+        if self._script is None:
+            from services.cache import CacheService, InMemoryCache
+            client = CacheService.get_client()
+            if isinstance(client, InMemoryCache):
+                return None
+            # Registering does not touch Redis; the script is loaded on first use, behind the breaker
+            self._script = client.register_script(TOKEN_BUCKET_LUA)
+        return self._script
+
+    def _take_local(self, key: str, rate: float, capacity: float, cost: float) -> Tuple[bool, float, float]:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._local.get(key)
+            if bucket is None:
+                bucket = self._local[key] = [capacity, now]
+                while len(self._local) > self.max_local_buckets:
+                    self._local.popitem(last=False)
+            self._local.move_to_end(key)
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            bucket[0], bucket[1] = tokens, now
+        return allowed, tokens, 0.0 if allowed else (cost - tokens) / rate
+
+    def acquire(self, org_id: Any, endpoint_class: str, tier: Optional[str] = None, cost: float = 1.0) -> RateLimitDecision:
+        limit = self.limit_for(org_id, endpoint_class, tier)
+        if limit is None:
+            return RateLimitDecision(True, 0, 0, 0.0)
+        rate, capacity = limit
+        key = f"ratelimit:{org_id}:{endpoint_class}"
+        backend = "redis"
+        try:
+            script = self._redis_script()
+            if script is None:
+                raise CircuitOpenError("Redis unavailable")
+            allowed, tokens, retry_after = self._breaker.call(script, [key], [rate, capacity, cost])
+            allowed, tokens, retry_after = bool(int(allowed)), float(tokens), float(retry_after)
+        except (CircuitOpenError, redis.RedisError, OSError) as e:
+            logger.debug(f"Rate limiter using local buckets ({e})")
+            backend = "local"
+            allowed, tokens, retry_after = self._take_local(key, rate, capacity, cost)
+        RATE_LIMIT_DECISIONS.labels(
+            endpoint_class=endpoint_class, result="allowed" if allowed else "limited", backend=backend
+        ).inc()
+        return RateLimitDecision(allowed, int(capacity), int(tokens), retry_after)
+
+rate_limiter = TokenBucketLimiter(settings.RATE_LIMITS, settings.RATE_LIMIT_OVERRIDES)
+
+def retry_after_header(decision: RateLimitDecision) -> Dict[str, str]:
+    return {
+        "Retry-After": str(max(1, math.ceil(decision.retry_after))),
+        "X-RateLimit-Limit": str(decision.limit),
+        "X-RateLimit-Remaining": str(decision.remaining)
+    }
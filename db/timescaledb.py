@@ -41,6 +41,26 @@ def init_timescaledb(db: Session):
         logger.error(f"Error converting prediction table: {e}")
         db.rollback()
 
+    # Predictions served by global registry models have no ml_model row
+    try:
+        db.execute(text("ALTER TABLE prediction ALTER COLUMN model_id DROP NOT NULL;"))
+        db.commit()
+    except Exception as e:
+        logger.warning(f"Could not relax prediction.model_id: {e}")
+        db.rollback()
+
+    # Rows created before registration defaulted to 'registered' all carry the old
+    # default 'shadow'; shadow traffic now needs the explicit 'shadow_evaluation' opt-in
+    try:
+        db.execute(text(
+            "UPDATE ml_model SET deployment_stage = CASE WHEN active THEN 'active' ELSE 'registered' END "
+            "WHERE deployment_stage = 'shadow';"
+        ))
+        db.commit()
+    except Exception as e:
+        logger.warning(f"Could not migrate legacy ml_model deployment stages: {e}")
+        db.rollback()
+
     # 3. Retention Policies (Example: 90 days)
     # db.execute(text("SELECT add_retention_policy('prediction', INTERVAL '90 days');"))
 
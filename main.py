@@ -4,20 +4,17 @@ from prometheus_fastapi_instrumentator import Instrumentator
 
 from api.api import api_router
 from core.config import settings
-from api.middleware import OperationalMiddleware, TenantMiddleware
-from core.ratelimit import limiter, _rate_limit_exceeded_handler, RateLimitExceeded
+from api.middleware import OperationalMiddleware, TenantMiddleware, AdmissionMiddleware
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # Set all CORS enabled, valid for this assignment
 app.add_middleware(OperationalMiddleware)
 app.add_middleware(TenantMiddleware)
+app.add_middleware(AdmissionMiddleware) # Outside auth so shed requests cost nothing
 
 app.add_middleware(
     CORSMiddleware,
@@ -46,6 +43,21 @@ def on_startup():
         init_timescaledb(db)
         # Load active models
         inference_engine.load_active_models(db)
+        if settings.INFERENCE_PROCESS_WORKERS > 0:
+            inference_engine.start_process_executor(settings.INFERENCE_PROCESS_WORKERS, settings.INFERENCE_PROCESS_MAX_PENDING)
+        # Hot reload: pick up newly activated models without restarting workers
+        if settings.MODEL_HOT_RELOAD_ENABLED:
+            inference_engine.start_model_watcher(SessionLocal, settings.MODEL_RELOAD_POLL_SECONDS)
+        if settings.INFERENCE_METRICS_FLUSH_SECONDS > 0:
+            inference_engine.stats.start_recorder(SessionLocal, settings.INFERENCE_METRICS_FLUSH_SECONDS)
+        if settings.DRIFT_SKETCH_EVAL_SECONDS > 0:
+            inference_engine.drift.start(settings.DRIFT_SKETCH_EVAL_SECONDS)
+        if settings.PREDICTION_WRITER_ENABLED:
+            from services.prediction_writer import prediction_writer
+            prediction_writer.start(SessionLocal, settings.PREDICTION_WRITER_FLUSH_SECONDS)
+        if settings.DRIFT_STATE_FLUSH_SECONDS > 0:
+            from services.monitoring_service import drift_monitor
+            drift_monitor.start(SessionLocal, settings.DRIFT_STATE_FLUSH_SECONDS)
     except Exception as e:
         print(f"STARTUP ERROR: {e}")
         # Re-raise to crash if critical (InferenceEngine raises if PROD)
@@ -53,6 +65,18 @@ def on_startup():
     finally:
         db.close()
 
+@app.on_event("shutdown")
+def on_shutdown():
+    from ml.inference import inference_engine
+    inference_engine.stop_model_watcher()
+    inference_engine.stop_process_executor()
+    inference_engine.stats.stop_recorder()
+    inference_engine.drift.stop()
+    from services.prediction_writer import prediction_writer
+    prediction_writer.stop()
+    from services.monitoring_service import drift_monitor
+    drift_monitor.stop()
+
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
@@ -0,0 +1,79 @@
+import os
+import logging
+from typing import Any
+
+import joblib
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def _is_torch_module(model: Any) -> bool:
+    return hasattr(model, "state_dict") and hasattr(model, "parameters")
+
+def save_artifact(model: Any, directory: str, basename: str) -> str:
+    """
+    Persist a model in a layout that can be memory-mapped at load time:
+    - torch modules -> '<basename>.pt' (torch.save; tensor storages mmap-able)
+    - everything else -> '<basename>.pkl' via uncompressed joblib, which stores
+      NumPy arrays as raw aligned buffers that joblib can mmap.
+    Returns the artifact path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    if _is_torch_module(model):
+        import torch
+        path = os.path.join(directory, f"{basename}.pt")
+        torch.save(model, path)
+    else:
+        path = os.path.join(directory, f"{basename}.pkl")
+        joblib.dump(model, path, compress=0)
+    return path
+
+def load_artifact(path: str) -> Any:
+    """
+    Load a serialized model from disk (.pkl via joblib, .pt/.pth via torch,
+    .onnx via an ONNX Runtime CPU session).
+    With MODEL_ARTIFACT_MMAP, array/tensor data is mapped read-only from the file, so
+    every uvicorn worker and consumer on the node shares the same page-cache copy.
+    Torch modules are switched to eval mode.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Artifact not found at {path}")
+
+    mmap = settings.MODEL_ARTIFACT_MMAP
+    
+    # Determine how to load based on extension or metadata
+    if path.endswith(".onnx"):
+        from ml.onnx_backend import load_onnx_model
+        return load_onnx_model(path)
+    if path.endswith(".pt") or path.endswith(".pth"):
+        # Assuming simple torch load for now, distinct from specific model class wrapper
+        # In a real app, might need to instantiate the class first if saving state_dict
+        import torch
+        try:
+            model = torch.load(path, mmap=mmap, weights_only=False)
+        except (TypeError, RuntimeError) as e:
+            # Older torch, or legacy (non-zipfile) serialization that can't be mapped
+            logger.warning(f"mmap load unavailable for {path} ({e}); loading into memory")
+            model = torch.load(path, weights_only=False)
+    else:
+        # .pkl and fallback. Compressed pickles can't be mapped; joblib then loads normally.
+        model = joblib.load(path, mmap_mode="r" if mmap else None)
+
+    if hasattr(model, "eval") and hasattr(model, "parameters"):
+        model.eval() # Set to eval mode
+    return model
+
+def estimate_model_bytes(model: Any, path: str) -> int:
+    """
+    Approximate resident size of a loaded model.
+    Torch: parameter + buffer storage. Others: on-disk pickle size, which tracks
+    the NumPy arrays that dominate sklearn estimators.
+    """
+    if hasattr(model, "parameters") and hasattr(model, "buffers"):
+        tensors = list(model.parameters()) + list(model.buffers())
+        return int(sum(t.numel() * t.element_size() for t in tensors))
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
@@ -0,0 +1,110 @@
+import time
+import queue
+import threading
+import logging
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+class BatcherOverloadedError(RuntimeError):
+    """Raised when the batcher queue is full; callers should shed load."""
+
+class InferenceTimeoutError(BatcherOverloadedError):
+    """Raised when a queued inference misses its deadline; shed like an overload (503)."""
+
+class MicroBatcher:
+    """
+    Collects concurrent requests for up to max_wait_ms (or max_batch_size items),
+    runs them as a single vectorized call and scatters results back to each caller.
+
+    batch_fn receives a list of inputs and must return a list of results in the same order.
+    Callers get a concurrent.futures.Future, so both sync (threadpool) and async
+    (asyncio.wrap_future) code paths can wait on it.
+    """
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_queue_size: int = 1024
+    ):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[Any, Future]]" = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name=f"batcher-{self.name}", daemon=True)
+                    self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        self._ensure_started()
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((item, future))
+        except queue.Full:
+            raise BatcherOverloadedError(f"Inference queue for '{self.name}' is full")
+        return future
+
+    def result(self, future: Future, timeout: float) -> Any:
+        """Wait for a submitted item; on timeout cancel it so the worker skips it if not yet started."""
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise InferenceTimeoutError(f"Inference for '{self.name}' timed out after {timeout}s")
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def _collect(self) -> List[Tuple[Any, Future]]:
+        batch = [self._queue.get()] # Block until there is work
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _call(self, items: List[Any]) -> List[Any]:
+        results = self.batch_fn(items)
+        if len(results) != len(items):
+            # zip() would silently leave the remaining callers waiting until their timeout
+            raise RuntimeError(f"batch_fn for '{self.name}' returned {len(results)} results for {len(items)} inputs")
+        return results
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # Drop requests whose callers already gave up
+            batch = [(item, fut) for item, fut in batch if fut.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            items = [item for item, _ in batch]
+            try:
+                results = self._call(items)
+                for (_, fut), result in zip(batch, results):
+                    fut.set_result(result)
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    continue
+                # Isolate the bad input: re-run row by row so one request can't fail the rest
+                logger.warning(f"Batch of {len(batch)} failed for '{self.name}' ({e}); retrying per item")
+                for item, fut in batch:
+                    try:
+                        fut.set_result(self._call([item])[0])
+                    except Exception as item_err:
+                        fut.set_exception(item_err)
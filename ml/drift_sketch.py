@@ -0,0 +1,219 @@
+import time
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_EPS = 1e-4 # Floor for empty bins so PSI stays finite
+
+def drift_scores(live_counts: np.ndarray, ref_probs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-feature (KS, PSI) of binned live counts (F, B) against reference bin probabilities (F, B).
+    KS is the largest CDF gap at the bin edges; features without live samples score NaN.
+    """
+    totals = live_counts.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        live = live_counts / totals
+    ks = np.abs(np.cumsum(live, axis=1) - np.cumsum(ref_probs, axis=1)).max(axis=1)
+    p, q = np.clip(live, _EPS, None), np.clip(ref_probs, _EPS, None)
+    psi = ((p - q) * np.log(p / q)).sum(axis=1)
+    empty = totals[:, 0] == 0
+    ks[empty] = np.nan
+    psi[empty] = np.nan
+    return ks, psi
+
+class ReferenceSketch:
+    """
+    Training-time distribution of each feature, summarised by its quantile bin edges
+    (bins-1 interior quantiles) and the reference probability of every bin.
+    Size is O(features x bins) regardless of the training set size.
+    """
+    def __init__(self, feature_names: Sequence[str], edges: np.ndarray, probs: np.ndarray, n_samples: int):
+        self.feature_names = list(feature_names)
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.probs = np.asarray(probs, dtype=np.float64)
+        self.n_samples = n_samples
+        self.index = {name: i for i, name in enumerate(self.feature_names)}
+
+    @property
+    def bins(self) -> int:
+        return self.probs.shape[1]
+
+    @classmethod
+    def fit(cls, X: Any, feature_names: Sequence[str], bins: int = 20) -> "ReferenceSketch":
+        X = np.asarray(X, dtype=np.float64)
+        quantiles = np.linspace(0.0, 1.0, bins + 1)[1:-1]
+        edges = np.nanquantile(X, quantiles, axis=0).T.reshape(X.shape[1], bins - 1)
+        sketch = cls(feature_names, edges, np.zeros((X.shape[1], bins)), len(X))
+        counts = sketch.histogram(X)
+        sketch.probs = counts / np.maximum(counts.sum(axis=1, keepdims=True), 1.0)
+        return sketch
+
+    def histogram(self, X: np.ndarray) -> np.ndarray:
+        """Bin counts (F, B) of a feature matrix laid out like the reference; NaNs are skipped."""
+        X = np.asarray(X, dtype=np.float64)
+        counts = np.zeros((len(self.feature_names), self.bins))
+        for f in range(len(self.feature_names)):
+            column = X[:, f]
+            column = column[~np.isnan(column)]
+            counts[f] = np.bincount(np.searchsorted(self.edges[f], column, side="right"), minlength=self.bins)
+        return counts
+
+    def compare(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(KS, PSI) per feature of a batch of rows against the reference."""
+        return drift_scores(self.histogram(X), self.probs)
+
+    def vectorize(self, record: Dict[str, Any]) -> np.ndarray:
+        """Telemetry dict -> feature vector in reference order (NaN for absent or non-numeric values)."""
+        vector = np.full(len(self.feature_names), np.nan)
+        for name, value in record.items():
+            i = self.index.get(name)
+            if i is not None and isinstance(value, (int, float)) and not isinstance(value, bool):
+                vector[i] = value
+        return vector
+
+class LiveSketch:
+    """Decaying bin counts of live telemetry over the reference edges: O(features x bins) memory."""
+    def __init__(self, reference: ReferenceSketch):
+        self.reference = reference
+        self.counts = np.zeros_like(reference.probs)
+        self.observed = 0
+
+    def add(self, X: np.ndarray):
+        """Fold in rows (N, F); each value costs one comparison per bin edge."""
+        X = np.atleast_2d(X)
+        present = ~np.isnan(X)
+        bins = (X[:, :, None] >= self.reference.edges[None, :, :]).sum(axis=2)
+        rows, features = np.nonzero(present)
+        np.add.at(self.counts, (features, bins[rows, features]), 1.0)
+        self.observed += len(X)
+
+    def decay(self, factor: float):
+        self.counts *= factor
+
+class StreamingDriftEngine:
+    """
+    Distribution drift of live telemetry against the active DRIFT reference sketch.
+    update() folds readings into a live sketch per asset type; evaluate() (run on a
+    schedule) scores every feature with KS/PSI, caches the status and decays the live
+    counts so recent traffic dominates. status() only reads the cache.
+    """
+    def __init__(
+        self,
+        psi_threshold: float = 0.2,
+        ks_threshold: float = 0.15,
+        min_samples: int = 50,
+        decay: float = 0.5,
+        max_asset_types: int = 1000,
+        top_features: int = 10
+    ):
+        self.psi_threshold = psi_threshold
+        self.ks_threshold = ks_threshold
+        self.min_samples = min_samples
+        self.decay = decay
+        self.max_asset_types = max_asset_types
+        self.top_features = top_features
+        self.reference: Optional[ReferenceSketch] = None
+        self._live: "OrderedDict[str, LiveSketch]" = OrderedDict()
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def set_reference(self, reference: ReferenceSketch):
+        """Swap in a new reference; live sketches restart since the bin edges changed."""
+        with self._lock:
+            self.reference = reference
+            self._live.clear()
+            self._status.clear()
+
+    def _sketch(self, asset_type: str) -> LiveSketch:
+        sketch = self._live.get(asset_type)
+        if sketch is None:
+            sketch = self._live[asset_type] = LiveSketch(self.reference)
+            while len(self._live) > self.max_asset_types:
+                evicted, _ = self._live.popitem(last=False)
+                self._status.pop(evicted, None)
+        self._live.move_to_end(asset_type)
+        return sketch
+
+    def update(self, asset_type: str, records: List[Dict[str, Any]]):
+        reference = self.reference
+        if reference is None or not records:
+            return
+        X = np.stack([reference.vectorize(r) for r in records])
+        with self._lock:
+            if self.reference is reference:
+                self._sketch(asset_type).add(X)
+
+    def _score(self, asset_type: str, counts: np.ndarray, observed: int) -> Dict[str, Any]:
+        reference = self.reference
+        ks, psi = drift_scores(counts, reference.probs)
+        enough = counts.sum(axis=1) >= self.min_samples
+        ks, psi = np.where(enough, ks, np.nan), np.where(enough, psi, np.nan)
+        drifted = np.nonzero((psi > self.psi_threshold) | (ks > self.ks_threshold))[0]
+        worst = drifted[np.argsort(-np.nan_to_num(psi[drifted]))][:self.top_features]
+        scored = int(enough.sum())
+        return {
+            "asset_type": asset_type,
+            "status": "INSUFFICIENT_DATA" if scored == 0 else "DRIFT_DETECTED" if len(drifted) else "STABLE",
+            "features_scored": scored,
+            "features_drifted": int(len(drifted)),
+            "max_psi": float(np.nanmax(psi)) if scored else None,
+            "max_ks": float(np.nanmax(ks)) if scored else None,
+            "top_drifted": [
+                {"feature": reference.feature_names[f], "psi": round(float(psi[f]), 6), "ks": round(float(ks[f]), 6)}
+                for f in worst
+            ],
+            "observed": observed,
+            "evaluated_at": time.time()
+        }
+
+    def evaluate(self) -> int:
+        """Score all asset types, cache their status and decay the live counts. Returns asset types scored."""
+        with self._lock:
+            snapshot = [(t, s.counts.copy(), s.observed) for t, s in self._live.items()]
+            for sketch in self._live.values():
+                sketch.decay(self.decay)
+        statuses = {t: self._score(t, counts, observed) for t, counts, observed in snapshot}
+        with self._lock:
+            self._status.update(statuses)
+        return len(statuses)
+
+    def status(self, asset_type: Optional[str] = None) -> Dict[str, Any]:
+        """Cached status of one asset type, or a summary over all of them."""
+        if self.reference is None:
+            return {"status": "NO_REFERENCE"}
+        with self._lock:
+            if asset_type is not None:
+                return self._status.get(asset_type) or {"asset_type": asset_type, "status": "INSUFFICIENT_DATA"}
+            statuses = list(self._status.values())
+        drifted = [s["asset_type"] for s in statuses if s["status"] == "DRIFT_DETECTED"]
+        return {
+            "status": "DRIFT_DETECTED" if drifted else "STABLE" if statuses else "INSUFFICIENT_DATA",
+            "features": len(self.reference.feature_names),
+            "asset_types": len(statuses),
+            "drifted_asset_types": drifted
+        }
+
+    def start(self, interval_seconds: float):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.wait(interval_seconds):
+                try:
+                    self.evaluate()
+                except Exception as e:
+                    logger.error(f"Drift evaluation failed: {e}")
+
+        self._thread = threading.Thread(target=_run, name="drift-sketch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
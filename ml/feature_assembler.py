@@ -0,0 +1,97 @@
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+class FeatureAssembler:
+    """
+    Compiled input layout for one model: sensor name -> column index, plus
+    per-column normalization folded into (offset, scale) arrays.
+
+    normalization_params may be either
+    - per feature: {"temp": {"mean": 50, "std": 5}, "rpm": {"min": 0, "max": 3000}}
+    - columnar:    {"mean": [...], "std": [...]} or {"min": [...], "max": [...]}
+      in input_feature_list order.
+    Features missing from a request are imputed with the column offset (the
+    training mean/min), i.e. 0 after normalization.
+    """
+    def __init__(self, feature_names: Sequence[str], normalization_params: Optional[Dict[str, Any]] = None, dtype=np.float32):
+        self.feature_names: List[str] = list(feature_names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.feature_names)}
+        self.dtype = np.dtype(dtype)
+        self.offset, self.scale = self._compile(normalization_params or {})
+        self._normalize = bool(np.any(self.offset != 0) or np.any(self.scale != 1))
+
+    @property
+    def width(self) -> int:
+        return len(self.feature_names)
+
+    def _compile(self, params: Dict[str, Any]):
+        k = self.width
+        offset = np.zeros(k, dtype=self.dtype)
+        spread = np.ones(k, dtype=self.dtype)
+
+        if isinstance(params.get("mean"), list) or isinstance(params.get("min"), list):
+            if "mean" in params:
+                offset[:] = params["mean"]
+                spread[:] = params.get("std", [1.0] * k)
+            else:
+                offset[:] = params["min"]
+                spread[:] = np.asarray(params["max"], dtype=self.dtype) - offset
+        else:
+            for name, j in self.index.items():
+                p = params.get(name)
+                if not p:
+                    continue
+                if "mean" in p:
+                    offset[j] = p["mean"]
+                    spread[j] = p.get("std", 1.0)
+                elif "min" in p:
+                    offset[j] = p["min"]
+                    spread[j] = p["max"] - p["min"]
+
+        # Constant columns would divide by zero; leave them centred only
+        spread[spread == 0] = 1.0
+        return offset, (1.0 / spread).astype(self.dtype)
+
+    def _finish(self, out: np.ndarray) -> np.ndarray:
+        if self._normalize:
+            out -= self.offset
+            out *= self.scale
+        return out
+
+    def assemble(self, rows: Sequence[Any]) -> np.ndarray:
+        """
+        Request payloads -> (n, width) C-contiguous matrix in model column order.
+        Dict rows are placed by name (unknown keys ignored); list rows are taken as
+        already ordered.
+        """
+        out = np.empty((len(rows), self.width), dtype=self.dtype)
+        out[:] = self.offset
+        index = self.index
+        for i, row in enumerate(rows):
+            if isinstance(row, Mapping):
+                for name, value in row.items():
+                    j = index.get(name)
+                    if j is not None and value is not None:
+                        out[i, j] = value
+            else:
+                out[i] = row
+        return self._finish(out)
+
+    def assemble_columns(self, columns: Mapping[str, Sequence[float]], n_rows: Optional[int] = None) -> np.ndarray:
+        """Columnar telemetry ({sensor: values}) -> (n, width) matrix, one column copy per feature."""
+        if n_rows is None:
+            n_rows = len(next(iter(columns.values()))) if columns else 0
+        out = np.empty((n_rows, self.width), dtype=self.dtype)
+        for name, j in self.index.items():
+            values = columns.get(name)
+            out[:, j] = self.offset[j] if values is None else values
+        return self._finish(out)
+
+    @classmethod
+    def from_record(cls, record: Any) -> Optional["FeatureAssembler"]:
+        """Build from an MLModel row; None when it doesn't declare input_feature_list."""
+        features = getattr(record, "input_feature_list", None)
+        if not features:
+            return None
+        return cls(features, getattr(record, "normalization_params", None))
@@ -0,0 +1,132 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+ROLLING_SUFFIXES = ("mean", "std", "roc", "slope")
+
+class AssetFeatureState:
+    """
+    Incremental equivalent of pipelines.utils.compute_rolling_features for one asset.
+
+    Per sensor: rolling mean/std (ddof=1) over `window` readings via add/remove
+    Welford updates, roc = x[t] - x[t-1], slope = (x[t] - x[t-window]) / window.
+    Every update is a handful of vector ops over the sensors, independent of window.
+    Before `window + 1` readings (rows the offline pipeline drops) the statistics
+    cover the readings seen so far.
+    """
+    def __init__(self, sensors: Sequence[str], window: int):
+        self.sensors: List[str] = list(sensors)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.sensors)}
+        self.window = window
+        n = len(self.sensors)
+        self._history = np.zeros((window, n)) # Last `window` raw values; slot = t % window
+        self._mean = np.zeros(n)
+        self._m2 = np.zeros(n)
+        self._last = np.zeros(n)
+        self.count = 0
+        # [raw sensors..., then per sensor: mean, std, roc, slope] as in compute_rolling_features
+        self.vector = np.zeros(n * (1 + len(ROLLING_SUFFIXES)))
+        self._rolling = self.vector[n:].reshape(n, len(ROLLING_SUFFIXES)) # View into vector
+
+    @property
+    def ready(self) -> bool:
+        """True once the features match what the offline pipeline would emit."""
+        return self.count > self.window
+
+    @property
+    def feature_names(self) -> List[str]:
+        return self.sensors + [f"{s}_{suffix}" for s in self.sensors for suffix in ROLLING_SUFFIXES]
+
+    def update(self, reading: Mapping[str, Any]) -> np.ndarray:
+        # Sensors missing from this reading carry their last value forward
+        x = self._last.copy() if self.count else np.zeros(len(self.sensors))
+        for name, value in reading.items():
+            j = self.index.get(name)
+            if j is not None and value is not None:
+                x[j] = value
+
+        w = self.window
+        slot = self.count % w
+        if self.count < w:
+            n = self.count + 1
+            delta = x - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (x - self._mean)
+            oldest = self._history[0] if self.count else x
+        else:
+            n = w
+            leaving = self._history[slot].copy() # x[t - window]
+            new_mean = self._mean + (x - leaving) / w
+            self._m2 += (x - leaving) * (x - new_mean + leaving - self._mean)
+            self._mean = new_mean
+            oldest = leaving
+        np.maximum(self._m2, 0.0, out=self._m2)
+
+        rolling = self._rolling
+        rolling[:, 0] = self._mean
+        rolling[:, 1] = np.sqrt(self._m2 / (n - 1)) if n > 1 else 0.0
+        rolling[:, 2] = x - self._last if self.count else 0.0
+        rolling[:, 3] = (x - oldest) / w
+        self.vector[:len(self.sensors)] = x
+
+        self._history[slot] = x
+        self._last = x
+        self.count += 1
+        return self.vector
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(zip(self.feature_names, self.vector.tolist()))
+
+class OnlineFeatureStore:
+    """
+    Per-asset rolling feature state for serving, LRU-capped at max_assets.
+    An asset's sensor layout is fixed by its first reading.
+    """
+    def __init__(self, window: int, max_assets: int):
+        self.window = window
+        self.max_assets = max_assets
+        self._states: "OrderedDict[Hashable, AssetFeatureState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def update(self, asset_id: Hashable, reading: Mapping[str, Any]) -> np.ndarray:
+        """Fold one reading into the asset's state; returns a copy of its feature vector."""
+        with self._lock:
+            state = self._states.get(asset_id)
+            if state is None:
+                state = AssetFeatureState(list(reading.keys()), self.window)
+                self._states[asset_id] = state
+                while len(self._states) > self.max_assets:
+                    self._states.popitem(last=False)
+            else:
+                self._states.move_to_end(asset_id)
+            return state.update(reading).copy()
+
+    def feature_names(self, asset_id: Hashable) -> List[str]:
+        state = self._states.get(asset_id)
+        return state.feature_names if state else []
+
+    def get(self, asset_id: Hashable) -> Optional[AssetFeatureState]:
+        return self._states.get(asset_id)
+
+    def read_batch(self, asset_ids: Sequence[Hashable]) -> np.ndarray:
+        """
+        Current feature vectors for assets sharing one sensor layout, as an
+        (n, features) matrix; unknown assets get NaN rows.
+        """
+        with self._lock:
+            states = [self._states.get(a) for a in asset_ids]
+            width = next((s.vector.shape[0] for s in states if s is not None), 0)
+            out = np.full((len(asset_ids), width), np.nan)
+            for i, state in enumerate(states):
+                if state is not None:
+                    out[i] = state.vector
+        return out
+
+    def reset(self, asset_id: Hashable):
+        with self._lock:
+            self._states.pop(asset_id, None)
@@ -1,21 +1,77 @@
 import os
+import time
+import asyncio
+import threading
 import joblib
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Callable, Tuple
+from dataclasses import dataclass
 from sqlalchemy.orm import Session
 from models.registry import ModelRegistry, TaskType
 from services.registry_service import ModelRegistryService
+from ml.batching import MicroBatcher, InferenceTimeoutError
+from ml.artifacts import load_artifact
+from ml.model_pool import ModelPool
+from ml.process_pool import ProcessInferenceExecutor
+from ml.feature_assembler import FeatureAssembler
+from ml.sequence_buffer import SequenceBufferStore
+from ml.feature_store import OnlineFeatureStore
+from ml.result_cache import InferenceResultCache
+from ml.instrumentation import InferenceStats, StatsKey
+from ml.shadow import ShadowEvaluator
+from ml.drift_sketch import ReferenceSketch, StreamingDriftEngine
+from core.config import settings
 import logging
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@dataclass(frozen=True)
+class ServingModel:
+    """Identity of the model behind a call: result-cache key, metrics labels, worker artifact."""
+    key: Optional[str] = None # Registry id (global) or MLModel id (tenant)
+    version: str = "unknown" # Prometheus label; tenant models use "tenant" to bound cardinality
+    stats_key: Optional[StatsKey] = None
+    artifact_path: Optional[str] = None # Enables process-pool execution
+
 class InferenceEngine:
     def __init__(self):
         self.loaded_models: Dict[str, Any] = {}
         self.env = os.getenv("ENV", "development").lower()
+        self.model_versions: Dict[str, Dict[str, str]] = {} # task -> registry id/name/version
+        self._batchers: Dict[str, MicroBatcher] = {}
+        self._batchers_lock = threading.Lock()
+        self._swap_lock = threading.Lock()
+        self._reload_event = threading.Event()
+        self._watcher_stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self.model_pool = ModelPool(
+            settings.MODEL_POOL_MAX_BYTES, settings.MODEL_POOL_RESOLVE_TTL_SECONDS,
+            settings.SHADOW_POOL_MAX_BYTES, settings.MODEL_POOL_MAX_KEYS
+        )
+        self.process_executor: Optional[ProcessInferenceExecutor] = None
+        self.sequence_buffers = SequenceBufferStore(settings.RUL_SEQUENCE_LENGTH, settings.SEQUENCE_BUFFER_MAX_ASSETS)
+        self.feature_store = OnlineFeatureStore(settings.ONLINE_FEATURE_WINDOW, settings.ONLINE_FEATURE_MAX_ASSETS)
+        self.stats = InferenceStats()
+        self.drift = StreamingDriftEngine(
+            psi_threshold=settings.DRIFT_PSI_THRESHOLD,
+            ks_threshold=settings.DRIFT_KS_THRESHOLD,
+            min_samples=settings.DRIFT_SKETCH_MIN_SAMPLES,
+            decay=settings.DRIFT_SKETCH_DECAY,
+            max_asset_types=settings.DRIFT_SKETCH_MAX_ASSET_TYPES
+        )
+        self.shadow: Optional[ShadowEvaluator] = None
+        if settings.SHADOW_EVALUATION_ENABLED:
+            self.shadow = ShadowEvaluator(
+                self._run_shadow, settings.SHADOW_QUEUE_SIZE, settings.SHADOW_SAMPLE_RATE, settings.SHADOW_RUL_TOLERANCE
+            )
+        self.result_cache: Optional[InferenceResultCache] = None
+        if settings.INFERENCE_RESULT_CACHE_ENABLED:
+            self.result_cache = InferenceResultCache(
+                settings.INFERENCE_RESULT_CACHE_MAX_ENTRIES, settings.INFERENCE_RESULT_CACHE_DECIMALS
+            )
 
     def load_active_models(self, db: Session):
         """
@@ -43,77 +99,462 @@ class InferenceEngine:
                 if self.env == "production":
                     raise RuntimeError(f"CRITICAL: {msg} in PROD. Application start aborted.")
 
+    def _read_artifact(self, record: ModelRegistry) -> Any:
+        logger.info(f"Loading {record.task_type} model from {record.artifact_path}")
+        return load_artifact(record.artifact_path)
+
+    @staticmethod
+    def _input_width(model: Any) -> Optional[int]:
+        """Best-effort number of input features, used to build a warm-up row."""
+        if hasattr(model, "n_features_in_"):
+            return int(model.n_features_in_)
+        if hasattr(model, "modules"):
+            for module in model.modules():
+                for attr in ("input_size", "in_features"):
+                    if isinstance(getattr(module, attr, None), int):
+                        return getattr(module, attr)
+        return None
+
+    def _warm_up(self, task_type: TaskType, model: Any):
+        """
+        Run one dummy prediction so lazy initialisation (allocator, JIT paths, tree
+        layout) happens before the model takes live traffic. Raises if the model is unusable.
+        """
+        if task_type == TaskType.DRIFT:
+            return
+        width = self._input_width(model)
+        if width is None:
+            return
+        self._run_model(task_type, model, [[0.0] * width])
+
+    def _swap_model(self, task_type: TaskType, model: Any, record: ModelRegistry):
+        """
+        Atomically publish a fully loaded model. Batches already running keep the
+        reference they read, so in-flight predictions are never interrupted.
+        """
+        with self._swap_lock:
+            previous = self.model_versions.get(task_type)
+            self.loaded_models[task_type] = model
+            self.model_versions[task_type] = {
+                "id": str(record.id),
+                "name": record.name,
+                "version": record.version,
+                "artifact_path": record.artifact_path
+            }
+        if previous and self.result_cache is not None:
+            self.result_cache.invalidate_model(previous["id"])
+        if task_type == TaskType.DRIFT and isinstance(model, ReferenceSketch):
+            self.drift.set_reference(model)
+
     def _load_model_from_record(self, record: ModelRegistry):
-        path = record.artifact_path
-        if not os.path.exists(path):
-            raise FileNotFoundError(f"Artifact not found at {path}")
-            
-        logger.info(f"Loading {record.task_type} model from {path}")
+        model = self._read_artifact(record)
+        self._warm_up(record.task_type, model)
+        self._swap_model(record.task_type, model, record)
+
+    def refresh_models(self, db: Session) -> List[TaskType]:
+        """
+        Compare active registry entries with what is loaded and hot-swap any that changed.
+        Tasks with no active entry (e.g. mid-activation) keep serving the current model.
+        """
+        reloaded = []
+        registry_service = ModelRegistryService(db)
+        for record in registry_service.get_active_models():
+            current = self.model_versions.get(record.task_type)
+            if current and current["id"] == str(record.id):
+                continue
+            try:
+                self._load_model_from_record(record)
+                reloaded.append(record.task_type)
+                logger.info(f"Hot-swapped {record.task_type} model -> {record.name} {record.version}")
+            except Exception as e:
+                logger.error(f"Hot reload failed for {record.task_type} ({record.id}); keeping current model: {e}")
+        return reloaded
+
+    def request_reload(self):
+        """Wake the model watcher immediately (e.g. after an activation in this process)."""
+        self._reload_event.set()
+
+    def start_model_watcher(self, session_factory: Callable[[], Session], interval_seconds: float):
+        """Background thread that polls the registry and reloads models off the request path."""
+        if self._watcher and self._watcher.is_alive():
+            return
+        self._watcher_stop.clear()
         
-        # Determine how to load based on extension or metadata
-        if path.endswith(".pkl"):
-            model = joblib.load(path)
-        elif path.endswith(".pt") or path.endswith(".pth"):
-            # Assuming simple torch load for now, distinct from specific model class wrapper
-            # In a real app, might need to instantiate the class first if saving state_dict
-            import torch
-            model = torch.load(path)
-            model.eval() # Set to eval mode
-        else:
-            # Fallback to joblib
-            model = joblib.load(path)
-            
-        self.loaded_models[record.task_type] = model
+        def _watch():
+            while not self._watcher_stop.is_set():
+                self._reload_event.wait(timeout=interval_seconds)
+                self._reload_event.clear()
+                if self._watcher_stop.is_set():
+                    break
+                db = session_factory()
+                try:
+                    self.refresh_models(db)
+                except Exception as e:
+                    logger.error(f"Model watcher error: {e}")
+                finally:
+                    db.close()
+        
+        self._watcher = threading.Thread(target=_watch, name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_model_watcher(self):
+        self._watcher_stop.set()
+        self._reload_event.set()
+
+    def start_process_executor(self, workers: int, max_pending: int):
+        """
+        Move global-model inference into worker processes, preloading the artifacts
+        that are active right now. Call after load_active_models().
+        """
+        if self.process_executor is not None:
+            return
+        preload = [v["artifact_path"] for v in self.model_versions.values() if v.get("artifact_path")]
+        self.process_executor = ProcessInferenceExecutor(workers, max_pending, preload)
+        logger.info(f"Started {workers} inference worker processes ({len(preload)} artifacts preloaded)")
+
+    def stop_process_executor(self):
+        if self.process_executor is not None:
+            self.process_executor.shutdown()
+            self.process_executor = None
+
+    def _get_batcher(self, key: Any, batch_fn: Optional[Callable[[List[Any]], List[Any]]] = None) -> MicroBatcher:
+        """Batcher per key; by default the key is a TaskType served by the global model."""
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            with self._batchers_lock:
+                batcher = self._batchers.get(key)
+                if batcher is None:
+                    batcher = MicroBatcher(
+                        name=str(key.value if hasattr(key, "value") else key),
+                        batch_fn=batch_fn or (lambda rows, t=key: self.predict_batch(t, rows)),
+                        max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+                        max_wait_ms=settings.INFERENCE_MAX_BATCH_WAIT_MS,
+                        max_queue_size=settings.INFERENCE_MAX_QUEUE_SIZE
+                    )
+                    self._batchers[key] = batcher
+        return batcher
 
     def predict(self, task_type: TaskType, data: Any) -> Dict[str, Any]:
+        """
+        Single-request entry point. Concurrent requests for the same task are
+        micro-batched into one vectorized model call.
+        """
         if task_type not in self.loaded_models:
              # Try lazy load or fail
              raise ValueError(f"No loaded model for task: {task_type}")
-             
-        model = self.loaded_models[task_type]
         
+        if not settings.INFERENCE_BATCHING_ENABLED or task_type == TaskType.DRIFT:
+            return self.predict_batch(task_type, [data])[0]
+        batcher = self._get_batcher(task_type)
+        return batcher.result(batcher.submit(data), settings.INFERENCE_TIMEOUT_SECONDS)
+
+    async def predict_async(self, task_type: TaskType, data: Any) -> Dict[str, Any]:
+        """Awaitable variant of predict() for async request handlers."""
+        if task_type not in self.loaded_models:
+             raise ValueError(f"No loaded model for task: {task_type}")
+        if not settings.INFERENCE_BATCHING_ENABLED or task_type == TaskType.DRIFT:
+            return self.predict_batch(task_type, [data])[0]
         try:
-            # Data preprocessing should ideally happen here or using a saved pipeline
-            # For this implementations, we assume 'data' is compatible or simple numpy/df
+            # Cancelling the wrapper also cancels the queued item
+            return await asyncio.wait_for(
+                asyncio.wrap_future(self._get_batcher(task_type).submit(data)), settings.INFERENCE_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            raise InferenceTimeoutError(f"Inference for '{task_type.value}' timed out")
+
+    def predict_for_asset(
+        self,
+        db: Session,
+        task_type: TaskType,
+        data: Any,
+        org_id: Any = None,
+        asset_type: Optional[str] = None,
+        asset_id: Any = None
+    ) -> Dict[str, Any]:
+        """
+        Serve the tenant's active MLModel for (org, asset_type, task) from the model pool
+        if one exists, otherwise fall back to the global registry model.
+        For RUL with an asset_id, the reading's rolling features are appended to the asset's
+        sequence buffer and the model sees the last RUL_SEQUENCE_LENGTH feature vectors.
+        """
+        if asset_type and isinstance(data, dict):
+            self.drift.update(asset_type, [data])
+        if task_type == TaskType.DRIFT and asset_type and self.drift.reference is not None:
+            return self.drift.status(asset_type)
+        
+        tenant_model = None
+        if org_id and asset_type and task_type != TaskType.DRIFT:
+            tenant_model = self.model_pool.get(db, org_id, asset_type, task_type)
+        assembler = self.model_pool.assembler(tenant_model[0]) if tenant_model else None
+        
+        if task_type == TaskType.RUL and asset_id is not None:
+            data = self._append_reading(asset_id, data, assembler)
+        if tenant_model is None:
+            result = self.predict(task_type, data)
+        else:
+            model_id, model = tenant_model
+            serving = ServingModel(key=model_id, version="tenant", stats_key=("ml_model", model_id, str(org_id)))
+            if not settings.INFERENCE_BATCHING_ENABLED:
+                result = self._run_model(task_type, model, [data], serving, assembler)[0]
+            else:
+                batcher = self._get_batcher(
+                    ("tenant", task_type),
+                    lambda items, t=task_type: self._run_grouped(t, items)
+                )
+                result = batcher.result(batcher.submit((serving, model, assembler, data)), settings.INFERENCE_TIMEOUT_SECONDS)
+        
+        if self.shadow is not None and org_id and asset_type and task_type != TaskType.DRIFT:
+            self._submit_shadow(db, task_type, data, result, org_id, asset_type)
+        return result
+
+    def predict_for_assets(
+        self,
+        db: Session,
+        task_type: TaskType,
+        org_id: Any,
+        assets: List[Tuple[Any, str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Bulk predict_for_asset for (asset_id, asset_type, data) of one org: one model
+        resolution and one vectorized model call per asset type instead of per asset.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(assets)
+        groups: Dict[str, List[int]] = {}
+        for i, (_, asset_type, _) in enumerate(assets):
+            groups.setdefault(asset_type, []).append(i)
+        
+        for asset_type, indices in groups.items():
+            if asset_type:
+                self.drift.update(asset_type, [assets[i][2] for i in indices if isinstance(assets[i][2], dict)])
+            if task_type == TaskType.DRIFT and asset_type and self.drift.reference is not None:
+                for i in indices:
+                    results[i] = self.drift.status(asset_type)
+                continue
+            tenant_model = None
+            if org_id and asset_type and task_type != TaskType.DRIFT:
+                tenant_model = self.model_pool.get(db, org_id, asset_type, task_type)
+            assembler = self.model_pool.assembler(tenant_model[0]) if tenant_model else None
             
-            result = {}
+            rows = []
+            for i in indices:
+                asset_id, _, data = assets[i]
+                if task_type == TaskType.RUL and asset_id is not None:
+                    data = self._append_reading(asset_id, data, assembler)
+                rows.append(data)
             
-            if task_type == TaskType.RUL:
-                # Expecting sequence data or converting generic features
-                # Simplified: assume data is a list/array of features matching model input
-                import torch
-                if isinstance(data, list):
-                    import numpy as np
-                    input_data = torch.FloatTensor([data]) # Batch dim
-                else:
-                    input_data = torch.FloatTensor(data)
-                    
-                with torch.no_grad():
-                    prediction = model(input_data).numpy().item()
-                result = {"rul": float(prediction)}
-
-            elif task_type == TaskType.PRECURSOR:
-                # Sklearn model
-                prediction = model.predict([data])[0]
-                probs = model.predict_proba([data])[0].tolist() if hasattr(model, "predict_proba") else []
-                result = {"class": int(prediction), "probabilities": probs}
-
-            elif task_type == TaskType.CLUSTERING:
-                cluster = model.predict([data])[0]
-                result = {"cluster": int(cluster)}
-                
-            elif task_type == TaskType.DRIFT:
-                 # KS Test logic in pipeline, but here we might just predict if it matches ref
-                 # Actually drift is usually batch, but individual point check:
-                 # compare point to distribution? 
-                 # For simplicity, returning "check_pipeline" 
-                 result = {"status": "Drift detection requires batch analysis via pipeline"}
-
-            return result
+            if tenant_model is None:
+                outputs = self.predict_batch(task_type, rows)
+            else:
+                model_id, model = tenant_model
+                serving = ServingModel(key=model_id, version="tenant", stats_key=("ml_model", model_id, str(org_id)))
+                outputs = self._run_model(task_type, model, rows, serving, assembler)
             
+            for i, row, output in zip(indices, rows, outputs):
+                results[i] = output
+                if self.shadow is not None and org_id and asset_type and task_type != TaskType.DRIFT:
+                    self._submit_shadow(db, task_type, row, output, org_id, asset_type)
+        return results
+
+    def _submit_shadow(self, db: Session, task_type: TaskType, data: Any, result: Dict[str, Any], org_id: Any, asset_type: str):
+        """Hand a copy of the live input to shadow candidates; never fails the live request."""
+        try:
+            candidates = self.model_pool.shadow_candidates(db, org_id, asset_type, task_type, settings.SHADOW_MAX_CANDIDATES)
+            if candidates:
+                # Windows are already private copies; dicts may still be mutated by the caller
+                payload = dict(data) if isinstance(data, dict) else data
+                self.shadow.submit(task_type, payload, result, candidates)
+        except Exception as e:
+            logger.warning(f"Shadow submission skipped: {e}")
+
+    def _run_shadow(self, task_type: TaskType, candidate: Any, data: Any) -> Dict[str, Any]:
+        """Shadow worker: load the candidate via the pool and run it like a live tenant model."""
+        model = self.model_pool.acquire(candidate, shadow=True)
+        assembler = self.model_pool.assembler(candidate.model_id)
+        return self._execute(task_type, task_type.value, model, [data], ServingModel(version="shadow"), assembler)[0]
+
+    def _run_grouped(self, task_type: TaskType, items: List[Any]) -> List[Dict[str, Any]]:
+        """Batch fn for tenant models: items are (serving, model, assembler, data); one model call per distinct model."""
+        results: List[Any] = [None] * len(items)
+        groups: Dict[Any, Any] = {}
+        for i, (serving, model, assembler, _) in enumerate(items):
+            groups.setdefault((serving, id(model), id(assembler)), (serving, model, assembler, []))[3].append(i)
+        for serving, model, assembler, indices in groups.values():
+            outputs = self._run_model(task_type, model, [items[i][3] for i in indices], serving, assembler)
+            for i, output in zip(indices, outputs):
+                results[i] = output
+        return results
+
+    def _append_reading(self, asset_id: Any, data: Any, assembler: Optional[FeatureAssembler]) -> np.ndarray:
+        """
+        Engineer the reading's rolling features (same layout as training), add them to the
+        asset's ring buffer and return a copy of the (seq_len, width) window: the buffer view
+        would shift under a queued batch if another reading for the asset arrived first.
+        """
+        key = str(asset_id)
+        if isinstance(data, dict):
+            vector = self.feature_store.update(key, data)
+            if assembler is not None:
+                vector = assembler.assemble([dict(zip(self.feature_store.feature_names(key), vector))])[0]
+        elif assembler is not None:
+            vector = assembler.assemble([data])[0]
+        else:
+            vector = np.asarray(data, dtype=np.float32)
+        return self.sequence_buffers.append(key, vector).copy()
+
+    @staticmethod
+    def _to_vector(data: Any) -> Any:
+        # Raw request dicts carry sensor readings as values
+        if isinstance(data, dict):
+            return list(data.values())
+        return data
+
+    def predict_batch(self, task_type: TaskType, rows: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Runs one vectorized model call for a list of inputs and returns one result per input.
+        """
+        # Read the reference once: a concurrent hot swap affects only later batches
+        model = self.loaded_models.get(task_type)
+        if model is None:
+             raise ValueError(f"No loaded model for task: {task_type}")
+        
+        try:
+            return self._run_model(task_type, model, rows, self._serving_for(task_type))
         except Exception as e:
             logger.error(f"Prediction failed for {task_type}: {e}")
             raise e
 
+    def _serving_for(self, task_type: TaskType) -> ServingModel:
+        version = self.model_versions.get(task_type)
+        if not version:
+            return ServingModel()
+        return ServingModel(
+            key=version["id"],
+            version=version.get("version") or "unknown",
+            stats_key=("registry", version["id"], None),
+            artifact_path=version.get("artifact_path")
+        )
+
+    def _run_model(
+        self,
+        task_type: TaskType,
+        model: Any,
+        rows: List[Any],
+        serving: Optional[ServingModel] = None,
+        assembler: Optional[FeatureAssembler] = None
+    ) -> List[Dict[str, Any]]:
+        # Data preprocessing should ideally happen here or using a saved pipeline
+        # For this implementations, we assume 'data' is compatible or simple numpy/df
+        
+        if task_type == TaskType.DRIFT:
+             # Scored on a schedule by the streaming drift engine; without an asset type
+             # the summary over all asset types is returned
+             if isinstance(model, ReferenceSketch):
+                 return [self.drift.status() for _ in rows]
+             return [{"status": "Drift detection requires batch analysis via pipeline"} for _ in rows]
+        
+        serving = serving or ServingModel()
+        task_label = task_type.value if hasattr(task_type, "value") else str(task_type)
+        start = time.perf_counter()
+        try:
+            results = self._execute(task_type, task_label, model, rows, serving, assembler)
+        except Exception:
+            self.stats.record_batch(serving.stats_key, task_label, serving.version, len(rows), 0.0, failed=True)
+            raise
+        self.stats.record_batch(serving.stats_key, task_label, serving.version, len(rows), (time.perf_counter() - start) * 1000.0)
+        return results
+
+    def _execute(
+        self,
+        task_type: TaskType,
+        task_label: str,
+        model: Any,
+        rows: List[Any],
+        serving: ServingModel,
+        assembler: Optional[FeatureAssembler]
+    ) -> List[Dict[str, Any]]:
+        with self.stats.stage(task_label, serving.version, "preprocess"):
+            if rows and isinstance(rows[0], np.ndarray) and rows[0].ndim == 2:
+                # Sequence windows from the asset buffers (already assembled, private copies)
+                X = rows[0][np.newaxis] if len(rows) == 1 else np.stack(rows)
+            elif assembler is not None:
+                # Declared feature order + training normalization, float32
+                X = assembler.assemble(rows)
+            else:
+                X = np.asarray([self._to_vector(r) for r in rows], dtype=np.float64)
+            
+            # Serve repeated inputs from the result cache; only misses reach the model
+            cache = self.result_cache if serving.key else None
+            results: List[Any] = [None] * len(X)
+            if cache is not None:
+                keys = [cache.make_key(serving.key, task_type, x) for x in X]
+                for i, key in enumerate(keys):
+                    results[i] = cache.get(key)
+                misses = [i for i, r in enumerate(results) if r is None]
+                if not misses:
+                    return results
+                X = X[misses] if len(misses) < len(results) else X
+            else:
+                misses = list(range(len(X)))
+        
+        with self.stats.stage(task_label, serving.version, "model"):
+            if self.process_executor is not None and serving.artifact_path:
+                # Off the API process: the GIL stays free for request handling
+                outputs = self.process_executor.infer(
+                    task_type, serving.artifact_path, X, timeout=settings.INFERENCE_TIMEOUT_SECONDS
+                )
+            else:
+                outputs = infer_arrays(task_type, model, X)
+        
+        with self.stats.stage(task_label, serving.version, "postprocess"):
+            for i, result in zip(misses, format_results(task_type, outputs)):
+                results[i] = result
+                if cache is not None:
+                    cache.put(keys[i], result)
+        return results
+
+def infer_arrays(task_type: TaskType, model: Any, X: np.ndarray) -> np.ndarray:
+    """
+    Raw model outputs as a 2D float array, one row per input:
+    RUL -> [rul], PRECURSOR -> [class, *probabilities], CLUSTERING -> [cluster].
+    Module-level so inference worker processes can call it.
+    """
+    if task_type == TaskType.RUL:
+        # Sequence model: (batch, seq_len, features). Single readings become length-1 sequences.
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 2:
+            X = X[:, np.newaxis, :]
+        if hasattr(model, "predict"):
+            # Exported artifact (ONNX Runtime backend)
+            predictions = np.asarray(model.predict(X))
+        else:
+            import torch
+            with torch.no_grad():
+                predictions = model(torch.from_numpy(X)).numpy()
+        return predictions.reshape(len(X), -1)[:, :1].astype(np.float64)
+
+    # float64 for sklearn estimators (some reject float32 at predict time)
+    X = np.asarray(X, dtype=np.float64)
+    if task_type == TaskType.PRECURSOR:
+        # Sklearn model
+        classes = np.asarray(model.predict(X), dtype=np.float64).reshape(-1, 1)
+        if hasattr(model, "predict_proba"):
+            return np.hstack([classes, model.predict_proba(X)])
+        return classes
+
+    elif task_type == TaskType.CLUSTERING:
+        return np.asarray(model.predict(X), dtype=np.float64).reshape(-1, 1)
+
+    return np.zeros((len(X), 0))
+
+def format_results(task_type: TaskType, outputs: np.ndarray) -> List[Dict[str, Any]]:
+    """Turn infer_arrays() rows into API result dicts."""
+    if task_type == TaskType.RUL:
+        return [{"rul": float(row[0])} for row in outputs]
+    elif task_type == TaskType.PRECURSOR:
+        return [{"class": int(row[0]), "probabilities": row[1:].tolist()} for row in outputs]
+    elif task_type == TaskType.CLUSTERING:
+        return [{"cluster": int(row[0])} for row in outputs]
+    return [{} for _ in outputs]
+
 # specific singleton or factory
 inference_engine = InferenceEngine()
@@ -0,0 +1,138 @@
+import time
+import threading
+import logging
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import numpy as np
+from prometheus_client import Counter, Histogram
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_STAGE_SECONDS = Histogram(
+    "inference_stage_duration_seconds",
+    "Inference time per stage (preprocess, model, postprocess)",
+    ["task", "version", "stage"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+INFERENCE_BATCH_SIZE = Histogram(
+    "inference_batch_size",
+    "Rows per model call",
+    ["task", "version"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+INFERENCE_ERRORS = Counter(
+    "inference_errors_total",
+    "Failed inference calls",
+    ["task", "version", "stage"]
+)
+
+# ("registry", registry id, None) for global models, ("ml_model", MLModel id, org id) for tenant models
+StatsKey = Tuple[str, str, Optional[str]]
+
+@dataclass
+class _ModelStats:
+    batches: int = 0
+    rows: int = 0
+    errors: int = 0
+    latencies_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=2048))
+
+class InferenceStats:
+    """
+    Prometheus instrumentation for InferenceEngine plus per-model aggregates that
+    are periodically written back to the database:
+    - tenant models -> ModelMetric rows (inference_latency_p50_ms, _p95_ms, rows, error_rate, avg_batch_size)
+    - registry models -> ModelRegistry.metrics["serving"] (they have no ml_model row to reference)
+    """
+    def __init__(self):
+        self._stats: Dict[StatsKey, _ModelStats] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @contextmanager
+    def stage(self, task: str, version: str, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            INFERENCE_ERRORS.labels(task=task, version=version, stage=stage).inc()
+            raise
+        finally:
+            INFERENCE_STAGE_SECONDS.labels(task=task, version=version, stage=stage).observe(time.perf_counter() - start)
+
+    def record_batch(self, key: Optional[StatsKey], task: str, version: str, rows: int, latency_ms: float, failed: bool = False):
+        INFERENCE_BATCH_SIZE.labels(task=task, version=version).observe(rows)
+        if key is None:
+            return
+        with self._lock:
+            stats = self._stats.setdefault(key, _ModelStats())
+            stats.batches += 1
+            stats.rows += rows
+            if failed:
+                stats.errors += 1
+            else:
+                stats.latencies_ms.append(latency_ms)
+
+    def _drain(self) -> Dict[StatsKey, _ModelStats]:
+        with self._lock:
+            drained, self._stats = self._stats, {}
+        return drained
+
+    @staticmethod
+    def _summary(stats: _ModelStats) -> Dict[str, float]:
+        latencies = np.asarray(stats.latencies_ms) if stats.latencies_ms else np.zeros(1)
+        return {
+            "inference_latency_p50_ms": float(np.percentile(latencies, 50)),
+            "inference_latency_p95_ms": float(np.percentile(latencies, 95)),
+            "inference_rows": float(stats.rows),
+            "inference_error_rate": stats.errors / stats.batches if stats.batches else 0.0,
+            "inference_avg_batch_size": stats.rows / stats.batches if stats.batches else 0.0,
+        }
+
+    def flush(self, db: Session) -> int:
+        """Persist and reset the aggregates gathered since the last flush. Returns models written."""
+        from models.ml import ModelMetric
+        from models.registry import ModelRegistry
+
+        drained = self._drain()
+        now = datetime.utcnow()
+        for (kind, model_id, org_id), stats in drained.items():
+            summary = self._summary(stats)
+            if kind == "ml_model":
+                for name, value in summary.items():
+                    db.add(ModelMetric(model_id=model_id, org_id=org_id, metric_name=name, metric_value=value, timestamp=now))
+            else:
+                record = db.query(ModelRegistry).filter(ModelRegistry.id == model_id).first()
+                if record:
+                    # Reassign so the JSON column is flagged dirty
+                    record.metrics = {**(record.metrics or {}), "serving": {**summary, "updated_at": now.isoformat()}}
+        db.commit()
+        return len(drained)
+
+    def start_recorder(self, session_factory: Callable[[], Session], interval_seconds: float):
+        """Background thread that flushes aggregates every interval_seconds."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.wait(interval_seconds):
+                db = session_factory()
+                try:
+                    self.flush(db)
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"Inference metrics flush failed: {e}")
+                finally:
+                    db.close()
+
+        self._thread = threading.Thread(target=_run, name="inference-metrics", daemon=True)
+        self._thread.start()
+
+    def stop_recorder(self):
+        self._stop.set()
@@ -0,0 +1,274 @@
+import os
+import json
+import time
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models.ml import MLModel
+from ml.artifacts import load_artifact, estimate_model_bytes
+from ml.feature_assembler import FeatureAssembler
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, str] # (org_id, asset_type, task)
+
+@dataclass
+class PooledArtifact:
+    artifact_id: str
+    model: Any
+    size_bytes: int
+    model_ids: set = field(default_factory=set) # MLModel rows sharing this artifact
+    shadow: bool = False # Loaded only for shadow evaluation; counted against the shadow budget
+
+@dataclass
+class _Resolution:
+    model_id: Optional[str]
+    artifact_id: Optional[str]
+    path: Optional[str]
+    expires_at: float
+
+class ModelPool:
+    """
+    Lazily loaded per-tenant models keyed by (org_id, asset_type, task).
+
+    - Active MLModel rows are resolved on first use and re-resolved after resolve_ttl.
+    - Artifacts are deduplicated by checksum (or real path), so tenants sharing a
+      model share one in-memory copy.
+    - Resident size is tracked per artifact and the least recently used artifacts
+      are evicted once max_bytes is exceeded.
+    - Shadow candidates load under their own shadow_max_bytes budget and only ever
+      evict other shadow artifacts, so mirrored traffic cannot push out live models.
+      A shadow artifact that becomes live is moved to the live budget.
+    - Resolutions and compiled feature layouts are capped at max_keys entries. A layout
+      is rebuilt when its row's input_feature_list / normalization_params change and
+      dropped together with its artifact on eviction.
+    """
+    def __init__(
+        self,
+        max_bytes: int,
+        resolve_ttl_seconds: float = 30.0,
+        shadow_max_bytes: Optional[int] = None,
+        max_keys: int = 10000
+    ):
+        self.max_bytes = max_bytes
+        self.shadow_max_bytes = max_bytes // 4 if shadow_max_bytes is None else shadow_max_bytes
+        self.resolve_ttl = resolve_ttl_seconds
+        self.max_keys = max_keys
+        self._artifacts: "OrderedDict[str, PooledArtifact]" = OrderedDict()
+        self._resolutions: "OrderedDict[PoolKey, _Resolution]" = OrderedDict()
+        self._shadow_resolutions: "OrderedDict[PoolKey, Tuple[float, List[_Resolution]]]" = OrderedDict()
+        self._bytes = 0
+        self._shadow_bytes = 0
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        # model_id -> (input layout signature, compiled layout or None)
+        self._assemblers: "OrderedDict[str, Tuple[str, Optional[FeatureAssembler]]]" = OrderedDict()
+
+    @property
+    def resident_bytes(self) -> int:
+        return self._bytes
+
+    @staticmethod
+    def make_key(org_id: Any, asset_type: str, task: Any) -> PoolKey:
+        task_name = task.value if hasattr(task, "value") else str(task)
+        return (str(org_id), asset_type, task_name.lower())
+
+    @staticmethod
+    def _artifact_id(record: MLModel) -> str:
+        return record.checksum or os.path.realpath(record.file_path)
+
+    @staticmethod
+    def _key_conditions(key: PoolKey) -> list:
+        org_id, asset_type, task = key
+        return [
+            MLModel.org_id == org_id,
+            MLModel.asset_type == asset_type,
+            func.lower(MLModel.model_type) == task,
+            MLModel.deleted_at.is_(None)
+        ]
+
+    def _bounded_put(self, cache: OrderedDict, key: Any, value: Any) -> List[Any]:
+        """Insert as most recent and return the keys evicted to stay within max_keys."""
+        cache[key] = value
+        cache.move_to_end(key)
+        evicted = []
+        while len(cache) > self.max_keys:
+            evicted.append(cache.popitem(last=False)[0])
+        return evicted
+
+    def _resolution_for(self, record: MLModel, expires_at: float) -> _Resolution:
+        resolution = _Resolution(str(record.id), self._artifact_id(record), record.file_path, expires_at)
+        signature = json.dumps(
+            [getattr(record, "input_feature_list", None), getattr(record, "normalization_params", None)],
+            sort_keys=True, default=str
+        )
+        cached = self._assemblers.get(resolution.model_id)
+        if cached is None or cached[0] != signature:
+            # New model, or its feature list / normalization changed since it was compiled
+            cached = (signature, FeatureAssembler.from_record(record))
+        dropped = set(self._bounded_put(self._assemblers, resolution.model_id, cached))
+        if dropped:
+            # A cached resolution must never outlive its layout, or inputs would go unnormalized
+            self._drop_resolutions(lambda r: r.model_id in dropped)
+        return resolution
+
+    def _drop_resolutions(self, match) -> None:
+        for key, resolution in list(self._resolutions.items()):
+            if match(resolution):
+                self._resolutions.pop(key, None)
+        for key, (_, resolutions) in list(self._shadow_resolutions.items()):
+            if any(match(r) for r in resolutions):
+                self._shadow_resolutions.pop(key, None)
+
+    def _resolve(self, db: Session, key: PoolKey) -> _Resolution:
+        now = time.monotonic()
+        cached = self._resolutions.get(key)
+        if cached and cached.expires_at > now:
+            return cached
+
+        record = db.query(MLModel).filter(*self._key_conditions(key), MLModel.active == True).first()
+
+        if record:
+            resolution = self._resolution_for(record, now + self.resolve_ttl)
+        else:
+            resolution = _Resolution(None, None, None, now + self.resolve_ttl)
+        self._bounded_put(self._resolutions, key, resolution)
+        return resolution
+
+    def shadow_candidates(self, db: Session, org_id: Any, asset_type: str, task: Any, limit: int = 2) -> List[_Resolution]:
+        """
+        Inactive MLModel rows in deployment_stage 'shadow_evaluation' for the same key, cached for
+        resolve_ttl. Artifacts are not loaded here; call acquire() off the request path.
+        """
+        key = self.make_key(org_id, asset_type, task)
+        now = time.monotonic()
+        cached = self._shadow_resolutions.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        records = db.query(MLModel).filter(
+            *self._key_conditions(key),
+            MLModel.active == False,
+            MLModel.deployment_stage == "shadow_evaluation"
+        ).order_by(MLModel.created_at.desc()).limit(limit).all()
+        resolutions = [self._resolution_for(r, now + self.resolve_ttl) for r in records]
+        self._bounded_put(self._shadow_resolutions, key, (now + self.resolve_ttl, resolutions))
+        return resolutions
+
+    def invalidate(self, org_id: Any, asset_type: str, task: Any):
+        """Forget the cached resolutions, e.g. after /models/{id}/activate."""
+        key = self.make_key(org_id, asset_type, task)
+        self._resolutions.pop(key, None)
+        self._shadow_resolutions.pop(key, None)
+
+    def resolved_model_id(self, org_id: Any, asset_type: str, task: Any) -> Optional[str]:
+        """MLModel id of the last resolution for this key, without touching the database."""
+        resolution = self._resolutions.get(self.make_key(org_id, asset_type, task))
+        return resolution.model_id if resolution else None
+
+    def assembler(self, model_id: str) -> Optional[FeatureAssembler]:
+        """Compiled feature layout for a resolved model, if it declares input_feature_list."""
+        cached = self._assemblers.get(model_id)
+        return cached[1] if cached else None
+
+    def _forget_artifact(self, evicted: PooledArtifact):
+        # Caller holds self._lock. The next request re-resolves the row and recompiles its layout.
+        for model_id in evicted.model_ids:
+            self._assemblers.pop(model_id, None)
+        self._drop_resolutions(lambda r: r.artifact_id == evicted.artifact_id)
+
+    def get(self, db: Session, org_id: Any, asset_type: str, task: Any) -> Optional[Tuple[str, Any]]:
+        """
+        Returns (model_id, model) for the tenant's active model, loading it on first use,
+        or None if the tenant has no active model for this asset type and task.
+        """
+        key = self.make_key(org_id, asset_type, task)
+        resolution = self._resolve(db, key)
+        if not resolution.artifact_id:
+            return None
+        return resolution.model_id, self.acquire(resolution)
+
+    def acquire(self, resolution: _Resolution, shadow: bool = False) -> Any:
+        """The loaded model for a resolution, loading (and possibly evicting) on first use."""
+        with self._lock:
+            pooled = self._artifacts.get(resolution.artifact_id)
+            if pooled:
+                self._touch(pooled, shadow)
+                pooled.model_ids.add(resolution.model_id)
+                return pooled.model
+            load_lock = self._load_locks.setdefault(resolution.artifact_id, threading.Lock())
+
+        # One loader per artifact; concurrent callers wait instead of loading twice
+        with load_lock:
+            with self._lock:
+                pooled = self._artifacts.get(resolution.artifact_id)
+                if pooled:
+                    self._touch(pooled, shadow)
+            if pooled is None:
+                pooled = self._load(resolution, shadow)
+            pooled.model_ids.add(resolution.model_id)
+            return pooled.model
+
+    def _touch(self, pooled: PooledArtifact, shadow: bool):
+        # Caller holds self._lock. Shadow hits don't refresh recency of live artifacts.
+        if pooled.shadow and not shadow:
+            pooled.shadow = False
+            self._shadow_bytes -= pooled.size_bytes
+            self._bytes += pooled.size_bytes
+            self._artifacts.move_to_end(pooled.artifact_id)
+            self._evict(keep=pooled.artifact_id, shadow=False)
+        elif pooled.shadow == shadow:
+            self._artifacts.move_to_end(pooled.artifact_id)
+
+    def _load(self, resolution: _Resolution, shadow: bool = False) -> PooledArtifact:
+        logger.info(f"Loading {'shadow' if shadow else 'tenant'} model {resolution.model_id} from {resolution.path}")
+        model = load_artifact(resolution.path)
+        pooled = PooledArtifact(
+            artifact_id=resolution.artifact_id,
+            model=model,
+            size_bytes=estimate_model_bytes(model, resolution.path),
+            shadow=shadow
+        )
+        with self._lock:
+            self._artifacts[pooled.artifact_id] = pooled
+            if shadow:
+                self._shadow_bytes += pooled.size_bytes
+            else:
+                self._bytes += pooled.size_bytes
+            self._evict(keep=pooled.artifact_id, shadow=shadow)
+            self._load_locks.pop(pooled.artifact_id, None)
+        return pooled
+
+    def _evict(self, keep: str, shadow: bool = False):
+        # Caller holds self._lock; only artifacts of the same kind compete for a budget
+        budget = self.shadow_max_bytes if shadow else self.max_bytes
+        for artifact_id in list(self._artifacts):
+            if (self._shadow_bytes if shadow else self._bytes) <= budget:
+                break
+            candidate = self._artifacts[artifact_id]
+            if artifact_id == keep or candidate.shadow != shadow:
+                continue
+            evicted = self._artifacts.pop(artifact_id)
+            if shadow:
+                self._shadow_bytes -= evicted.size_bytes
+            else:
+                self._bytes -= evicted.size_bytes
+            self._forget_artifact(evicted)
+            logger.info(f"Evicted {'shadow' if shadow else 'model'} artifact {artifact_id} ({evicted.size_bytes} bytes) from pool")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "artifacts": len(self._artifacts),
+                "resident_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "shadow_resident_bytes": self._shadow_bytes,
+                "shadow_max_bytes": self.shadow_max_bytes,
+                "tenant_keys": len(self._resolutions)
+            }
@@ -53,4 +53,66 @@ class ModelSelectionEngine:
             
         return "RANDOM_FOREST_CLF" # Fallback
 
+    # Validation metric used to rank trained candidates: (metrics key, higher is better)
+    ACCURACY_METRICS = {
+        "RUL": ("rmse", False),
+        "PRECURSOR": ("accuracy", True),
+        "CLUSTERING": ("silhouette", True)
+    }
+
+    @staticmethod
+    def fits_budget(
+        benchmark: Optional[Dict[str, Any]],
+        max_latency_ms: Optional[float] = None,
+        max_memory_bytes: Optional[int] = None
+    ) -> bool:
+        """
+        Whether a serving benchmark (see ml.optimization.benchmark_serving) meets the SLO.
+        p95 single-row latency is compared against the latency budget.
+        Unbenchmarked models only fit when no budget is set.
+        """
+        if max_latency_ms is None and max_memory_bytes is None:
+            return True
+        if not benchmark:
+            return False
+        if max_latency_ms is not None and benchmark.get("latency_p95_ms", float("inf")) > max_latency_ms:
+            return False
+        if max_memory_bytes is not None and benchmark.get("memory_bytes", float("inf")) > max_memory_bytes:
+            return False
+        return True
+
+    @staticmethod
+    def select_registered_model(
+        candidates: List[Any],
+        task_type: str,
+        max_latency_ms: Optional[float] = None,
+        max_memory_bytes: Optional[int] = None
+    ) -> Optional[Any]:
+        """
+        Among trained candidates (ModelRegistry rows), return the most accurate one whose
+        serving benchmark fits the latency/memory budget; ties go to the faster model.
+        Returns None if nothing fits.
+        """
+        task = task_type.value.upper() if hasattr(task_type, "value") else str(task_type).upper()
+        metric, higher_is_better = ModelSelectionEngine.ACCURACY_METRICS.get(task, (None, True))
+        
+        def rank(candidate):
+            metrics = candidate.metrics or {}
+            score = metrics.get(metric)
+            if score is None:
+                score = float("-inf")
+            elif not higher_is_better:
+                score = -score
+            latency = (metrics.get("serving_benchmark") or {}).get("latency_p95_ms", float("inf"))
+            return (score, -latency)
+        
+        eligible = [
+            c for c in candidates
+            if ModelSelectionEngine.fits_budget((c.metrics or {}).get("serving_benchmark"), max_latency_ms, max_memory_bytes)
+        ]
+        if not eligible:
+            logging.getLogger(__name__).warning(f"No {task} model fits the serving budget ({max_latency_ms} ms, {max_memory_bytes} bytes)")
+            return None
+        return max(eligible, key=rank)
+
 model_selector = ModelSelectionEngine()
@@ -0,0 +1,42 @@
+from typing import Any, List
+
+import numpy as np
+
+from core.config import settings
+
+class OnnxModel:
+    """
+    sklearn-style wrapper around an ONNX Runtime CPU session, so exported
+    artifacts plug into InferenceEngine like the originals: predict(X) returns the
+    first graph output (labels, cluster ids or RUL values).
+    """
+    def __init__(self, session: Any):
+        self.session = session
+        model_input = session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.input_dtype = np.float64 if model_input.type == "tensor(double)" else np.float32
+        self.output_names: List[str] = [o.name for o in session.get_outputs()]
+        if isinstance(model_input.shape[-1], int):
+            self.n_features_in_ = model_input.shape[-1]
+
+    def _run(self, X: Any) -> List[np.ndarray]:
+        return self.session.run(None, {self.input_name: np.ascontiguousarray(X, dtype=self.input_dtype)})
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self._run(X)[0]
+
+class OnnxClassifier(OnnxModel):
+    """Exported classifiers also expose the 'probabilities' output (zipmap disabled at export)."""
+    def predict_proba(self, X: Any) -> np.ndarray:
+        return self._run(X)[self.output_names.index("probabilities")]
+
+def load_onnx_model(path: str) -> OnnxModel:
+    import onnxruntime as ort
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if settings.ONNX_INTRA_OP_THREADS:
+        options.intra_op_num_threads = settings.ONNX_INTRA_OP_THREADS
+    session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+    if "probabilities" in [o.name for o in session.get_outputs()]:
+        return OnnxClassifier(session)
+    return OnnxModel(session)
@@ -0,0 +1,152 @@
+import os
+import time
+import logging
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from models.registry import TaskType
+from ml.artifacts import load_artifact, estimate_model_bytes, _is_torch_module
+
+logger = logging.getLogger(__name__)
+
+def _export_torch_onnx(model: Any, X_sample: np.ndarray, path: str) -> str:
+    import torch
+    example = torch.from_numpy(np.ascontiguousarray(X_sample[:1], dtype=np.float32))
+    kwargs = dict(
+        input_names=["input"],
+        output_names=["output"],
+        dynamic_axes={"input": {0: "batch", 1: "seq"}, "output": {0: "batch"}}
+    )
+    try:
+        torch.onnx.export(model, (example,), path, dynamo=False, **kwargs)
+    except TypeError:
+        torch.onnx.export(model, (example,), path, **kwargs) # Older torch without the dynamo flag
+    return path
+
+def _quantize_torch(model: Any, path: str) -> str:
+    """Dynamic int8 quantization of LSTM/Linear weights (activations stay float)."""
+    import copy
+    import torch
+    quantized = torch.ao.quantization.quantize_dynamic(
+        copy.deepcopy(model), {torch.nn.LSTM, torch.nn.Linear}, dtype=torch.qint8
+    )
+    torch.save(quantized, path)
+    return path
+
+def _export_sklearn_onnx(model: Any, X_sample: np.ndarray, path: str) -> str:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    onnx_model = convert_sklearn(
+        model,
+        initial_types=[("input", FloatTensorType([None, X_sample.shape[1]]))],
+        options={id(model): {"zipmap": False}} if hasattr(model, "predict_proba") else None
+    )
+    with open(path, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+    return path
+
+def _quantize_onnx(source: str, path: str) -> str:
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    quantize_dynamic(source, path, weight_type=QuantType.QInt8)
+    return path
+
+def _candidates(model: Any, X_sample: np.ndarray, directory: str, basename: str) -> List[Tuple[str, Callable[[], str]]]:
+    """(backend name, exporter) pairs applicable to this model type."""
+    stem = os.path.join(directory, basename)
+    if _is_torch_module(model):
+        return [
+            ("onnx", lambda: _export_torch_onnx(model, X_sample, f"{stem}.onnx")),
+            ("onnx_int8", lambda: _quantize_onnx(f"{stem}.onnx", f"{stem}.int8.onnx")),
+            ("torch_int8", lambda: _quantize_torch(model, f"{stem}.int8.pt")),
+        ]
+    # Tree ensembles and other sklearn estimators; TreeEnsemble ops aren't int8-quantizable
+    return [("onnx", lambda: _export_sklearn_onnx(model, X_sample, f"{stem}.onnx"))]
+
+def _benchmark(task_type: TaskType, model: Any, X: np.ndarray, repeats: int) -> Tuple[np.ndarray, float]:
+    """Outputs on X and median wall time (ms) of one batched call."""
+    from ml.inference import infer_arrays
+    outputs = infer_arrays(task_type, model, X) # Also warms up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        infer_arrays(task_type, model, X)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return outputs, float(np.median(timings))
+
+def benchmark_serving(task_type: TaskType, model: Any, X_sample: np.ndarray, artifact_path: str, repeats: int = 50) -> Dict[str, float]:
+    """
+    Serving profile stored in ModelRegistry.metrics["serving_benchmark"] and used by
+    ModelSelectionEngine: single-row latency (p50/p95), batched throughput and memory.
+    """
+    from ml.inference import infer_arrays
+    X_sample = np.asarray(X_sample)
+    single = X_sample[:1]
+    infer_arrays(task_type, model, single) # Warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        infer_arrays(task_type, model, single)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    _, batch_ms = _benchmark(task_type, model, X_sample, max(1, repeats // 5))
+    return {
+        "latency_p50_ms": round(float(np.percentile(timings, 50)), 4),
+        "latency_p95_ms": round(float(np.percentile(timings, 95)), 4),
+        "batch_size": int(len(X_sample)),
+        "batch_latency_ms": round(batch_ms, 4),
+        "throughput_rows_per_s": round(len(X_sample) / (batch_ms / 1000.0), 1) if batch_ms > 0 else None,
+        "memory_bytes": int(estimate_model_bytes(model, artifact_path))
+    }
+
+def _fidelity(task_type: TaskType, reference: np.ndarray, outputs: np.ndarray) -> float:
+    """1.0 = identical. Label agreement for classifiers/clusters, 1 - relative RMSE for RUL."""
+    if task_type == TaskType.RUL:
+        rmse = float(np.sqrt(np.mean((outputs[:, 0] - reference[:, 0]) ** 2)))
+        scale = float(np.mean(np.abs(reference[:, 0]))) or 1.0
+        return max(0.0, 1.0 - rmse / scale)
+    return float(np.mean(outputs[:, 0] == reference[:, 0]))
+
+def optimize_artifact(
+    model: Any,
+    task_type: TaskType,
+    X_sample: np.ndarray,
+    original_path: str,
+    directory: str,
+    basename: str,
+    max_fidelity_loss: float = 0.01,
+    repeats: int = 20
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Export CPU-optimized variants of a trained model, benchmark each against the
+    original on X_sample and return (path of the fastest acceptable artifact, report).
+    A variant is acceptable if its fidelity to the original is >= 1 - max_fidelity_loss.
+    Missing optional tooling (onnx, skl2onnx, onnxruntime) just skips that variant.
+    """
+    X_sample = np.asarray(X_sample)
+    reference, baseline_ms = _benchmark(task_type, load_artifact(original_path), X_sample, repeats)
+    report: Dict[str, Any] = {"baseline_backend": "native", "baseline_ms": round(baseline_ms, 4), "candidates": {}}
+    best_path, best_ms, best_backend = original_path, baseline_ms, "native"
+
+    for backend, export in _candidates(model, X_sample, directory, basename):
+        try:
+            path = export()
+            outputs, latency_ms = _benchmark(task_type, load_artifact(path), X_sample, repeats)
+        except Exception as e:
+            logger.warning(f"Skipping {backend} export for {basename}: {e}")
+            report["candidates"][backend] = {"error": str(e)[:200]}
+            continue
+        fidelity = _fidelity(task_type, reference, outputs)
+        accepted = fidelity >= 1.0 - max_fidelity_loss
+        report["candidates"][backend] = {
+            "path": path,
+            "latency_ms": round(latency_ms, 4),
+            "fidelity": round(fidelity, 6),
+            "accepted": accepted
+        }
+        if accepted and latency_ms < best_ms:
+            best_path, best_ms, best_backend = path, latency_ms, backend
+
+    report["selected_backend"] = best_backend
+    report["selected_ms"] = round(best_ms, 4)
+    report["speedup"] = round(baseline_ms / best_ms, 3) if best_ms > 0 else None
+    return best_path, report
@@ -0,0 +1,179 @@
+import logging
+import threading
+import multiprocessing as mp
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from ml.artifacts import load_artifact
+from ml.batching import BatcherOverloadedError, InferenceTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Worker-process state: artifact path -> loaded model (mmap-backed where possible)
+_worker_models: Dict[str, Any] = {}
+
+def _get_worker_model(path: str) -> Any:
+    model = _worker_models.get(path)
+    if model is None:
+        model = load_artifact(path)
+        _worker_models[path] = model
+    return model
+
+def _init_worker(preload_paths: Tuple[str, ...]):
+    """Runs once per worker process: load the active models before serving."""
+    try:
+        import torch
+        torch.set_num_threads(1) # One process per core; avoid intra-op oversubscription
+    except ImportError:
+        pass
+    import ml.inference # Pay the import cost before the first request
+    for path in preload_paths:
+        try:
+            _get_worker_model(path)
+        except Exception as e:
+            logger.error(f"Inference worker failed to preload {path}: {e}")
+
+def _ready() -> bool:
+    return True
+
+def _write_shared(array: np.ndarray) -> SharedMemory:
+    shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm
+
+def _worker_infer(task_value: str, path: str, in_name: str, shape: Tuple[int, ...], dtype: str) -> Tuple[str, Tuple[int, ...]]:
+    """
+    Read inputs from the caller's shared block, run the model and write outputs to a
+    new shared block. Returns (block name, output shape); the caller unlinks it.
+    """
+    from models.registry import TaskType
+    from ml.inference import infer_arrays
+
+    shm = SharedMemory(name=in_name)
+    try:
+        X = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        out = np.ascontiguousarray(infer_arrays(TaskType(task_value), _get_worker_model(path), X), dtype=np.float64)
+    finally:
+        shm.close()
+
+    out_shm = _write_shared(out)
+    name = out_shm.name
+    out_shm.close()
+    return name, out.shape
+
+def _discard_output(future: Future):
+    """Unlink the output block of a call whose caller already timed out."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    out_name, _ = future.result()
+    try:
+        shm = SharedMemory(name=out_name)
+        shm.close()
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+class ProcessInferenceExecutor:
+    """
+    Runs CPU-bound model calls in long-lived worker processes so they never hold
+    the API process's GIL.
+
+    - Workers are spawned once and preload the active artifacts; artifacts they have
+      not seen yet (after a hot swap) are loaded on first use.
+    - Inputs (float32/float64) and outputs (float64) cross the process boundary as
+      shared-memory blocks; only block names, shapes and dtypes are pickled.
+    - At most max_pending calls may be in flight; beyond that BatcherOverloadedError
+      is raised so the route can shed load.
+    - If a worker dies (OOM, crash in a native kernel) the pool is rebuilt, preloading
+      the artifacts served most recently, and the call is retried once.
+    """
+    MAX_PRELOAD_PATHS = 16
+
+    def __init__(self, workers: int, max_pending: int, preload_paths: Iterable[str] = ()):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._preload: "OrderedDict[str, None]" = OrderedDict((path, None) for path in preload_paths)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._restart_lock = threading.Lock()
+        self._pool = self._start_pool()
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        # spawn, not fork: the API process runs threads (batchers, watchers, kafka)
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(tuple(self._preload),)
+        )
+        # Spawn and initialise every worker now rather than on the first requests
+        for future in [pool.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+        return pool
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        """Replace a pool whose worker died; concurrent callers share one rebuild."""
+        with self._restart_lock:
+            if self._pool is not broken:
+                return
+            logger.error("Inference worker process died; restarting the process pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._start_pool()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def infer(self, task_type: Any, artifact_path: str, X: np.ndarray, timeout: Optional[float] = None) -> np.ndarray:
+        """Raw model outputs for X (see ml.inference.infer_arrays), computed in a worker."""
+        if not self._slots.acquire(blocking=False):
+            raise BatcherOverloadedError(f"Inference process pool has {self.max_pending} calls in flight")
+        with self._lock:
+            self._pending += 1
+            # Remember what is being served so a rebuilt pool warms up with it
+            self._preload[artifact_path] = None
+            self._preload.move_to_end(artifact_path)
+            while len(self._preload) > self.MAX_PRELOAD_PATHS:
+                self._preload.popitem(last=False)
+        try:
+            X = np.ascontiguousarray(X)
+            in_shm = _write_shared(X)
+            try:
+                task_value = task_type.value if hasattr(task_type, "value") else str(task_type)
+                for attempt in range(2):
+                    pool = self._pool
+                    try:
+                        future = pool.submit(_worker_infer, task_value, artifact_path, in_shm.name, X.shape, X.dtype.str)
+                        out_name, out_shape = future.result(timeout=timeout)
+                        break
+                    except FutureTimeoutError:
+                        if not future.cancel():
+                            future.add_done_callback(_discard_output)
+                        raise InferenceTimeoutError(f"Inference worker did not respond within {timeout}s")
+                    except BrokenProcessPool:
+                        if attempt:
+                            raise
+                        self._restart(pool)
+            finally:
+                in_shm.close()
+                in_shm.unlink()
+
+            out_shm = SharedMemory(name=out_name)
+            try:
+                return np.ndarray(out_shape, dtype=np.float64, buffer=out_shm.buf).copy()
+            finally:
+                out_shm.close()
+                out_shm.unlink()
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
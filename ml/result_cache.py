@@ -0,0 +1,58 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+from prometheus_client import Counter
+
+RESULT_CACHE_REQUESTS = Counter(
+    "inference_result_cache_total",
+    "Inference result cache lookups",
+    ["task", "result"]
+)
+
+CacheKey = Tuple[str, str, bytes] # (model key, task, feature digest)
+
+class InferenceResultCache:
+    """
+    Bounded LRU of model outputs keyed by (model id, task, hash of the quantized
+    input). Inputs are rounded to `decimals` before hashing so float noise in
+    resent readings still hits. Entries for a model are dropped when it is swapped out.
+    """
+    def __init__(self, max_entries: int, decimals: int = 4):
+        self.max_entries = max_entries
+        self.decimals = decimals
+        self._entries: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def make_key(self, model_key: str, task: Any, features: np.ndarray) -> CacheKey:
+        quantized = np.round(np.asarray(features, dtype=np.float64), self.decimals) + 0.0 # -0.0 -> 0.0
+        digest = hashlib.blake2b(quantized.tobytes(), digest_size=16)
+        digest.update(str(quantized.shape).encode())
+        task_name = task.value if hasattr(task, "value") else str(task)
+        return (model_key, task_name, digest.digest())
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+        RESULT_CACHE_REQUESTS.labels(task=key[1], result="hit" if result is not None else "miss").inc()
+        return dict(result) if result is not None else None
+
+    def put(self, key: CacheKey, result: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = dict(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_model(self, model_key: Hashable):
+        """Drop every entry produced by a model (called on hot swap)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == model_key]:
+                del self._entries[key]
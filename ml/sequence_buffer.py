@@ -0,0 +1,74 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import numpy as np
+
+class SequenceRingBuffer:
+    """
+    Fixed-size window of the last seq_len feature vectors for one asset.
+
+    Rows are stored twice in a (2 * seq_len, width) array, so the current window
+    is always one contiguous slice: window() is a view, oldest row first, and
+    append() is two row writes with no shifting or reallocation.
+    Until seq_len readings have arrived the window is padded with the first one.
+    """
+    def __init__(self, seq_len: int, width: int, dtype=np.float32):
+        self.seq_len = seq_len
+        self.width = width
+        self._buf = np.zeros((2 * seq_len, width), dtype=dtype)
+        self._pos = 0 # Slot the next reading goes to == start of the current window
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.seq_len
+
+    def append(self, vector: Any):
+        if self.count == 0:
+            self._buf[:] = vector # Edge-pad so early windows have full length
+        else:
+            self._buf[self._pos] = vector
+            self._buf[self._pos + self.seq_len] = vector
+        self._pos = (self._pos + 1) % self.seq_len
+        self.count = min(self.count + 1, self.seq_len)
+
+    def window(self) -> np.ndarray:
+        """(seq_len, width) view, oldest reading first. Callers must not write to it."""
+        return self._buf[self._pos:self._pos + self.seq_len]
+
+class SequenceBufferStore:
+    """Per-asset ring buffers with an LRU cap on the number of assets kept."""
+    def __init__(self, seq_len: int, max_assets: int, dtype=np.float32):
+        self.seq_len = seq_len
+        self.max_assets = max_assets
+        self.dtype = dtype
+        self._buffers: "OrderedDict[Hashable, SequenceRingBuffer]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def append(self, asset_id: Hashable, vector: Any) -> np.ndarray:
+        """Record a reading and return the asset's current window (a view)."""
+        vector = np.asarray(vector, dtype=self.dtype).ravel()
+        with self._lock:
+            buffer = self._buffers.get(asset_id)
+            if buffer is None or buffer.width != vector.shape[0]:
+                # New asset, or the model's input layout changed: start over
+                buffer = SequenceRingBuffer(self.seq_len, vector.shape[0], self.dtype)
+                self._buffers[asset_id] = buffer
+                while len(self._buffers) > self.max_assets:
+                    self._buffers.popitem(last=False)
+            else:
+                self._buffers.move_to_end(asset_id)
+            buffer.append(vector)
+            return buffer.window()
+
+    def window(self, asset_id: Hashable) -> Optional[np.ndarray]:
+        buffer = self._buffers.get(asset_id)
+        return buffer.window() if buffer else None
+
+    def reset(self, asset_id: Hashable):
+        with self._lock:
+            self._buffers.pop(asset_id, None)
@@ -0,0 +1,132 @@
+import time
+import queue
+import random
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+SHADOW_REQUESTS = Counter(
+    "shadow_inference_total",
+    "Shadow evaluation work items",
+    ["task", "result"] # enqueued, dropped, evaluated, error
+)
+
+@dataclass
+class ShadowStats:
+    """Running agreement/latency statistics for one candidate, updated in O(1)."""
+    task: str
+    count: int = 0
+    agreements: int = 0
+    errors: int = 0
+    abs_diff_sum: float = 0.0
+    latency_mean_ms: float = 0.0
+    latency_max_ms: float = 0.0
+
+    def update(self, agreed: bool, abs_diff: float, latency_ms: float):
+        self.count += 1
+        self.agreements += int(agreed)
+        self.abs_diff_sum += abs_diff
+        self.latency_mean_ms += (latency_ms - self.latency_mean_ms) / self.count
+        self.latency_max_ms = max(self.latency_max_ms, latency_ms)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "task": self.task,
+            "evaluated": self.count,
+            "errors": self.errors,
+            "agreement_rate": self.agreements / self.count if self.count else None,
+            "mean_abs_diff": self.abs_diff_sum / self.count if self.count else None,
+            "latency_mean_ms": round(self.latency_mean_ms, 4),
+            "latency_max_ms": round(self.latency_max_ms, 4)
+        }
+
+def compare_results(task: str, live: Dict[str, Any], shadow: Dict[str, Any], rul_tolerance: float) -> Tuple[bool, float]:
+    """(agreed, absolute difference). RUL agrees within a relative tolerance; labels must match."""
+    if task == "rul":
+        diff = abs(float(live["rul"]) - float(shadow["rul"]))
+        return diff <= rul_tolerance * max(1.0, abs(float(live["rul"]))), diff
+    field = "class" if task == "precursor" else "cluster"
+    agreed = live.get(field) == shadow.get(field)
+    return agreed, 0.0 if agreed else 1.0
+
+class ShadowEvaluator:
+    """
+    Runs candidate models on copies of live inputs in a background thread.
+
+    The request path only samples and does a non-blocking put on a bounded queue;
+    when the queue is full the item is dropped, so shadow work never adds latency
+    or backpressure to live predictions.
+    run_fn(task, candidate, data) must return the candidate's result dict.
+    """
+    def __init__(
+        self,
+        run_fn: Callable[[Any, Any, Any], Dict[str, Any]],
+        max_queue_size: int = 256,
+        sample_rate: float = 1.0,
+        rul_tolerance: float = 0.1
+    ):
+        self.run_fn = run_fn
+        self.sample_rate = sample_rate
+        self.rul_tolerance = rul_tolerance
+        self._queue: "queue.Queue[Tuple[Any, Any, Dict[str, Any], List[Any]]]" = queue.Queue(maxsize=max_queue_size)
+        self._stats: Dict[str, ShadowStats] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="shadow-evaluator", daemon=True)
+                    self._thread.start()
+
+    def submit(self, task: Any, data: Any, live_result: Dict[str, Any], candidates: List[Any]) -> bool:
+        """Enqueue one live input for every candidate. Returns False if sampled out or dropped."""
+        if not candidates or random.random() >= self.sample_rate:
+            return False
+        task_name = task.value if hasattr(task, "value") else str(task)
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((task, data, live_result, candidates))
+        except queue.Full:
+            SHADOW_REQUESTS.labels(task=task_name, result="dropped").inc()
+            return False
+        SHADOW_REQUESTS.labels(task=task_name, result="enqueued").inc()
+        return True
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self, model_id: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            if model_id is not None:
+                stats = self._stats.get(str(model_id))
+                return stats.as_dict() if stats else {}
+            return {mid: s.as_dict() for mid, s in self._stats.items()}
+
+    def _run(self):
+        while True:
+            task, data, live_result, candidates = self._queue.get()
+            task_name = task.value if hasattr(task, "value") else str(task)
+            for candidate in candidates:
+                model_id = str(candidate.model_id)
+                with self._lock:
+                    stats = self._stats.setdefault(model_id, ShadowStats(task=task_name))
+                start = time.perf_counter()
+                try:
+                    result = self.run_fn(task, candidate, data)
+                    latency_ms = (time.perf_counter() - start) * 1000.0
+                    agreed, diff = compare_results(task_name, live_result, result, self.rul_tolerance)
+                    with self._lock:
+                        stats.update(agreed, diff, latency_ms)
+                    SHADOW_REQUESTS.labels(task=task_name, result="evaluated").inc()
+                except Exception as e:
+                    with self._lock:
+                        stats.errors += 1
+                    SHADOW_REQUESTS.labels(task=task_name, result="error").inc()
+                    logger.debug(f"Shadow model {model_id} failed: {e}")
@@ -155,3 +155,42 @@ class AssetHealthState(Base, TenantMixin):
     
     # Historical Damage Rates (for RUL derivation)
     damage_rate_history = Column(JSON, default=list) # List of recent increments
+
+class AssetStatusLatest(Base, TenantMixin):
+    """
+    Denormalized read model: one row per asset with the latest health vectors and RUL bounds.
+    Maintained incrementally by the telemetry and RUL consumers so fleet/dashboard reads
+    are a single indexed scan instead of Asset + AssetHealthState + RUL joins.
+    """
+    __tablename__ = "asset_status_latest"
+    
+    asset_id = Column(UUID(as_uuid=True), ForeignKey("asset.id"), nullable=False, unique=True)
+    
+    __table_args__ = (
+        Index("idx_status_latest_tenant_name", "org_id", "asset_name"),
+    )
+    
+    # Denormalized Asset Attributes
+    asset_name = Column(String, nullable=False)
+    asset_type = Column(String, nullable=True)
+    location = Column(String, nullable=True)
+    status = Column(String, nullable=True)
+    criticality_score = Column(Integer, default=1)
+    
+    # Health Vectors (0-100)
+    mechanical_health_score = Column(Float, nullable=True)
+    thermal_health_score = Column(Float, nullable=True)
+    electrical_health_score = Column(Float, nullable=True)
+    environmental_health_score = Column(Float, nullable=True)
+    operational_health_score = Column(Float, nullable=True)
+    total_cumulative_damage = Column(Float, nullable=True)
+    confidence_score = Column(Float, nullable=True)
+    
+    # RUL Bounds
+    rul_mean = Column(Float, nullable=True)
+    rul_lower_bound = Column(Float, nullable=True)
+    rul_upper_bound = Column(Float, nullable=True)
+    rul_confidence = Column(Float, nullable=True)
+    
+    last_seen = Column(DateTime, nullable=True) # Last telemetry received
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -75,7 +75,7 @@ class MLModel(Base, AuditMixin, SoftDeleteMixin, TenantMixin):
     
     file_path = Column(String, nullable=False)
     active = Column(Boolean, default=False)
-    deployment_stage = Column(String, default="shadow") # shadow, canary, active
+    deployment_stage = Column(String, default="registered") # registered, shadow_evaluation, canary, active, retired
     
     input_feature_list = Column(JSON, nullable=True)
     window_size = Column(Integer, nullable=True)
@@ -127,7 +127,7 @@ class Prediction(Base, TenantMixin):
     # The clean way in SQLAlchemy Declarative is to redefine columns.
     
     asset_id = Column(UUID(as_uuid=True), ForeignKey("asset.id"), nullable=False)
-    model_id = Column(UUID(as_uuid=True), ForeignKey("ml_model.id"), nullable=False)
+    model_id = Column(UUID(as_uuid=True), ForeignKey("ml_model.id"), nullable=True) # NULL when served by a global registry model
     result = Column(JSON, nullable=False)
     
     timestamp = Column(DateTime, default=func.now(), nullable=False, primary_key=True)
@@ -13,6 +13,10 @@ from datetime import datetime
 from models.registry import TaskType
 from services.registry_service import ModelRegistryService
 from pipelines.utils import compute_rolling_features, create_sliding_windows
+from ml.artifacts import save_artifact, load_artifact
+from ml.optimization import optimize_artifact, benchmark_serving
+from ml.drift_sketch import ReferenceSketch
+from core.config import settings
 
 class SimpleLSTM(nn.Module):
     def __init__(self, input_size, hidden_size, output_size):
@@ -61,15 +65,44 @@ class TrainingPipeline(ABC):
         model = self.train_model(X_train, y_train)
         self.metrics = self.validate_model(model, X_test, y_test)
         
-        os.makedirs(self.save_path, exist_ok=True)
-        artifact_filename = f"{pipeline_name}_{version}.pkl"
-        full_path = os.path.join(self.save_path, artifact_filename)
-        joblib.dump(model, full_path)
+        # mmap-friendly layout (.pt for torch, uncompressed joblib otherwise)
+        full_path = save_artifact(model, self.save_path, f"{pipeline_name}_{version}")
         
+        servable = task_type in (TaskType.RUL, TaskType.PRECURSOR, TaskType.CLUSTERING) and len(X_test) > 0
+        X_sample = X_test[:settings.INFERENCE_MAX_BATCH_SIZE] if servable else None
+        
+        # Optional CPU-optimized export (ONNX / int8); the fastest accurate artifact is registered
+        if settings.MODEL_OPTIMIZATION_ENABLED and servable:
+            try:
+                full_path, report = optimize_artifact(
+                    model, task_type, X_sample, full_path,
+                    self.save_path, f"{pipeline_name}_{version}", settings.MODEL_OPTIMIZATION_MAX_FIDELITY_LOSS
+                )
+                self.metrics["optimization"] = report
+            except Exception as e:
+                print(f"Model optimization skipped: {e}")
+        
+        # Latency / throughput / memory profile of the artifact being registered
+        if servable:
+            try:
+                self.metrics["serving_benchmark"] = benchmark_serving(task_type, load_artifact(full_path), X_sample, full_path)
+            except Exception as e:
+                print(f"Serving benchmark skipped: {e}")
+        
+        # The serving SLO only applies to models that can be benchmarked; drift sketches
+        # and models without held-out rows are activated as soon as they are trained
+        budgeted = servable and (
+            settings.MODEL_SELECTION_LATENCY_BUDGET_MS is not None or settings.MODEL_SELECTION_MEMORY_BUDGET_BYTES is not None
+        )
         self.registry_service.register_model(
             name=pipeline_name, version=version, task_type=task_type,
-            dataset_name=dataset_name, artifact_path=full_path, metrics=self.metrics, is_active=True 
+            dataset_name=dataset_name, artifact_path=full_path, metrics=self.metrics, is_active=not budgeted
         )
+        if budgeted:
+            # Activate the most accurate registered model that fits the serving SLO
+            self.registry_service.activate_best_model(
+                task_type, settings.MODEL_SELECTION_LATENCY_BUDGET_MS, settings.MODEL_SELECTION_MEMORY_BUDGET_BYTES
+            )
         return self.metrics
 
 class RULRegressionPipeline(TrainingPipeline):
@@ -180,5 +213,11 @@ class AwesomeRegressionPipeline(RULRegressionPipeline):
         return pd.read_csv(path) if os.path.exists(path) else super().load_data()
 
 class DriftDetectionPipeline(ClusteringPipeline):
-    def train_model(self, X: Any, y: Any) -> Any: return X
-    def validate_model(self, model: Any, X_t: Any, y_t: Any) -> Dict[str, float]: return {"drift": 0.0}
+    """The 'model' is a per-feature reference quantile sketch that live telemetry is scored against."""
+    def feature_engineering(self, data: pd.DataFrame) -> Tuple[Any, Any]: return data.select_dtypes(include=np.number), None
+    def train_model(self, X: Any, y: Any) -> Any:
+        return ReferenceSketch.fit(X.values, list(X.columns), settings.DRIFT_SKETCH_BINS)
+    def validate_model(self, model: Any, X_t: Any, y_t: Any) -> Dict[str, float]:
+        if len(X_t) == 0: return {"drift": 0.0}
+        ks, psi = model.compare(X_t.values)
+        return {"drift": float(np.nanmax(psi)), "ks_max": float(np.nanmax(ks)), "features": len(model.feature_names)}
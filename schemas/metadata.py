@@ -97,3 +97,37 @@ class AssetMetadataResponse(AssetMetadataBase):
 
     class Config:
         from_attributes = True # V2 Config
+
+# --- Cache Snapshot (immutable, full graph) ---
+
+class AssetOperationProfileSnapshot(AssetOperationProfileBase):
+    class Config:
+        from_attributes = True
+        frozen = True
+
+class AssetShiftScheduleSnapshot(AssetShiftScheduleBase):
+    active_days: tuple = ("MON","TUE","WED","THU","FRI")
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+class AssetEnvironmentProfileSnapshot(AssetEnvironmentProfileBase):
+    class Config:
+        from_attributes = True
+        frozen = True
+
+class AssetMetadataSnapshot(AssetMetadataResponse):
+    """
+    Read-only metadata graph served from cache, keyed by (asset_id, version).
+    Built once from the ORM on a cache miss; never mutated afterwards.
+    """
+    org_id: Optional[UUID] = None
+
+    operation_profile: Optional[AssetOperationProfileSnapshot] = None
+    shift_schedule: Optional[AssetShiftScheduleSnapshot] = None
+    environment_profile: Optional[AssetEnvironmentProfileSnapshot] = None
+
+    class Config:
+        from_attributes = True
+        frozen = True
@@ -60,6 +60,7 @@ class MLModel(MLModelBase):
     active: bool
     org_id: UUID
     checksum: Optional[str] = None
+    deployment_stage: Optional[str] = None
     created_at: datetime
     
     class Config:
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, List
 from uuid import UUID
 
 class PredictionRequest(BaseModel):
@@ -10,3 +10,11 @@ class PredictionRequest(BaseModel):
 class PredictionResponse(BaseModel):
     prediction: Dict[str, Any]
     model_id: UUID
+
+class BatchPredictionItem(BaseModel):
+    asset_id: UUID
+    data: Dict[str, Any]
+
+class BatchPredictionRequest(BaseModel):
+    model_type: str = "RUL"
+    items: List[BatchPredictionItem]
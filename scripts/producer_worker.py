@@ -3,13 +3,15 @@ import os
 import time
 import json
 import logging
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func
 from sqlalchemy.orm import sessionmaker
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from core.events import ProducerFactory
+from core.config import settings
+from core.events import ProducerFactory, KafkaTimeoutError
+from core.circuit_breaker import CircuitOpenError
 from models.outbox import OutboxEvent, OutboxStatus
 from db.base_class import Base
 
@@ -28,7 +30,7 @@ def process_outbox():
     Polls Outbox table for PENDING events and publishes them.
     Attributes 'Transactional Outbox' pattern.
     """
-    producer = ProducerFactory.get_producer()
+    producer = ProducerFactory.get_producer(max_block_ms=int(settings.KAFKA_WORKER_MAX_BLOCK_SECONDS * 1000))
     db = SessionLocal()
     
     try:
@@ -57,6 +59,10 @@ def process_outbox():
                 
                 logger.info(f"Published event {event.id} to {event.topic}")
                 
+            except (CircuitOpenError, KafkaTimeoutError) as e:
+                # Broker degraded or still starting: leave remaining events PENDING for the next poll
+                logger.warning(f"Kafka unavailable ({type(e).__name__}), deferring remaining events.")
+                break
             except Exception as e:
                 logger.error(f"Failed to publish event {event.id}: {e}")
                 event.status = OutboxStatus.FAILED
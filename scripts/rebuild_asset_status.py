@@ -0,0 +1,23 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from db.session import SessionLocal
+from services.asset_status_service import AssetStatusService
+
+def rebuild_asset_status():
+    """
+    Backfills the 'asset_status_latest' read model from Asset + AssetHealthState.
+    Run once after deploying the read model; consumers keep it current afterwards.
+    """
+    db = SessionLocal()
+    try:
+        count = AssetStatusService.rebuild(db)
+        print(f"Rebuilt asset_status_latest for {count} assets.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_asset_status()
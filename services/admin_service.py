@@ -104,6 +104,12 @@ class AdminService:
             MLModel.active == True
         ).count()
 
+        # Average health from the latest-status read model
+        from models.intelligence import AssetStatusLatest
+        avg_health = db.query(func.avg(AssetStatusLatest.operational_health_score)).filter(
+            AssetStatusLatest.org_id == org_id
+        ).scalar()
+
         # Trend Simulation (Mocked delta for UI demonstration if no historical data table exists)
         # In prod, we'd query history tables or TimeScaleDB aggregates
         
@@ -116,7 +122,7 @@ class AdminService:
             },
             "risk": {
                 "critical_assets": critical_assets,
-                "avg_health_index": 85.4, # Placeholder or expensive calc
+                "avg_health_index": round(float(avg_health), 1) if avg_health is not None else None,
                 "trend": "-5%"
             },
             "predictions": {
@@ -134,27 +140,31 @@ class AdminService:
         """
         Supports 3. ASSET & FLEET INTELLIGENCE SERVICE.
         """
-        assets = db.query(Asset).filter(Asset.org_id == org_id).offset(skip).limit(limit).all()
+        from services.asset_status_service import AssetStatusService
+        rows = AssetStatusService.get_fleet(db, org_id, skip, limit)
         
         results = []
-        for asset in assets:
+        for row in rows:
             # Determine Risk Classification dynamically
             risk_level = "LOW"
-            if asset.criticality_score >= 8:
+            criticality = row.criticality_score or 1 # Rows written before an asset had a score
+            if criticality >= 8:
                 risk_level = "CRITICAL"
-            elif asset.criticality_score >= 5:
+            elif criticality >= 5:
                 risk_level = "MEDIUM"
                 
             results.append({
-                "asset_id": str(asset.id),
-                "name": asset.name,
-                "type": asset.type,
-                "location": asset.location,
-                "health_index": 90, # TODO: Store this on asset or compute from latest prediction
-                "rul_days": 120, # TODO: Retrieve from latest RUL prediction
+                "asset_id": str(row.asset_id),
+                "name": row.asset_name,
+                "type": row.asset_type,
+                "location": row.location,
+                "health_index": row.operational_health_score,
+                "rul_days": row.rul_mean,
+                "rul_lower_bound": row.rul_lower_bound,
+                "rul_upper_bound": row.rul_upper_bound,
                 "risk_level": risk_level,
-                "last_seen": datetime.utcnow().isoformat(), # Mock, or use tracking field
-                "status": asset.status
+                "last_seen": row.last_seen.isoformat() if row.last_seen else None,
+                "status": row.status
             })
         return results
 
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 import json
@@ -18,12 +18,11 @@ class AlertEngine:
     """
     
     @staticmethod
-    def process_health_and_alert(
-        db: Session, 
-        asset_id: UUID, 
-        health_state: AssetHealthState,
-        prediction_result: Dict[str, Any]
-    ) -> Optional[Alert]:
+    def assess(health_state: AssetHealthState) -> Optional[Dict[str, Any]]:
+        """
+        Threshold, confidence and persistence checks on an already loaded health state.
+        No database access; returns the alert draft or None.
+        """
         # 1. Threshold Check (e.g. Health Score < 80)
         dominant_vector = "overall"
         min_score = health_state.operational_health_score
@@ -55,11 +54,69 @@ class AlertEngine:
         
         # Persistence check: Recent damage is 2x baseline
         persists = recent_avg > (long_term_avg * 2.0)
+        if not (min_score < 70 and persists):
+            return None
         
-        if min_score < 70 and persists:
-            # Trigger Alert
-            severity = "HIGH" if min_score < 40 else "MEDIUM"
-            
+        return {
+            "dominant_vector": dominant_vector,
+            "min_score": min_score,
+            "severity": "HIGH" if min_score < 40 else "MEDIUM",
+            "title": f"Probabilistic Failure Risk: {dominant_vector.capitalize()} Sector",
+            "recent_avg": recent_avg,
+            "long_term_avg": long_term_avg
+        }
+
+    @staticmethod
+    def _new_alert(asset_id: UUID, draft: Dict[str, Any], confidence_score: float) -> Alert:
+        dominant_vector, min_score = draft["dominant_vector"], draft["min_score"]
+        recent_avg, long_term_avg = draft["recent_avg"], draft["long_term_avg"]
+        return Alert(
+            asset_id=asset_id,
+            title=draft["title"],
+            description=f"Degradation detected in {dominant_vector} health vector. Health Score: {min_score:.1f}",
+            severity=draft["severity"],
+            status="OPEN",
+            category="PREDICTIVE_FAILURE",
+            meta_data={
+                "probability": 1.0 - (min_score / 100.0),
+                "dominant_vector": dominant_vector,
+                "confidence_score": confidence_score,
+                "persistence_indicators": {
+                    "recent_damage_vs_avg": recent_avg / (long_term_avg + 1e-6)
+                }
+            }
+        )
+
+    @staticmethod
+    def _outbox_event(alert: Alert, asset_id: UUID, org_id: Optional[UUID]):
+        from models.outbox import OutboxEvent, OutboxStatus
+        payload = {
+            "alert_id": str(alert.id),
+            "asset_id": str(asset_id),
+            "title": alert.title,
+            "description": alert.description,
+            "severity": alert.severity,
+            "category": alert.category,
+            "risk_score": alert.risk_score,
+            "timestamp": datetime.utcnow().isoformat(),
+            "meta_data": alert.meta_data
+        }
+        return OutboxEvent(
+            topic="alert.triggered",
+            payload=payload,
+            status=OutboxStatus.PENDING,
+            org_id=org_id
+        )
+
+    @staticmethod
+    def process_health_and_alert(
+        db: Session, 
+        asset_id: UUID, 
+        health_state: AssetHealthState,
+        prediction_result: Dict[str, Any]
+    ) -> Optional[Alert]:
+        draft = AlertEngine.assess(health_state)
+        if draft:
             # Check for existing active alert to avoid spam
             existing = db.query(Alert).filter(
                 Alert.asset_id == asset_id, 
@@ -71,22 +128,7 @@ class AlertEngine:
                 # Update persistence duration logic
                 return existing
                 
-            alert = Alert(
-                asset_id=asset_id,
-                title=f"Probabilistic Failure Risk: {dominant_vector.capitalize()} Sector",
-                description=f"Degradation detected in {dominant_vector} health vector. Health Score: {min_score:.1f}",
-                severity=severity,
-                status="OPEN",
-                category="PREDICTIVE_FAILURE",
-                meta_data={
-                    "probability": 1.0 - (min_score / 100.0),
-                    "dominant_vector": dominant_vector,
-                    "confidence_score": health_state.confidence_score,
-                    "persistence_indicators": {
-                        "recent_damage_vs_avg": recent_avg / (long_term_avg + 1e-6)
-                    }
-                }
-            )
+            alert = AlertEngine._new_alert(asset_id, draft, health_state.confidence_score)
             # 8. SHADOW MODE (DEFAULT)
             # In a real app, this would check a 'shadow_mode' flag on the Asset or Org.
             # asset = db.query(Asset).filter(Asset.id == asset_id).first()
@@ -96,33 +138,43 @@ class AlertEngine:
             db.flush() # Get the ID for the event
             
             # --- PUBLISH EVENT TO OUTBOX ---
-            from models.outbox import OutboxEvent, OutboxStatus
             asset_obj = db.query(Asset).filter(Asset.id == asset_id).first()
             org_id = asset_obj.org_id if asset_obj else None
-            
-            payload = {
-                "alert_id": str(alert.id),
-                "asset_id": str(asset_id),
-                "title": alert.title,
-                "description": alert.description,
-                "severity": alert.severity,
-                "category": alert.category,
-                "risk_score": alert.risk_score,
-                "timestamp": datetime.utcnow().isoformat(),
-                "meta_data": alert.meta_data
-            }
-            
-            event = OutboxEvent(
-                topic="alert.triggered",
-                payload=payload,
-                status=OutboxStatus.PENDING,
-                org_id=org_id
-            )
-            db.add(event)
+            db.add(AlertEngine._outbox_event(alert, asset_id, org_id))
             db.commit()
             db.refresh(alert)
             return alert
             
         return None
 
+    @staticmethod
+    def raise_alerts(db: Session, org_id: UUID, candidates: List[Tuple[UUID, float, Dict[str, Any]]]) -> int:
+        """
+        Bulk process_health_and_alert for one org's assessed drafts (asset_id, confidence, draft):
+        one query for open alerts, one flush and one commit. Returns alerts created.
+        """
+        asset_ids = list({asset_id for asset_id, _, _ in candidates})
+        if not asset_ids:
+            return 0
+        open_assets = {
+            row[0] for row in db.query(Alert.asset_id).filter(
+                Alert.asset_id.in_(asset_ids),
+                Alert.status == "OPEN",
+                Alert.category == "PREDICTIVE_FAILURE"
+            ).all()
+        }
+        alerts = []
+        for asset_id, confidence_score, draft in candidates:
+            if asset_id in open_assets:
+                continue
+            open_assets.add(asset_id)
+            alerts.append((asset_id, AlertEngine._new_alert(asset_id, draft, confidence_score)))
+        if not alerts:
+            return 0
+        db.add_all([alert for _, alert in alerts])
+        db.flush() # IDs for the events
+        db.add_all([AlertEngine._outbox_event(alert, asset_id, org_id) for asset_id, alert in alerts])
+        db.commit()
+        return len(alerts)
+
 alert_engine = AlertEngine()
@@ -0,0 +1,109 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, Any, List, Optional
+from uuid import UUID
+from datetime import datetime
+import logging
+
+from models.ml import Asset
+from models.intelligence import AssetHealthState, AssetStatusLatest
+
+logger = logging.getLogger(__name__)
+
+class AssetStatusService:
+    """
+    Maintains the 'asset_status_latest' read model.
+    Writers upsert only the columns they own (asset attributes, health, RUL),
+    so the telemetry and RUL consumers can update rows independently.
+    """
+
+    @staticmethod
+    def _asset_columns(asset: Asset) -> Dict[str, Any]:
+        return {
+            "asset_name": asset.name,
+            "asset_type": asset.type,
+            "location": asset.location,
+            "status": asset.status,
+            "criticality_score": asset.criticality_score or 1,
+        }
+
+    @staticmethod
+    def _health_columns(health: AssetHealthState) -> Dict[str, Any]:
+        return {
+            "mechanical_health_score": health.mechanical_health_score,
+            "thermal_health_score": health.thermal_health_score,
+            "electrical_health_score": health.electrical_health_score,
+            "environmental_health_score": health.environmental_health_score,
+            "operational_health_score": health.operational_health_score,
+            "total_cumulative_damage": health.total_cumulative_damage,
+            "confidence_score": health.confidence_score,
+        }
+
+    @staticmethod
+    def _rul_columns(rul_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "rul_mean": rul_data.get("mean"),
+            "rul_lower_bound": rul_data.get("lower_bound"),
+            "rul_upper_bound": rul_data.get("upper_bound"),
+            "rul_confidence": rul_data.get("confidence"),
+        }
+
+    @staticmethod
+    def _upsert(db: Session, asset: Asset, updates: Dict[str, Any]):
+        """INSERT ... ON CONFLICT (asset_id) DO UPDATE of the given columns only."""
+        values = {"asset_id": asset.id, "org_id": asset.org_id, **AssetStatusService._asset_columns(asset), **updates}
+        stmt = insert(AssetStatusLatest).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AssetStatusLatest.asset_id],
+            set_={**AssetStatusService._asset_columns(asset), **updates, "updated_at": datetime.utcnow()}
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def sync_asset(db: Session, asset: Asset):
+        """Called on asset create/update so name, type, status stay current."""
+        AssetStatusService._upsert(db, asset, {})
+
+    @staticmethod
+    def remove_asset(db: Session, asset_id: UUID):
+        db.query(AssetStatusLatest).filter(AssetStatusLatest.asset_id == asset_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def record_health(db: Session, asset: Asset, health: AssetHealthState, last_seen: Optional[datetime] = None):
+        updates = AssetStatusService._health_columns(health)
+        updates["last_seen"] = last_seen or datetime.utcnow()
+        AssetStatusService._upsert(db, asset, updates)
+
+    @staticmethod
+    def record_rul(db: Session, asset: Asset, rul_data: Dict[str, Any]):
+        if not rul_data:
+            return
+        AssetStatusService._upsert(db, asset, AssetStatusService._rul_columns(rul_data))
+
+    @staticmethod
+    def rebuild(db: Session, org_id: Optional[str] = None) -> int:
+        """
+        Backfill the read model from Asset + AssetHealthState (e.g. after deploy).
+        RUL columns are filled in by the next 'rul.updated' event.
+        """
+        query = db.query(Asset, AssetHealthState).outerjoin(
+            AssetHealthState, AssetHealthState.asset_id == Asset.id
+        ).filter(Asset.deleted_at.is_(None))
+        if org_id:
+            query = query.filter(Asset.org_id == org_id)
+        count = 0
+        for asset, health in query.yield_per(500):
+            updates = AssetStatusService._health_columns(health) if health else {}
+            if health:
+                updates["last_seen"] = health.last_updated
+            AssetStatusService._upsert(db, asset, updates)
+            count += 1
+        db.commit()
+        return count
+
+    @staticmethod
+    def get_fleet(db: Session, org_id: str, skip: int = 0, limit: int = 50) -> List[AssetStatusLatest]:
+        """Single index scan on (org_id, asset_name)."""
+        return db.query(AssetStatusLatest).filter(
+            AssetStatusLatest.org_id == org_id
+        ).order_by(AssetStatusLatest.asset_name).offset(skip).limit(limit).all()
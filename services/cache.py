@@ -1,39 +1,137 @@
 import json
 import logging
-from typing import Any, Optional, Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Dict, Union
 from uuid import UUID
 import redis
 from datetime import timedelta
 
+from prometheus_client import Counter, Histogram
+
 from core.config import settings
+from core.circuit_breaker import CircuitBreaker, CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
+# --- Metrics (exported via the Instrumentator /metrics endpoint) ---
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by category, tenant tier and result",
+    ["category", "tier", "result"] # hit, miss
+)
+CACHE_LATENCY = Histogram(
+    "cache_operation_duration_seconds",
+    "Cache operation latency",
+    ["operation", "category"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+)
+CACHE_PAYLOAD_BYTES = Histogram(
+    "cache_payload_bytes",
+    "Serialized payload size written to / read from cache",
+    ["category", "tier"],
+    buckets=(64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+)
+
 class CacheService:
     """
     Service for interacting with Redis cache.
     Provides tenant-scoped keys and generic JSON serialization.
     """
     
-    _client: Optional[redis.Redis] = None
+    _client: Optional[Union[redis.Redis, "InMemoryCache"]] = None
+    _fallback: Optional["InMemoryCache"] = None
+    _tenant_tiers: "OrderedDict[str, str]" = OrderedDict() # tenant_id -> plan tier, learned from request context
+    _pending_invalidations: "OrderedDict[str, None]" = OrderedDict() # Redis deletes that failed while degraded
+    _pending_lock = threading.Lock()
+    _breaker = CircuitBreaker(
+        "redis",
+        failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=settings.CIRCUIT_BREAKER_RESET_TIMEOUT_SECONDS,
+        expected_exceptions=(redis.RedisError, OSError)
+    )
 
     @classmethod
-    def get_client(cls) -> redis.Redis:
+    def get_client(cls) -> Union[redis.Redis, "InMemoryCache"]:
         if cls._client is None:
+            cls._client = redis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                password=settings.REDIS_PASSWORD,
+                decode_responses=True,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT_MS / 1000.0,
+                socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_MS / 1000.0
+            )
             try:
-                cls._client = redis.Redis(
-                    host=settings.REDIS_HOST,
-                    port=settings.REDIS_PORT,
-                    password=settings.REDIS_PASSWORD,
-                    decode_responses=True,
-                    socket_timeout=5
-                )
-                cls._client.ping()
-            except Exception as e:
-                logger.warning(f"Failed to connect to Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}: {e}. Falling back to No-Op Cache.")
-                cls._client = MagicMockRedis()
+                cls._breaker.call(cls._client.ping)
+            except (CircuitOpenError, redis.RedisError, OSError) as e:
+                # Keep the client: the breaker probes it again and restores Redis once it is back
+                logger.warning(f"Failed to connect to Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}: {e}. Using In-Memory Cache until it recovers.")
         return cls._client
 
+    @classmethod
+    def get_fallback(cls) -> "InMemoryCache":
+        if cls._fallback is None:
+            cls._fallback = InMemoryCache(
+                max_entries=settings.CACHE_MEMORY_MAX_ENTRIES,
+                max_bytes=settings.CACHE_MEMORY_MAX_BYTES
+            )
+        return cls._fallback
+
+    @classmethod
+    def _execute(cls, op: str, *args) -> Any:
+        """
+        Run a cache command through the Redis circuit breaker.
+        Slow or failing Redis calls (and calls while the breaker is open) are served
+        by the local in-memory cache so request latency stays bounded.
+        """
+        client = cls.get_client()
+        fallback = cls.get_fallback()
+        try:
+            if cls._pending_invalidations:
+                cls._replay_invalidations(client)
+            return cls._breaker.call(getattr(client, op), *args)
+        except (CircuitOpenError, redis.RedisError, OSError) as e:
+            logger.debug(f"Redis {op} degraded ({e}); using in-memory cache")
+            return getattr(fallback, op)(*args)
+
+    @classmethod
+    def _replay_invalidations(cls, client: redis.Redis):
+        """Apply deletes that failed while Redis was degraded, before anything reads from it again."""
+        with cls._pending_lock:
+            keys = list(cls._pending_invalidations)
+        if not keys:
+            return
+        cls._breaker.call(client.delete, *keys)
+        with cls._pending_lock:
+            for key in keys:
+                cls._pending_invalidations.pop(key, None)
+        logger.info(f"Replayed {len(keys)} cache invalidations after Redis recovered")
+
+    @staticmethod
+    def _category_label(category: str) -> str:
+        # 'cooldown:alert.triggered' -> 'cooldown' to keep label cardinality bounded
+        return category.split(":", 1)[0]
+
+    @classmethod
+    def register_tenant_tier(cls, tenant_id: str, tier: str):
+        tenant_id = str(tenant_id)
+        cls._tenant_tiers[tenant_id] = tier
+        cls._tenant_tiers.move_to_end(tenant_id)
+        while len(cls._tenant_tiers) > settings.TENANT_TIER_CACHE_MAX_ENTRIES:
+            cls._tenant_tiers.popitem(last=False)
+
+    @classmethod
+    def _tier_label(cls, key: str) -> str:
+        tenant_id = key.split(":", 2)[1]
+        from core import context
+        ctx = context.get_context()
+        if ctx and getattr(ctx, "tier", None) and str(ctx.org_id) == tenant_id:
+            return ctx.tier
+        return cls._tenant_tiers.get(tenant_id, "unknown")
+
     @staticmethod
     def _gen_key(tenant_id: str, asset_id: str, category: str) -> str:
         if not tenant_id:
@@ -47,28 +145,137 @@ class CacheService:
 
     @classmethod
     def get_json(cls, tenant_id: str, asset_id: str, category: str) -> Optional[Dict[str, Any]]:
-        client = cls.get_client()
         key = cls._gen_key(tenant_id, asset_id, category)
-        data = client.get(key)
+        label = cls._category_label(category)
+        tier = cls._tier_label(key)
+        with CACHE_LATENCY.labels(operation="get", category=label).time():
+            data = cls._execute("get", key)
         if data:
+            CACHE_REQUESTS.labels(category=label, tier=tier, result="hit").inc()
+            CACHE_PAYLOAD_BYTES.labels(category=label, tier=tier).observe(len(data))
             return json.loads(data)
+        CACHE_REQUESTS.labels(category=label, tier=tier, result="miss").inc()
         return None
 
+    @classmethod
+    def get_json_many(cls, tenant_id: str, asset_ids: List[str], category: str) -> Dict[str, Dict[str, Any]]:
+        """get_json for many assets in one MGET round trip; misses are omitted."""
+        if not asset_ids:
+            return {}
+        keys = [cls._gen_key(tenant_id, asset_id, category) for asset_id in asset_ids]
+        label = cls._category_label(category)
+        tier = cls._tier_label(keys[0])
+        with CACHE_LATENCY.labels(operation="mget", category=label).time():
+            values = cls._execute("mget", keys)
+        found = {}
+        for asset_id, data in zip(asset_ids, values):
+            if data:
+                CACHE_PAYLOAD_BYTES.labels(category=label, tier=tier).observe(len(data))
+                found[str(asset_id)] = json.loads(data)
+        CACHE_REQUESTS.labels(category=label, tier=tier, result="hit").inc(len(found))
+        CACHE_REQUESTS.labels(category=label, tier=tier, result="miss").inc(len(asset_ids) - len(found))
+        return found
+
     @classmethod
     def set_json(cls, tenant_id: str, asset_id: str, category: str, data: Dict[str, Any], ttl_seconds: int = 3600):
-        client = cls.get_client()
         key = cls._gen_key(tenant_id, asset_id, category)
-        client.setex(key, timedelta(seconds=ttl_seconds), json.dumps(data))
+        label = cls._category_label(category)
+        payload = json.dumps(data)
+        CACHE_PAYLOAD_BYTES.labels(category=label, tier=cls._tier_label(key)).observe(len(payload))
+        with CACHE_LATENCY.labels(operation="set", category=label).time():
+            cls._execute("setex", key, timedelta(seconds=ttl_seconds), payload)
 
     @classmethod
     def invalidate(cls, tenant_id: str, asset_id: str, category: str):
-        client = cls.get_client()
         key = cls._gen_key(tenant_id, asset_id, category)
-        client.delete(key)
-
-class MagicMockRedis:
-    """No-Op Redis mock for fallback."""
-    def get(self, *args, **kwargs): return None
-    def setex(self, *args, **kwargs): pass
-    def delete(self, *args, **kwargs): pass
-    def ping(self): pass
+        client = cls.get_client()
+        fallback = cls.get_fallback()
+        with CACHE_LATENCY.labels(operation="delete", category=cls._category_label(category)).time():
+            # Entries may also have been written locally while Redis was degraded
+            fallback.delete(key)
+            try:
+                if cls._pending_invalidations:
+                    cls._replay_invalidations(client)
+                cls._breaker.call(client.delete, key)
+            except (CircuitOpenError, redis.RedisError, OSError) as e:
+                # Keep the delete so the stale Redis entry is not served once it recovers
+                logger.debug(f"Redis delete degraded ({e}); queued invalidation of {key}")
+                with cls._pending_lock:
+                    cls._pending_invalidations[key] = None
+                    cls._pending_invalidations.move_to_end(key)
+                    while len(cls._pending_invalidations) > settings.CACHE_MEMORY_MAX_ENTRIES:
+                        cls._pending_invalidations.popitem(last=False)
+
+class InMemoryCache:
+    """
+    Embedded Redis-compatible cache used when Redis is unreachable.
+    Bounded by entry count and payload bytes, with per-key TTL and LRU eviction.
+    Only the subset of the Redis API used by CacheService is implemented.
+    """
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, tuple]" = OrderedDict() # key -> (value, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _ttl_seconds(time_: Union[int, float, timedelta]) -> float:
+        if isinstance(time_, timedelta):
+            return time_.total_seconds()
+        return float(time_)
+
+    def _drop(self, key: str):
+        value, _ = self._data.pop(key)
+        self._bytes -= len(value)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._drop(key)
+                return None
+            self._data.move_to_end(key) # Mark as most recently used
+            return value
+
+    def mget(self, keys: List[str]) -> List[Optional[str]]:
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value: str, ex: Optional[Union[int, timedelta]] = None):
+        expires_at = time.monotonic() + self._ttl_seconds(ex) if ex is not None else None
+        value = str(value)
+        if len(value) > self.max_bytes:
+            return False # Never cache a payload that would evict everything else
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (value, expires_at)
+            self._bytes += len(value)
+            # Evict least recently used until within bounds
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._drop(oldest)
+        return True
+
+    def setex(self, key: str, time_: Union[int, timedelta], value: str):
+        return self.set(key, value, ex=time_)
+
+    def delete(self, *keys: str) -> int:
+        removed = 0
+        with self._lock:
+            for key in keys:
+                if key in self._data:
+                    self._drop(key)
+                    removed += 1
+        return removed
+
+    def ping(self):
+        return True
+
+    def flushall(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
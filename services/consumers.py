@@ -6,6 +6,7 @@ from uuid import UUID
 
 from services.intelligence import IntelligenceService
 from services.cache import CacheService
+from services.asset_status_service import AssetStatusService
 from core.events import InspectionSubmittedEvent, DegradationUpdatedEvent, RULUpdatedEvent
 from models.outbox import OutboxEvent, OutboxStatus
 from models.ml import Asset
@@ -61,9 +62,16 @@ class ConsumerService:
         try:
             # 1. Compute Degradation & Update Health State
             # This calls the heavy physics logic
-            IntelligenceService.process_telemetry_window(db, UUID(asset_id), data)
+            health = IntelligenceService.process_telemetry_window(db, UUID(asset_id), data)
             logger.info("Degradation state updated from telemetry.")
             
+            # Refresh latest-status read model (health vectors + last seen)
+            if health:
+                asset = db.query(Asset).filter(Asset.id == UUID(asset_id)).first()
+                if asset:
+                    AssetStatusService.record_health(db, asset, health)
+                    db.commit()
+            
             # 2. Trigger Downstream: RUL Calculation
             ConsumerService.process_degradation_updated_event(db, {"asset_id": asset_id})
             
@@ -131,6 +139,10 @@ class ConsumerService:
                 CacheService.set_json(str(asset.org_id), str(asset_id), "rul", cache_data, ttl_seconds=300)
                 logger.info(f"RUL Cache updated for asset {asset_id}")
                 
+                # Refresh latest-status read model (RUL bounds)
+                AssetStatusService.record_rul(db, asset, payload.get('rul_data') or {})
+                db.commit()
+                
         except Exception as e:
             logger.error(f"Failed to process RUL update/Alerts: {e}")
             raise e
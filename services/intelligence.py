@@ -1,9 +1,12 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Dict, Any, List, Optional
+from sqlalchemy import func, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Dict, Any, List, Optional, Tuple
 from uuid import UUID
+import uuid
 import json
 import hashlib
+import numpy as np
 from datetime import datetime, timedelta
 
 from models.intelligence import (
@@ -190,12 +193,19 @@ class IntelligenceService:
         return health
 
     @staticmethod
-    def get_probabilistic_rul(db: Session, asset_id: UUID) -> Dict[str, Any]:
+    def get_probabilistic_rul(
+        db: Session,
+        asset_id: UUID,
+        asset: Optional[Asset] = None,
+        health: Optional[AssetHealthState] = None
+    ) -> Dict[str, Any]:
         """
         Check Redis Cache first. Fallback to DB if miss.
+        Callers that already hold the asset / health state pass them to skip the re-query.
         """
         # 1. Fetch Asset for tenant scoping
-        asset = db.query(Asset).filter(Asset.id == asset_id).first()
+        if asset is None:
+            asset = db.query(Asset).filter(Asset.id == asset_id).first()
         if not asset: return {}
         
         tenant_id = str(asset.org_id)
@@ -207,7 +217,8 @@ class IntelligenceService:
             return cached.get("rul_data", {})
             
         # 3. Cache Miss: Compute
-        health = IntelligenceService.get_asset_health_state(db, asset_id)
+        if health is None:
+            health = IntelligenceService.get_asset_health_state(db, asset_id)
         remaining_capacity = health.failure_threshold_mean - health.total_cumulative_damage
         result = DegradationModel.estimate_rul_bounds(
             remaining_capacity=remaining_capacity,
@@ -245,6 +256,100 @@ class IntelligenceService:
         
         return result
 
+    @staticmethod
+    def ingest_sensor_batch(db: Session, org_id: UUID, readings: List[Tuple[UUID, Dict[str, float]]]) -> str:
+        """
+        Bulk ingest_sensor_data: one 'sensor.batch.ingested' event per asset written
+        with a single multi-row INSERT. Caller commits.
+        """
+        now = datetime.utcnow()
+        batch_id = str(now.timestamp())
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "topic": "sensor.batch.ingested",
+                "payload": {
+                    "event_id": f"{batch_id}:{asset_id}",
+                    "schema_version": "1.0",
+                    "timestamp": now.isoformat(),
+                    "asset_id": str(asset_id),
+                    "batch_id": batch_id,
+                    "row_count": 1,
+                    "sensor_data": sensor_data,
+                    "tenant_id": str(org_id)
+                },
+                "status": OutboxStatus.PENDING,
+                "org_id": org_id,
+                "created_at": now
+            }
+            for asset_id, sensor_data in readings
+        ]
+        if rows:
+            db.execute(insert(OutboxEvent), rows)
+        return batch_id
+
+    @staticmethod
+    def get_asset_health_states(db: Session, org_id: UUID, asset_ids: List[UUID]) -> Dict[UUID, AssetHealthState]:
+        """Bulk get_asset_health_state: one SELECT, plus one INSERT for assets without a state yet."""
+        states = {s.asset_id: s for s in db.query(AssetHealthState).filter(AssetHealthState.asset_id.in_(asset_ids)).all()}
+        missing = [asset_id for asset_id in dict.fromkeys(asset_ids) if asset_id not in states]
+        if missing:
+            stmt = pg_insert(AssetHealthState).on_conflict_do_nothing(index_elements=[AssetHealthState.asset_id])
+            db.execute(stmt, [{"id": uuid.uuid4(), "asset_id": asset_id, "org_id": org_id} for asset_id in missing])
+            db.commit()
+            created = db.query(AssetHealthState).filter(AssetHealthState.asset_id.in_(missing)).all()
+            states.update({s.asset_id: s for s in created})
+        return states
+
+    @staticmethod
+    def get_probabilistic_rul_batch(db: Session, org_id: UUID, health_states: Dict[UUID, AssetHealthState]) -> Dict[UUID, Dict[str, Any]]:
+        """
+        Bulk get_probabilistic_rul for assets of one tenant: one MGET for cached values,
+        one vectorized estimate for the misses, and their 'rul.updated' events in one INSERT.
+        Caller commits.
+        """
+        tenant_id = str(org_id)
+        asset_ids = list(health_states)
+        cached = CacheService.get_json_many(tenant_id, [str(a) for a in asset_ids], "rul")
+        results = {a: cached[str(a)].get("rul_data", {}) for a in asset_ids if str(a) in cached}
+        misses = [a for a in asset_ids if a not in results]
+        if not misses:
+            return results
+
+        states = [health_states[a] for a in misses]
+        estimates = DegradationModel.estimate_rul_bounds_batch(
+            remaining_capacity=np.array([h.failure_threshold_mean - h.total_cumulative_damage for h in states]),
+            damage_rate_histories=[h.damage_rate_history or [] for h in states],
+            shift_violation_penalty=np.array([h.shift_anomaly_score or 0.0 for h in states])
+        )
+        now = datetime.utcnow()
+        events = []
+        for asset_id, result in zip(misses, estimates):
+            results[asset_id] = result
+            CacheService.set_json(tenant_id, str(asset_id), "rul", {
+                "rul_data": result,
+                "timestamp": now.isoformat(),
+                "asset_id": str(asset_id),
+                "tenant_id": tenant_id
+            }, ttl_seconds=300)
+            events.append({
+                "id": uuid.uuid4(),
+                "topic": "rul.updated",
+                "payload": {
+                    "asset_id": str(asset_id),
+                    "rul_mean": result["mean"],
+                    "lower_bound": result["lower_bound"],
+                    "upper_bound": result["upper_bound"],
+                    "confidence": result["confidence"],
+                    "timestamp": now.isoformat()
+                },
+                "status": OutboxStatus.PENDING,
+                "org_id": org_id,
+                "created_at": now
+            })
+        db.execute(insert(OutboxEvent), events)
+        return results
+
     @staticmethod
     def apply_inspection_impact(
         db: Session,
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from uuid import UUID
 from datetime import datetime
 from typing import Dict, Any, Optional
@@ -6,44 +6,95 @@ from typing import Dict, Any, Optional
 from models.metadata import AssetMetadata, AssetOperationProfile, AssetShiftSchedule, AssetEnvironmentProfile
 from models.outbox import OutboxEvent, OutboxStatus
 from models.platform import AuditLog
-from schemas.metadata import AssetMetadataCreate, AssetMetadataUpdate
+from schemas.metadata import AssetMetadataCreate, AssetMetadataUpdate, AssetMetadataSnapshot
 from core.events import MetadataUpdatedEvent
 from services.cache import CacheService
 
 class MetadataService:
+    SNAPSHOT_TTL_SECONDS = 86400
+
+    @staticmethod
+    def _snapshot_category(version: int) -> str:
+        return f"metadata:v{version}"
+
+    @staticmethod
+    def _resolve_tenant(db: Session, asset_id: UUID) -> Optional[str]:
+        """Tenant for cache scoping; taken from request context to avoid a DB round trip."""
+        from core import context
+        ctx = context.get_context()
+        if ctx and ctx.org_id:
+            return str(ctx.org_id)
+        from models.ml import Asset
+        org_id = db.query(Asset.org_id).filter(Asset.id == asset_id).scalar()
+        return str(org_id) if org_id else None
+
+    @staticmethod
+    def _asset_tenant(db: Session, asset_id: UUID) -> Optional[str]:
+        """The asset's own org, for cache writes that must not follow the caller's context."""
+        from models.ml import Asset
+        org_id = db.query(Asset.org_id).filter(Asset.id == asset_id).scalar()
+        return str(org_id) if org_id else None
+
+    @staticmethod
+    def _load_metadata(db: Session, asset_id: UUID, tenant_id: Optional[str] = None) -> Optional[AssetMetadata]:
+        """
+        ORM load with all profiles eagerly fetched in the same round trip.
+        With tenant_id, only metadata of an asset owned by that org is returned.
+        """
+        query = db.query(AssetMetadata).options(
+            joinedload(AssetMetadata.operation_profile),
+            joinedload(AssetMetadata.shift_schedule),
+            joinedload(AssetMetadata.environment_profile)
+        ).filter(AssetMetadata.asset_id == asset_id)
+        if tenant_id:
+            from models.ml import Asset
+            query = query.join(Asset, Asset.id == AssetMetadata.asset_id).filter(Asset.org_id == tenant_id)
+        return query.first()
+
     @staticmethod
-    def get_metadata(db: Session, asset_id: UUID) -> Optional[AssetMetadata]:
+    def _publish_snapshot(tenant_id: str, metadata: AssetMetadata) -> AssetMetadataSnapshot:
+        """
+        Write the immutable snapshot under its version key, then move the
+        'metadata' pointer to it. Readers see either the old or new graph, never a mix.
+        """
+        snapshot = AssetMetadataSnapshot.model_validate(metadata)
+        asset_id = str(metadata.asset_id)
+        CacheService.set_json(
+            tenant_id, asset_id, MetadataService._snapshot_category(snapshot.version),
+            snapshot.model_dump(mode="json"), ttl_seconds=MetadataService.SNAPSHOT_TTL_SECONDS
+        )
+        CacheService.set_json(
+            tenant_id, asset_id, "metadata",
+            {"version": snapshot.version}, ttl_seconds=MetadataService.SNAPSHOT_TTL_SECONDS
+        )
+        return snapshot
+
+    @staticmethod
+    def get_metadata(db: Session, asset_id: UUID) -> Optional[AssetMetadataSnapshot]:
         """
         Check Cache -> DB.
+        Returns the full metadata graph (operation, shift and environment profiles)
+        as an immutable snapshot keyed by asset_id and version.
         """
-        # Fetch asset to get org_id for cache key
-        from models.ml import Asset
-        asset = db.query(Asset).filter(Asset.id == asset_id).first()
-        if not asset: return None
-        
-        tenant_id = str(asset.org_id)
+        tenant_id = MetadataService._resolve_tenant(db, asset_id)
+        if not tenant_id: return None
         
-        # 1. Try Cache
-        cached = CacheService.get_json(tenant_id, str(asset_id), "metadata")
-        if cached:
-            return AssetMetadata(**cached) # This might need ORM-to-dict conversion if we want pure ORM back
+        # 1. Try Cache (version pointer -> versioned snapshot)
+        pointer = CacheService.get_json(tenant_id, str(asset_id), "metadata")
+        if pointer and "version" in pointer:
+            cached = CacheService.get_json(
+                tenant_id, str(asset_id), MetadataService._snapshot_category(pointer["version"])
+            )
+            if cached:
+                return AssetMetadataSnapshot.model_validate(cached)
             
-        # 2. DB Query
-        metadata = db.query(AssetMetadata).filter(AssetMetadata.asset_id == asset_id).first()
+        # 2. DB Query (eager load of the whole graph), scoped to the tenant whose key we cache under
+        metadata = MetadataService._load_metadata(db, asset_id, tenant_id)
+        if not metadata:
+            return None
         
         # 3. Populate Cache
-        if metadata:
-            # Note: Serializing ORM objects directly is hard, usually we use schemas or dicts
-            # For simplicity, let's assume we store a dict represention
-            meta_dict = {
-                "asset_id": str(metadata.asset_id),
-                "version": metadata.version,
-                "criticality_level": metadata.criticality_level
-                # add more fields as needed or use schema.dict()
-            }
-            CacheService.set_json(tenant_id, str(asset_id), "metadata", meta_dict, ttl_seconds=86400)
-            
-        return metadata
+        return MetadataService._publish_snapshot(tenant_id, metadata)
 
     @staticmethod
     def create_or_update_metadata(db: Session, asset_id: UUID, schema: AssetMetadataCreate) -> AssetMetadata:
@@ -51,7 +102,8 @@ class MetadataService:
         Create or Update metadata.
         Increments version and publishes 'metadata.updated' event.
         """
-        existing = MetadataService.get_metadata(db, asset_id)
+        existing = MetadataService._load_metadata(db, asset_id)
+        previous_version = existing.version if existing else None
         
         if existing:
             # Update Logic
@@ -146,12 +198,13 @@ class MetadataService:
         db.add(audit)
         
         db.commit()
-        db.refresh(metadata_obj)
         
-        # Invalidate Cache
-        from models.ml import Asset
-        asset = db.query(Asset).filter(Asset.id == asset_id).first()
-        if asset:
-            CacheService.invalidate(str(asset.org_id), str(asset_id), "metadata")
+        # Refresh Cache: publish the new version, drop the superseded snapshot
+        metadata_obj = MetadataService._load_metadata(db, asset_id)
+        tenant_id = MetadataService._asset_tenant(db, asset_id)
+        if tenant_id:
+            MetadataService._publish_snapshot(tenant_id, metadata_obj)
+            if previous_version is not None:
+                CacheService.invalidate(tenant_id, str(asset_id), MetadataService._snapshot_category(previous_version))
             
         return metadata_obj
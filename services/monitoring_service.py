@@ -1,10 +1,180 @@
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, Tuple
 from uuid import UUID
-import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from datetime import datetime
+import math
+import threading
+import logging
 
-from models.ml import ModelMetric, Prediction
+from prometheus_client import Counter, Histogram
+
+from core.config import settings
+from models.ml import ModelMetric
 from models.intelligence import AssetHealthState
+from services.cache import CacheService
+
+logger = logging.getLogger(__name__)
+
+DriftKey = Tuple[str, str] # (asset_id, model_id or "default")
+
+# Global registry models have no ml_model row, so their detections are only visible here
+DRIFT_DETECTIONS = Counter(
+    "prediction_drift_detections_total",
+    "EWMA prediction drift detections",
+    ["scope"] # tenant, global
+)
+DRIFT_ZSCORE = Histogram(
+    "prediction_drift_zscore",
+    "z-score of predictions flagged as drift",
+    ["scope"],
+    buckets=(3, 4, 5, 7.5, 10, 15, 25, 50)
+)
+
+@dataclass
+class EwmaState:
+    """Exponentially weighted mean/variance of one asset's predictions."""
+    mean: float = 0.0
+    var: float = 0.0
+    count: int = 0
+    last_z: float = 0.0
+
+    def update(self, value: float, alpha: float) -> float:
+        """Fold in value and return its z-score against the state before the update."""
+        if self.count == 0:
+            self.mean, self.var, self.count = value, 0.0, 1
+            return 0.0
+        std = math.sqrt(self.var)
+        diff = value - self.mean
+        z = abs(diff) / std if std > 0 else 0.0
+        increment = alpha * diff
+        self.mean += increment
+        self.var = (1 - alpha) * (self.var + diff * increment)
+        self.count += 1
+        self.last_z = z
+        return z
+
+class DriftMonitor:
+    """
+    In-memory EWMA drift state per (asset, model), replacing the per-request scan of the
+    last 50 predictions. update() is O(1); a background flusher periodically writes the
+    queued ModelMetric rows in one INSERT and snapshots changed states to the cache, from
+    which states are restored the first time an asset is seen by this process.
+    """
+    def __init__(self, alpha: float = 0.04, warmup: int = 20, threshold: float = 3.0, max_keys: int = 100000):
+        self.alpha = alpha
+        self.warmup = warmup
+        self.threshold = threshold
+        self.max_keys = max_keys
+        self._states: "OrderedDict[DriftKey, EwmaState]" = OrderedDict()
+        self._tenants: Dict[DriftKey, str] = {}
+        self._dirty: set = set()
+        self._metrics: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._session_factory: Optional[Callable[[], Session]] = None
+
+    @staticmethod
+    def _category(model_key: str) -> str:
+        return f"drift:{model_key}"
+
+    def _restore(self, org_id: Optional[UUID], key: DriftKey) -> EwmaState:
+        if org_id:
+            try:
+                cached = CacheService.get_json(str(org_id), key[0], self._category(key[1]))
+                if cached:
+                    return EwmaState(**cached)
+            except Exception as e:
+                logger.debug(f"Drift state restore failed for {key}: {e}")
+        return EwmaState()
+
+    def update(self, org_id: Optional[UUID], asset_id: UUID, model_id: Optional[UUID], value: float) -> Tuple[bool, float]:
+        """Returns (drift detected, z-score) for value against the asset's running state."""
+        key = (str(asset_id), str(model_id) if model_id else "default")
+        with self._lock:
+            state = self._states.get(key)
+        if state is None:
+            state = self._restore(org_id, key) # One cache read per asset and process
+        
+        with self._lock:
+            state = self._states.setdefault(key, state)
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_keys:
+                evicted, _ = self._states.popitem(last=False)
+                self._tenants.pop(evicted, None)
+                self._dirty.discard(evicted)
+            
+            warmed_up = state.count >= self.warmup
+            z = state.update(float(value), self.alpha)
+            drift_detected = warmed_up and z > self.threshold
+            if org_id:
+                self._tenants[key] = str(org_id)
+                self._dirty.add(key)
+            if drift_detected:
+                scope = "tenant" if model_id else "global"
+                DRIFT_DETECTIONS.labels(scope=scope).inc()
+                DRIFT_ZSCORE.labels(scope=scope).observe(z)
+            if drift_detected and model_id and len(self._metrics) < self.max_keys:
+                self._metrics.append({
+                    "model_id": model_id,
+                    "org_id": org_id,
+                    "metric_name": "prediction_drift_zscore",
+                    "metric_value": float(z),
+                    "timestamp": datetime.utcnow()
+                })
+        return drift_detected, z
+
+    def state(self, asset_id: UUID, model_id: Optional[UUID] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            state = self._states.get((str(asset_id), str(model_id) if model_id else "default"))
+            return asdict(state) if state else None
+
+    def flush(self, db: Session) -> int:
+        """Write queued drift metrics and snapshot changed states. Returns metric rows written."""
+        with self._lock:
+            metrics, self._metrics = self._metrics, []
+            snapshots = [(self._tenants[k], k, asdict(self._states[k])) for k in self._dirty if k in self._states]
+            self._dirty = set()
+        if metrics:
+            db.execute(insert(ModelMetric), metrics)
+            db.commit()
+        for tenant_id, (asset_id, model_key), snapshot in snapshots:
+            CacheService.set_json(tenant_id, asset_id, self._category(model_key), snapshot, ttl_seconds=settings.DRIFT_STATE_TTL_SECONDS)
+        return len(metrics)
+
+    def start(self, session_factory: Callable[[], Session], interval_seconds: float):
+        if self._thread and self._thread.is_alive():
+            return
+        self._session_factory = session_factory
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.wait(interval_seconds):
+                self._flush_with_new_session()
+
+        self._thread = threading.Thread(target=_run, name="drift-monitor", daemon=True)
+        self._thread.start()
+
+    def _flush_with_new_session(self):
+        db = self._session_factory()
+        try:
+            self.flush(db)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Drift state flush failed: {e}")
+        finally:
+            db.close()
+
+    def stop(self):
+        """Stop the flusher and persist what changed since the last flush."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=10.0)
+        if self._session_factory:
+            self._flush_with_new_session()
 
 class MonitoringService:
     """
@@ -15,41 +185,40 @@ class MonitoringService:
     """
     
     @staticmethod
-    def monitor_model_drift(db: Session, asset_id: UUID, current_prediction: float):
-        # 1. Prediction Distribution Shift Check
-        # Fetch last 50 predictions for this asset
-        history = db.query(Prediction).filter(Prediction.asset_id == asset_id).order_by(Prediction.timestamp.desc()).limit(50).all()
-        if len(history) < 20: return # Need base for comparison
-        
-        # Convert JSON results to flat list of RUL values
-        # (Assuming result = {"rul": 150} or similar)
-        past_values = [p.result.get("rul", 0) for p in history if isinstance(p.result, dict)]
-        
-        # Simple KS-test or Z-score check for shift
-        mean_past = np.mean(past_values)
-        std_past = np.std(past_values)
-        
-        # If current prediction is 3 sigma away from rolling mean -> POTENTIAL DRIFT
-        drift_detected = abs(current_prediction - mean_past) > (3 * std_past) if std_past > 0 else False
-        
+    def monitor_model_drift(
+        db: Session,
+        asset_id: UUID,
+        current_prediction: float,
+        model_id: Optional[UUID] = None,
+        org_id: Optional[UUID] = None
+    ) -> bool:
+        # 1. Prediction Distribution Shift Check: O(1) update of the asset's EWMA state
+        drift_detected, _ = drift_monitor.update(org_id, asset_id, model_id, current_prediction)
         if drift_detected:
-            # 11. Reduce confidence automatically
-            health = db.query(AssetHealthState).filter(AssetHealthState.asset_id == asset_id).first()
-            if health:
-                health.confidence_score *= 0.8
-                db.commit()
-                
-            # Log as Metric
-            metric = ModelMetric(
-                metric_name="prediction_drift_zscore",
-                metric_value=float(abs(current_prediction - mean_past) / (std_past + 1e-6)),
-                timestamp=datetime.utcnow()
-            )
-            db.add(metric)
-            db.commit()
-            
+            MonitoringService.decay_confidence(db, asset_id)
         return drift_detected
 
+    @staticmethod
+    def decay_confidence(db: Session, asset_id: UUID, factor: float = 0.8):
+        """11. Reduce confidence automatically after a detected shift."""
+        health = db.query(AssetHealthState).filter(AssetHealthState.asset_id == asset_id).first()
+        if health:
+            health.confidence_score *= factor
+            db.commit()
+
+    @staticmethod
+    def decay_confidence_many(db: Session, asset_ids: List[UUID], factor: float = 0.8) -> int:
+        """decay_confidence for many assets in one UPDATE. Returns rows updated."""
+        if not asset_ids:
+            return 0
+        result = db.execute(
+            update(AssetHealthState)
+            .where(AssetHealthState.asset_id.in_(asset_ids))
+            .values(confidence_score=AssetHealthState.confidence_score * factor)
+        )
+        db.commit()
+        return result.rowcount
+
     @staticmethod
     def monitor_confidence_decay(db: Session, asset_id: UUID):
         """
@@ -60,3 +229,10 @@ class MonitoringService:
             # SURFACE UNCERTAINTY TO UI / Retraining Flag
             return True
         return False
+
+drift_monitor = DriftMonitor(
+    alpha=settings.DRIFT_EWMA_ALPHA,
+    warmup=settings.DRIFT_WARMUP_OBSERVATIONS,
+    threshold=settings.DRIFT_ZSCORE_THRESHOLD,
+    max_keys=settings.DRIFT_STATE_MAX_KEYS
+)
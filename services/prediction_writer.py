@@ -0,0 +1,123 @@
+import uuid
+import threading
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from prometheus_client import Counter
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_WRITES = Counter(
+    "prediction_writes_total",
+    "Prediction rows handled by the buffered writer",
+    ["result"] # written, dropped, failed
+)
+
+class PredictionWriter:
+    """
+    Records Prediction rows off the request path.
+    record() appends to a bounded in-memory buffer (dropping when full, so memory
+    stays bounded); a background thread flushes it in multi-row INSERTs every
+    interval or as soon as a full batch is waiting. stop() drains what is left.
+    """
+    def __init__(self, max_buffer: int = 50000, batch_size: int = 1000):
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._session_factory: Optional[Callable[[], Session]] = None
+
+    def record(self, org_id: Any, asset_id: Any, model_id: Optional[Any], result: Dict[str, Any]) -> bool:
+        """Queue one prediction. Timestamped now, not at flush time. Returns False if dropped."""
+        row = {
+            "id": uuid.uuid4(),
+            "org_id": org_id,
+            "asset_id": asset_id,
+            "model_id": model_id,
+            "result": result,
+            "timestamp": datetime.utcnow()
+        }
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                PREDICTION_WRITES.labels(result="dropped").inc()
+                return False
+            self._buffer.append(row)
+            full_batch = len(self._buffer) >= self.batch_size
+        if full_batch:
+            self._wake.set()
+        return True
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def _take(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            count = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def flush(self, db: Session) -> int:
+        """Write everything buffered so far, batch_size rows per INSERT. Returns rows written."""
+        from models.ml import Prediction
+
+        written = 0
+        while True:
+            rows = self._take()
+            if not rows:
+                return written
+            try:
+                # executemany with insertmanyvalues -> multi-row INSERT ... VALUES statements
+                db.execute(insert(Prediction), rows)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                PREDICTION_WRITES.labels(result="failed").inc(len(rows))
+                logger.error(f"Failed to write {len(rows)} predictions: {e}")
+                return written
+            written += len(rows)
+            PREDICTION_WRITES.labels(result="written").inc(len(rows))
+
+    def _flush_with_new_session(self):
+        db = self._session_factory()
+        try:
+            self.flush(db)
+        finally:
+            db.close()
+
+    def start(self, session_factory: Callable[[], Session], interval_seconds: float):
+        if self._thread and self._thread.is_alive():
+            return
+        self._session_factory = session_factory
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.is_set():
+                self._wake.wait(timeout=interval_seconds)
+                self._wake.clear()
+                if self._buffer:
+                    self._flush_with_new_session()
+
+        self._thread = threading.Thread(target=_run, name="prediction-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout_seconds: float = 10.0):
+        """Stop the flusher and write whatever is still buffered."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=timeout_seconds)
+        if self._session_factory and self._buffer:
+            self._flush_with_new_session()
+
+prediction_writer = PredictionWriter(
+    max_buffer=settings.PREDICTION_WRITER_MAX_BUFFER,
+    batch_size=settings.PREDICTION_WRITER_BATCH_SIZE
+)
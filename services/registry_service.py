@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from models.registry import ModelRegistry, TaskType
-from typing import Dict, Any, Optional
+from models.outbox import OutboxEvent, OutboxStatus
+from typing import Dict, Any, Optional, List
+from datetime import datetime
 
 class ModelRegistryService:
     def __init__(self, db: Session):
@@ -33,10 +35,40 @@ class ModelRegistryService:
             is_active=is_active
         )
         self.db.add(model)
+        if is_active:
+            self._publish_activation(model)
         self.db.commit()
         self.db.refresh(model)
+        if is_active:
+            self._notify_local_engine()
         return model
 
+    def _publish_activation(self, model: ModelRegistry):
+        """Queue a 'model.activated' event so every serving process can hot-reload."""
+        self.db.flush() # Ensure model.id is assigned
+        payload = {
+            "event_id": str(datetime.utcnow().timestamp()),
+            "schema_version": "1.0",
+            "timestamp": datetime.utcnow().isoformat(),
+            "model_id": str(model.id),
+            "task_type": model.task_type.value if hasattr(model.task_type, "value") else str(model.task_type),
+            "name": model.name,
+            "version": model.version
+        }
+        self.db.add(OutboxEvent(topic="model.activated", payload=payload, status=OutboxStatus.PENDING))
+
+    @staticmethod
+    def _notify_local_engine():
+        # Same-process watcher reloads immediately; other workers pick it up on their next poll
+        from ml.inference import inference_engine
+        inference_engine.request_reload()
+
+    def get_active_models(self) -> List[ModelRegistry]:
+        """
+        All active registry entries in one query (used by the hot-reload watcher).
+        """
+        return self.db.query(ModelRegistry).filter(ModelRegistry.is_active == True).all()
+
     def get_active_model(self, task_type: str) -> Optional[ModelRegistry]:
         """
         Retrieves the currently active model for a specific task.
@@ -69,10 +101,31 @@ class ModelRegistryService:
 
         # Activate this one
         model.is_active = True
+        self._publish_activation(model)
         self.db.commit()
         self.db.refresh(model)
+        self._notify_local_engine()
         return model
 
+    def activate_best_model(
+        self,
+        task_type: TaskType,
+        max_latency_ms: Optional[float] = None,
+        max_memory_bytes: Optional[int] = None
+    ) -> Optional[ModelRegistry]:
+        """
+        Activates the most accurate registered model for the task whose serving
+        benchmark fits the latency/memory budget. Leaves the current model active if none fits.
+        """
+        from ml.model_selector import ModelSelectionEngine
+        candidates = self.db.query(ModelRegistry).filter(ModelRegistry.task_type == task_type).all()
+        best = ModelSelectionEngine.select_registered_model(candidates, task_type, max_latency_ms, max_memory_bytes)
+        if best is None:
+            return None
+        if best.is_active:
+            return best
+        return self.activate_model(best.id)
+
     def get_model_history(self, task_type: str, limit: int = 10):
         """
         Get history of models for a task type.
@@ -16,8 +16,9 @@ class ShiftService:
         Check if a given timestamp falls within the asset's scheduled shift.
         Returns (is_within, minutes_outside)
         """
-        # 1. Fetch metadata
-        metadata = db.query(AssetMetadata).filter(AssetMetadata.asset_id == asset_id).first()
+        # 1. Fetch metadata (cached snapshot)
+        from services.metadata_service import MetadataService
+        metadata = MetadataService.get_metadata(db, asset_id)
         if not metadata or not metadata.operation_profile:
             return True, 0.0 # Default to assuming valid if no profile
             
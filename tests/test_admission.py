@@ -0,0 +1,55 @@
+import asyncio
+
+from core.admission import AdmissionController, Priority, classify
+
+ROUTES = {"/api/v1/predict": "critical", "/api/v1/admin": "low", "/api/v1/admin/policy": "normal"}
+
+def test_classify_uses_longest_prefix():
+    assert classify("/api/v1/predict/batch", ROUTES) == Priority.CRITICAL
+    assert classify("/api/v1/admin/kpi", ROUTES) == Priority.LOW
+    assert classify("/api/v1/admin/policy", ROUTES) == Priority.NORMAL
+    assert classify("/api/v1/predictions", ROUTES) == Priority.NORMAL
+    assert classify("/api/v1/assets", ROUTES) == Priority.NORMAL
+
+def test_low_priority_is_shed_while_critical_keeps_headroom():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=4)
+        assert [await controller.acquire(Priority.LOW) for _ in range(3)] == [True, True, False]
+        assert await controller.acquire(Priority.CRITICAL)
+        assert await controller.acquire(Priority.CRITICAL)
+        assert controller.status()["in_flight_by_priority"] == {"critical": 2, "normal": 0, "low": 2}
+        assert controller.retry_after() >= 1
+    asyncio.run(scenario())
+
+def test_freed_slot_goes_to_highest_priority_waiter():
+    async def scenario():
+        controller = AdmissionController(
+            max_in_flight=2, queue_timeouts={"critical": 1.0, "normal": 1.0, "low": 0.0}
+        )
+        assert await controller.acquire(Priority.CRITICAL)
+        assert await controller.acquire(Priority.CRITICAL)
+        normal = asyncio.ensure_future(controller.acquire(Priority.NORMAL))
+        await asyncio.sleep(0)
+        critical = asyncio.ensure_future(controller.acquire(Priority.CRITICAL))
+        await asyncio.sleep(0)
+        assert controller.queued() == 2
+
+        controller.release(Priority.CRITICAL, 0.01)
+        assert await critical
+        assert not normal.done()
+        controller.release(Priority.CRITICAL, 0.01)
+        controller.release(Priority.CRITICAL, 0.01)
+        assert await normal
+        assert controller.in_flight == 1
+    asyncio.run(scenario())
+
+def test_queue_timeout_rejects_and_raises_queue_delay():
+    async def scenario():
+        controller = AdmissionController(
+            max_in_flight=1, queue_timeouts={"critical": 0.05, "normal": 0.05, "low": 0.0}
+        )
+        assert await controller.acquire(Priority.NORMAL)
+        assert not await controller.acquire(Priority.NORMAL)
+        assert controller.queue_delay > 0
+        assert controller.queued() == 0
+    asyncio.run(scenario())
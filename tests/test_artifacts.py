@@ -0,0 +1,19 @@
+import numpy as np
+from sklearn.cluster import KMeans
+
+from ml.artifacts import save_artifact, load_artifact
+from pipelines.training import SimpleLSTM
+
+def test_sklearn_artifact_is_memory_mapped(tmp_path):
+    path = save_artifact(KMeans(n_clusters=2, n_init=1).fit(np.random.rand(40, 3)), str(tmp_path), "km")
+    model = load_artifact(path)
+    assert path.endswith(".pkl")
+    assert isinstance(model.cluster_centers_, np.memmap)
+    assert not model.cluster_centers_.flags.writeable
+    assert len(model.predict(np.random.rand(2, 3))) == 2
+
+def test_torch_artifact_round_trips_in_eval_mode(tmp_path):
+    path = save_artifact(SimpleLSTM(3, 8, 1), str(tmp_path), "lstm")
+    model = load_artifact(path)
+    assert path.endswith(".pt")
+    assert not model.training
@@ -0,0 +1,101 @@
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from services.asset_status_service import AssetStatusService
+
+def _asset(**overrides):
+    values = dict(
+        id=uuid.uuid4(), org_id=uuid.uuid4(), name="Pump A", type="Pump",
+        location="Plant 1", status="OPERATIONAL", criticality_score=None
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+def _health():
+    return SimpleNamespace(
+        mechanical_health_score=80.0, thermal_health_score=90.0, electrical_health_score=95.0,
+        environmental_health_score=99.0, operational_health_score=85.0, total_cumulative_damage=0.2,
+        confidence_score=0.9, last_updated=datetime(2026, 1, 1)
+    )
+
+def _compiled(db):
+    (stmt,), _ = db.execute.call_args
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+def test_rul_upsert_only_touches_rul_and_asset_columns():
+    db = MagicMock()
+    AssetStatusService.record_rul(db, _asset(), {"mean": 100.0, "lower_bound": 80.0, "upper_bound": 120.0, "confidence": 0.7})
+
+    sql = _compiled(db)
+    assert "ON CONFLICT (asset_id) DO UPDATE" in sql
+    update_clause = sql.split("DO UPDATE SET")[1]
+    assert "rul_mean" in update_clause and "asset_name" in update_clause and "updated_at" in update_clause
+    assert "operational_health_score" not in update_clause
+
+def test_health_upsert_sets_last_seen_and_defaults_criticality():
+    db = MagicMock()
+    AssetStatusService.record_health(db, _asset(), _health())
+
+    (stmt,), _ = db.execute.call_args
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    assert params["operational_health_score"] == 85.0
+    assert params["criticality_score"] == 1
+    assert params["last_seen"] is not None
+    assert "rul_mean" not in _compiled(db).split("DO UPDATE SET")[1]
+
+def test_empty_rul_is_not_written():
+    db = MagicMock()
+    AssetStatusService.record_rul(db, _asset(), {})
+    db.execute.assert_not_called()
+
+def test_sensor_consumer_refreshes_read_model(monkeypatch):
+    from services.consumers import ConsumerService
+
+    asset, health = _asset(), _health()
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = asset
+    recorded = []
+    monkeypatch.setattr("services.consumers.IntelligenceService.process_telemetry_window", lambda db, asset_id, data: health)
+    monkeypatch.setattr("services.consumers.AssetStatusService.record_health", lambda db, a, h: recorded.append((a, h)))
+    monkeypatch.setattr(ConsumerService, "process_degradation_updated_event", lambda db, payload: None)
+
+    ConsumerService.process_sensor_batch_ingested_event(db, {"asset_id": str(asset.id), "sensor_data": {"temperature": 70.0}})
+    assert recorded == [(asset, health)]
+    db.commit.assert_called_once()
+
+def test_rebuild_script_backfills_every_asset(monkeypatch, capsys):
+    from scripts import rebuild_asset_status
+
+    db = MagicMock()
+    db.query.return_value.outerjoin.return_value.filter.return_value.yield_per.return_value = [
+        (_asset(), _health()),
+        (_asset(), None) # No health state yet: asset columns only
+    ]
+    monkeypatch.setattr(rebuild_asset_status, "SessionLocal", lambda: db)
+
+    rebuild_asset_status.rebuild_asset_status()
+    assert db.execute.call_count == 2
+    db.commit.assert_called_once()
+    db.close.assert_called_once()
+    assert "2 assets" in capsys.readouterr().out
+
+def test_admin_reads_handle_assets_without_health_or_rul():
+    from services.admin_service import AdminService
+
+    db = MagicMock()
+    db.query.return_value.filter.return_value.scalar.return_value = None # No status rows yet
+    assert AdminService.get_kpi_aggregation(db, "org")["risk"]["avg_health_index"] is None
+
+    row = SimpleNamespace(
+        asset_id=uuid.uuid4(), asset_name="Pump A", asset_type="Pump", location=None, criticality_score=None,
+        operational_health_score=None, rul_mean=None, rul_lower_bound=None, rul_upper_bound=None,
+        last_seen=None, status="OPERATIONAL"
+    )
+    db.query.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [row]
+    fleet = AdminService.get_asset_fleet_table(db, "org")
+    assert fleet[0]["health_index"] is None and fleet[0]["rul_days"] is None
+    assert fleet[0]["last_seen"] is None and fleet[0]["risk_level"] == "LOW"
@@ -0,0 +1,105 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from ml.inference import InferenceEngine
+from ml.models.degradation_model import DegradationModel
+from models.registry import TaskType
+
+class _CountingClusterer:
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, X):
+        self.calls.append(len(X))
+        return (np.asarray(X)[:, 0] > 0.5).astype(int)
+
+def test_vectorized_rul_bounds_match_scalar():
+    rng = np.random.RandomState(0)
+    histories = [[], list(rng.rand(3) * 0.01), list(rng.rand(40) * 0.02), [0.0, 0.0]]
+    capacity = rng.rand(len(histories))
+    penalty = np.array([0.0, 0.1, 0.3, 0.0])
+
+    batch = DegradationModel.estimate_rul_bounds_batch(capacity, histories, penalty)
+    for i, history in enumerate(histories):
+        expected = DegradationModel.estimate_rul_bounds(capacity[i], history, shift_violation_penalty=penalty[i])
+        for field, value in expected.items():
+            assert np.isclose(batch[i][field], value), field
+
+def test_bulk_predictions_use_one_model_call_per_asset_type(monkeypatch):
+    monkeypatch.setattr("ml.inference.settings.SHADOW_EVALUATION_ENABLED", False)
+    engine = InferenceEngine()
+    engine.result_cache = None
+    model = _CountingClusterer()
+    engine._swap_model(TaskType.CLUSTERING, model, SimpleNamespace(id=uuid.uuid4(), name="km", version="v1", artifact_path="unused.pkl"))
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = None # No tenant models
+
+    assets = [(uuid.uuid4(), "Pump" if i % 2 else "Motor", [i / 10.0]) for i in range(10)]
+    results = engine.predict_for_assets(db, TaskType.CLUSTERING, "org", assets)
+
+    assert sorted(model.calls) == [5, 5]
+    assert [r["cluster"] for r in results] == [int(i / 10.0 > 0.5) for i in range(10)]
+
+def test_batch_defers_drift_and_alerts_to_one_bulk_task(monkeypatch):
+    import asyncio
+    import json
+    from fastapi import BackgroundTasks
+    from api.routers import predictions
+    from schemas.prediction import BatchPredictionRequest
+
+    org_id = uuid.uuid4()
+    calm, alerting, drifting = (SimpleNamespace(id=uuid.uuid4(), org_id=org_id, type="Pump") for _ in range(3))
+    health = {
+        a.id: SimpleNamespace(
+            mechanical_health_score=90.0, thermal_health_score=95.0, electrical_health_score=99.0,
+            operational_health_score=50.0 if a is alerting else 92.0, total_cumulative_damage=0.1, confidence_score=0.9,
+            damage_rate_history=[0.001] * 10 + [0.01] * 5 if a is alerting else []
+        )
+        for a in (calm, alerting, drifting)
+    }
+    db = MagicMock()
+    db.query.return_value.filter.return_value.all.return_value = [calm, alerting, drifting]
+    monkeypatch.setattr(predictions.IntelligenceService, "ingest_sensor_batch", lambda db, org, readings: "batch")
+    monkeypatch.setattr(predictions.IntelligenceService, "get_asset_health_states", lambda db, org, ids: health)
+    monkeypatch.setattr(predictions.IntelligenceService, "get_probabilistic_rul_batch", lambda db, org, states: {k: {"mean": 10.0} for k in states})
+    monkeypatch.setattr(predictions.engine, "predict_for_assets", lambda db, task, org, assets: [{"cluster": 0}] * len(assets))
+    monkeypatch.setattr(predictions.drift_monitor, "update", lambda org, asset_id, model_id, value: (asset_id == drifting.id, 0.0))
+
+    background = BackgroundTasks()
+    response = predictions.predict_batch(
+        background_tasks=background,
+        db=db,
+        batch_in=BatchPredictionRequest(
+            model_type="clustering",
+            items=[{"asset_id": a.id, "data": {"temperature": 70.0}} for a in (calm, alerting, drifting)]
+        ),
+        current_user=SimpleNamespace(org_id=org_id)
+    )
+
+    async def body():
+        return "".join([chunk async for chunk in response.body_iterator])
+    lines = [json.loads(line) for line in asyncio.run(body()).splitlines()]
+    assert [line["asset_id"] for line in lines] == [str(a.id) for a in (calm, alerting, drifting)]
+    assert lines[1]["prediction"]["active_alert"]["pending"] is True
+    assert "active_alert" not in lines[0]["prediction"]
+    db.commit.assert_called_once() # Only the ingestion commit happens inside the request
+
+    assert len(background.tasks) == 1
+    task = background.tasks[0]
+    assert task.func is predictions._apply_batch_side_effects
+    _, drifted, candidates = task.args
+    assert drifted == [drifting.id]
+    assert [c[0] for c in candidates] == [alerting.id]
+
+    side_db = MagicMock()
+    side_db.query.return_value.filter.return_value.all.return_value = [] # No open alerts yet
+    monkeypatch.setattr(predictions, "SessionLocal", lambda: side_db)
+    task.func(*task.args)
+    assert side_db.execute.call_count == 1 # One bulk confidence UPDATE
+    assert side_db.commit.call_count == 2 # Decay + one alert commit
+    alerts, events = (call.args[0] for call in side_db.add_all.call_args_list)
+    assert [a.asset_id for a in alerts] == [alerting.id]
+    assert [e.topic for e in events] == ["alert.triggered"]
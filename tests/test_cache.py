@@ -0,0 +1,131 @@
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from services.cache import CacheService, InMemoryCache
+
+def test_in_memory_cache_ttl_expiry():
+    cache = InMemoryCache()
+    cache.setex("k", timedelta(seconds=0.05), "v")
+    assert cache.get("k") == "v"
+    time.sleep(0.1)
+    assert cache.get("k") is None
+
+def test_in_memory_cache_lru_eviction():
+    cache = InMemoryCache(max_entries=2)
+    cache.setex("a", 60, "1")
+    cache.setex("b", 60, "2")
+    cache.get("a") # 'a' is now most recently used
+    cache.setex("c", 60, "3")
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+
+def test_in_memory_cache_byte_bound():
+    cache = InMemoryCache(max_bytes=10)
+    cache.setex("a", 60, "12345")
+    cache.setex("b", 60, "67890")
+    cache.setex("c", 60, "x")
+    assert cache.get("a") is None
+    assert cache.get("b") == "67890"
+    assert not cache.setex("huge", 60, "x" * 11)
+
+def test_redis_down_at_startup_is_reconnected_through_the_breaker(monkeypatch):
+    import redis
+    from core.circuit_breaker import CircuitBreaker, CircuitState
+
+    class FlakyRedis(InMemoryCache):
+        down = True
+        calls = 0
+        def _check(self):
+            if self.down:
+                raise redis.ConnectionError("down")
+            self.calls += 1
+        def ping(self):
+            self._check()
+            return True
+        def get(self, key):
+            self._check()
+            return super().get(key)
+        def setex(self, key, time_, value):
+            self._check()
+            return super().setex(key, time_, value)
+
+    remote = FlakyRedis()
+    breaker = CircuitBreaker("test_startup", failure_threshold=1, reset_timeout=60, expected_exceptions=(redis.RedisError,))
+    monkeypatch.setattr("services.cache.redis.Redis", lambda **kwargs: remote)
+    monkeypatch.setattr(CacheService, "_client", None)
+    monkeypatch.setattr(CacheService, "_fallback", InMemoryCache())
+    monkeypatch.setattr(CacheService, "_breaker", breaker)
+
+    # Redis is down: the failed ping opens the breaker and calls are served locally
+    CacheService.set_json("t1", "a1", "rul", {"mean": 10.0})
+    assert CacheService.get_client() is remote
+    assert breaker.state == CircuitState.OPEN
+    assert CacheService.get_json("t1", "a1", "rul") == {"mean": 10.0}
+    CacheService.invalidate("t1", "a1", "rul")
+    assert CacheService.get_json("t1", "a1", "rul") is None
+
+    # Redis comes back: the half-open probe succeeds and calls reach it again
+    remote.down = False
+    breaker.reset_timeout = 0
+    CacheService.set_json("t1", "a1", "rul", {"mean": 20.0})
+    assert breaker.state == CircuitState.CLOSED
+    assert CacheService.get_json("t1", "a1", "rul") == {"mean": 20.0}
+    assert remote.calls == 2
+    assert CacheService.get_fallback().get("tenant:t1:asset:a1:rul") is None
+
+def test_cache_service_records_hit_miss_metrics():
+    from prometheus_client import REGISTRY
+
+    def sample(result):
+        return REGISTRY.get_sample_value(
+            "cache_requests_total",
+            {"category": "cooldown", "tier": "enterprise", "result": result}
+        ) or 0.0
+
+    CacheService._client = InMemoryCache()
+    CacheService.register_tenant_tier("t2", "enterprise")
+    try:
+        hits, misses = sample("hit"), sample("miss")
+        assert CacheService.get_json("t2", "a1", "cooldown:alert.triggered") is None
+        CacheService.set_json("t2", "a1", "cooldown:alert.triggered", {"active": True})
+        assert CacheService.get_json("t2", "a1", "cooldown:alert.triggered") == {"active": True}
+        assert sample("miss") == misses + 1
+        assert sample("hit") == hits + 1
+    finally:
+        CacheService._client = None
+
+def test_invalidate_while_redis_down_is_replayed_on_recovery(monkeypatch):
+    import redis
+    from core.circuit_breaker import CircuitBreaker, CircuitState
+
+    class FlakyRedis(InMemoryCache):
+        down = False
+        def get(self, key):
+            if self.down:
+                raise redis.ConnectionError("down")
+            return super().get(key)
+        def delete(self, *keys):
+            if self.down:
+                raise redis.ConnectionError("down")
+            return super().delete(*keys)
+
+    remote = FlakyRedis()
+    breaker = CircuitBreaker("test_invalidate", failure_threshold=1, reset_timeout=60, expected_exceptions=(redis.RedisError,))
+    monkeypatch.setattr(CacheService, "_client", remote)
+    monkeypatch.setattr(CacheService, "_breaker", breaker)
+    monkeypatch.setattr(CacheService, "_pending_invalidations", type(CacheService._pending_invalidations)())
+    CacheService.set_json("t1", "a1", "metadata", {"version": 1})
+
+    remote.down = True
+    CacheService.invalidate("t1", "a1", "metadata") # Fails and opens the breaker
+    CacheService.invalidate("t1", "a1", "metadata") # Rejected while open
+    assert breaker.state == CircuitState.OPEN
+    assert len(CacheService._pending_invalidations) == 1
+
+    remote.down = False
+    breaker.reset_timeout = 0
+    assert CacheService.get_json("t1", "a1", "metadata") is None
+    assert not CacheService._pending_invalidations
+    assert breaker.state == CircuitState.CLOSED
@@ -0,0 +1,51 @@
+import pytest
+
+from core.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+
+def _fail():
+    raise ConnectionError("dependency down")
+
+def test_breaker_opens_after_threshold_and_rejects():
+    breaker = CircuitBreaker("test_open", failure_threshold=2, reset_timeout=60)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
+
+def test_breaker_half_open_probe_closes_on_success():
+    breaker = CircuitBreaker("test_probe", failure_threshold=1, reset_timeout=0)
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CircuitState.CLOSED
+
+def test_breaker_half_open_probe_reopens_on_failure():
+    breaker = CircuitBreaker("test_reopen", failure_threshold=1, reset_timeout=0)
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    assert breaker.state == CircuitState.OPEN
+
+def test_outbox_worker_keeps_events_pending_on_kafka_timeout(monkeypatch):
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+    from core.events import KafkaTimeoutError
+    from models.outbox import OutboxStatus
+    from scripts import producer_worker
+
+    events = [SimpleNamespace(id=i, topic="t", payload={}, status=OutboxStatus.PENDING, retry_count=0) for i in range(2)]
+    db = MagicMock()
+    db.query.return_value.filter.return_value.order_by.return_value.limit.return_value.with_for_update.return_value.all.return_value = events
+    producer = MagicMock()
+    producer.send.side_effect = KafkaTimeoutError("Failed to update metadata")
+    monkeypatch.setattr(producer_worker, "SessionLocal", lambda: db)
+    monkeypatch.setattr(producer_worker.ProducerFactory, "get_producer", lambda **kwargs: producer)
+
+    producer_worker.process_outbox()
+    assert [e.status for e in events] == [OutboxStatus.PENDING] * 2
+    assert producer.send.call_count == 1
+    db.commit.assert_called_once()
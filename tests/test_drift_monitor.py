@@ -0,0 +1,49 @@
+import uuid
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from services.monitoring_service import DriftMonitor, EwmaState
+
+def test_ewma_tracks_mean_and_variance_of_a_stationary_stream():
+    values = np.random.RandomState(0).normal(100.0, 5.0, 5000)
+    state = EwmaState()
+    for v in values:
+        state.update(v, alpha=0.01)
+    assert abs(state.mean - 100.0) < 2.0
+    assert abs(np.sqrt(state.var) - 5.0) < 1.0
+
+def test_shift_is_flagged_after_warmup_and_metrics_are_batched():
+    monitor = DriftMonitor(alpha=0.04, warmup=20, threshold=3.0)
+    asset, model = uuid.uuid4(), uuid.uuid4()
+    rng = np.random.RandomState(1)
+    flags = [monitor.update(None, asset, model, v)[0] for v in rng.normal(100.0, 1.0, 50)]
+    assert not any(flags)
+
+    drifted, z = monitor.update(None, asset, model, 150.0)
+    assert drifted and z > 3.0
+    assert monitor.state(asset, model)["count"] == 51
+
+    db = MagicMock()
+    assert monitor.flush(db) == 1
+    (statement, rows), _ = db.execute.call_args
+    assert rows[0]["metric_name"] == "prediction_drift_zscore" and rows[0]["model_id"] == model
+    assert monitor.flush(MagicMock()) == 0
+
+def test_global_model_detections_are_exported_to_prometheus():
+    from prometheus_client import REGISTRY
+
+    def detections():
+        return REGISTRY.get_sample_value("prediction_drift_detections_total", {"scope": "global"}) or 0.0
+
+    monitor = DriftMonitor(alpha=0.04, warmup=20, threshold=3.0)
+    asset = uuid.uuid4()
+    for v in np.random.RandomState(2).normal(100.0, 1.0, 50):
+        monitor.update(None, asset, None, v)
+    before = detections()
+
+    drifted, _ = monitor.update(None, asset, None, 150.0)
+    assert drifted
+    assert detections() == before + 1
+    assert REGISTRY.get_sample_value("prediction_drift_zscore_count", {"scope": "global"}) >= 1
+    assert monitor.flush(MagicMock()) == 0 # No ml_model row to attach a ModelMetric to
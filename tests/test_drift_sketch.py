@@ -0,0 +1,35 @@
+import numpy as np
+from scipy import stats
+
+from ml.drift_sketch import ReferenceSketch, StreamingDriftEngine
+
+def _reference(rng, n_features=3):
+    X = rng.normal(0.0, 1.0, (5000, n_features))
+    return ReferenceSketch.fit(X, [f"s{i}" for i in range(n_features)], bins=20)
+
+def test_sketch_ks_tracks_exact_two_sample_ks():
+    rng = np.random.RandomState(0)
+    reference_rows = rng.normal(0.0, 1.0, (5000, 1))
+    sketch = ReferenceSketch.fit(reference_rows, ["s0"], bins=20)
+    live = rng.normal(0.5, 1.0, (2000, 1))
+
+    ks, psi = sketch.compare(live)
+    exact = stats.ks_2samp(reference_rows[:, 0], live[:, 0]).statistic
+    assert abs(ks[0] - exact) < 0.05
+    assert psi[0] > 0.2
+
+def test_streaming_engine_flags_only_the_shifted_feature_and_asset_type():
+    rng = np.random.RandomState(1)
+    engine = StreamingDriftEngine(psi_threshold=0.2, ks_threshold=0.15, min_samples=50)
+    engine.set_reference(_reference(rng))
+
+    for _ in range(300):
+        engine.update("Pump", [{"s0": rng.normal(), "s1": rng.normal(2.0, 1.0), "s2": rng.normal(), "note": "ok"}])
+        engine.update("Motor", [{"s0": rng.normal(), "s1": rng.normal(), "s2": rng.normal()}])
+    assert engine.evaluate() == 2
+
+    pump, motor = engine.status("Pump"), engine.status("Motor")
+    assert pump["status"] == "DRIFT_DETECTED"
+    assert [f["feature"] for f in pump["top_drifted"]] == ["s1"]
+    assert motor["status"] == "STABLE"
+    assert engine.status()["drifted_asset_types"] == ["Pump"]
@@ -0,0 +1,49 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import joblib
+import numpy as np
+
+from ml.feature_assembler import FeatureAssembler
+from ml.inference import InferenceEngine
+from models.registry import TaskType
+
+def test_dict_rows_are_ordered_normalized_and_imputed():
+    assembler = FeatureAssembler(
+        ["temp", "rpm", "vibration"],
+        {"temp": {"mean": 50, "std": 10}, "rpm": {"min": 0, "max": 2000}}
+    )
+    X = assembler.assemble([
+        {"vibration": 3.0, "temp": 70.0, "rpm": 1000.0, "unknown": 9.0},
+        {"rpm": 500.0}
+    ])
+
+    assert X.dtype == np.float32 and X.flags.c_contiguous
+    np.testing.assert_allclose(X, [[2.0, 0.5, 3.0], [0.0, 0.25, 0.0]])
+
+def test_columnar_params_and_columnar_input_match_row_assembly():
+    assembler = FeatureAssembler(["a", "b"], {"mean": [1.0, 2.0], "std": [2.0, 4.0]})
+    rows = [{"a": 3.0, "b": 6.0}, {"a": 5.0, "b": 10.0}]
+    columns = {"a": [3.0, 5.0], "b": [6.0, 10.0]}
+
+    np.testing.assert_allclose(assembler.assemble(rows), assembler.assemble_columns(columns))
+    np.testing.assert_allclose(assembler.assemble(rows), [[1.0, 1.0], [2.0, 2.0]])
+
+class _EchoFirstColumn:
+    def predict(self, X):
+        return X[:, 0]
+
+def test_tenant_model_receives_declared_feature_order(tmp_path):
+    path = tmp_path / "echo.pkl"
+    joblib.dump(_EchoFirstColumn(), path)
+    record = SimpleNamespace(
+        id=uuid.uuid4(), file_path=str(path), checksum=None,
+        input_feature_list=["rpm", "temp"], normalization_params=None
+    )
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = record
+
+    engine = InferenceEngine()
+    result = engine.predict_for_asset(db, TaskType.CLUSTERING, {"temp": 1.0, "rpm": 7.0}, org_id="org", asset_type="Pump")
+    assert result == {"cluster": 7}
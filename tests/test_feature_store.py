@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from ml.feature_store import AssetFeatureState, OnlineFeatureStore
+from pipelines.utils import compute_rolling_features
+
+def test_online_features_match_compute_rolling_features():
+    rng = np.random.default_rng(0)
+    window = 10
+    df = pd.DataFrame({
+        "s7": rng.normal(500, 10, 200),  # Large mean, small spread: stresses the std update
+        "s12": rng.normal(0, 1, 200).cumsum(),
+        "s3": rng.uniform(0, 5, 200)
+    })
+    sensors = list(df.columns)
+    expected = compute_rolling_features(df, window, sensors)
+
+    state = AssetFeatureState(sensors, window)
+    online = []
+    for i, row in enumerate(df.to_dict("records")):
+        vector = state.update(row).copy()
+        if i in expected.index:
+            assert state.ready
+            online.append(vector)
+
+    assert state.feature_names == list(expected.columns)
+    np.testing.assert_allclose(np.vstack(online), expected.values, rtol=1e-7, atol=1e-9)
+
+def test_read_batch_stacks_assets_in_request_order():
+    store = OnlineFeatureStore(window=3, max_assets=10)
+    store.update("a", {"v": 1.0})
+    store.update("b", {"v": 5.0})
+
+    batch = store.read_batch(["b", "missing", "a"])
+    assert batch.shape == (3, 5)
+    assert batch[0, 0] == 5.0 and batch[2, 0] == 1.0
+    assert np.isnan(batch[1]).all()
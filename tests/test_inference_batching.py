@@ -0,0 +1,76 @@
+import threading
+
+import numpy as np
+
+from ml.batching import MicroBatcher
+from ml.inference import InferenceEngine
+from models.registry import TaskType
+
+class _RecordingClassifier:
+    """sklearn-like stub that records the batch sizes it was called with."""
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, X):
+        self.batch_sizes.append(len(X))
+        return (np.asarray(X)[:, 0] > 0.5).astype(int)
+
+def test_concurrent_predictions_are_batched():
+    engine = InferenceEngine()
+    model = _RecordingClassifier()
+    engine.loaded_models[TaskType.CLUSTERING] = model
+    # Long window so all threads land in one batch
+    engine._batchers[TaskType.CLUSTERING] = MicroBatcher(
+        "test", lambda rows: engine.predict_batch(TaskType.CLUSTERING, rows), max_batch_size=8, max_wait_ms=200
+    )
+
+    results = {}
+    def call(i):
+        results[i] = engine.predict(TaskType.CLUSTERING, {"v": float(i % 2)})
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    assert sum(model.batch_sizes) == 8
+    assert len(model.batch_sizes) < 8
+    assert all(results[i] == {"cluster": i % 2} for i in range(8))
+
+def test_bad_row_does_not_fail_batch():
+    def batch_fn(rows):
+        if any(r is None for r in rows):
+            raise ValueError("bad row")
+        return [r * 2 for r in rows]
+
+    batcher = MicroBatcher("isolation", batch_fn, max_batch_size=4, max_wait_ms=100)
+    futures = [batcher.submit(x) for x in (1, None, 3)]
+    assert futures[0].result(timeout=1) == 2
+    assert isinstance(futures[1].exception(timeout=1), ValueError)
+    assert futures[2].result(timeout=1) == 6
+
+def test_timeout_cancels_queued_item_and_maps_to_overload():
+    import pytest
+    from ml.batching import BatcherOverloadedError, InferenceTimeoutError
+
+    release = threading.Event()
+    calls = []
+    def slow_fn(rows):
+        calls.append(list(rows))
+        release.wait(2)
+        return rows
+
+    batcher = MicroBatcher("timeout", slow_fn, max_batch_size=1, max_wait_ms=0)
+    busy = batcher.submit("first") # Occupies the worker
+    queued = batcher.submit("second")
+    with pytest.raises(BatcherOverloadedError):
+        batcher.result(queued, timeout=0.05)
+    assert queued.cancelled()
+    release.set()
+    assert busy.result(timeout=1) == "first"
+    assert ["second"] not in calls
+    assert issubclass(InferenceTimeoutError, BatcherOverloadedError) # Routers map it to 503
+
+def test_short_batch_result_fails_every_item():
+    batcher = MicroBatcher("short", lambda rows: rows[:-1], max_batch_size=2, max_wait_ms=200)
+    futures = [batcher.submit(x) for x in (1, 2)]
+    assert all(isinstance(f.exception(timeout=1), RuntimeError) for f in futures)
@@ -0,0 +1,58 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from prometheus_client import REGISTRY
+
+from ml.inference import InferenceEngine
+from ml.instrumentation import InferenceStats
+from models.ml import ModelMetric
+from models.registry import TaskType
+
+class _Clusterer:
+    def predict(self, X):
+        if np.isnan(X).any():
+            raise ValueError("NaN input")
+        return np.zeros(len(X), dtype=int)
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+def test_stages_batch_sizes_and_errors_are_labelled_by_version():
+    engine = InferenceEngine()
+    engine.result_cache = None
+    record = SimpleNamespace(id=uuid.uuid4(), name="km", version="v-metrics", artifact_path="unused.pkl")
+    engine._swap_model(TaskType.CLUSTERING, _Clusterer(), record)
+    labels = {"task": "clustering", "version": "v-metrics"}
+
+    engine.predict_batch(TaskType.CLUSTERING, [[0.1], [0.2], [0.3]])
+    with pytest.raises(ValueError):
+        engine.predict_batch(TaskType.CLUSTERING, [[float("nan")]])
+
+    assert _sample("inference_batch_size_count", **labels) == 2
+    assert _sample("inference_batch_size_sum", **labels) == 4
+    assert _sample("inference_stage_duration_seconds_count", stage="model", **labels) == 2
+    assert _sample("inference_errors_total", stage="model", **labels) == 1
+
+def test_flush_writes_model_metrics_and_registry_serving_stats():
+    stats = InferenceStats()
+    tenant_model, org = str(uuid.uuid4()), str(uuid.uuid4())
+    for latency in (1.0, 2.0, 3.0):
+        stats.record_batch(("ml_model", tenant_model, org), "rul", "tenant", rows=4, latency_ms=latency)
+    stats.record_batch(("ml_model", tenant_model, org), "rul", "tenant", rows=1, latency_ms=0.0, failed=True)
+    stats.record_batch(("registry", "reg-1", None), "rul", "v1", rows=2, latency_ms=5.0)
+
+    registry_record = SimpleNamespace(metrics={"rmse": 1.0})
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = registry_record
+
+    assert stats.flush(db) == 2
+    written = {m.metric_name: m.metric_value for m in (c.args[0] for c in db.add.call_args_list) if isinstance(m, ModelMetric)}
+    assert written["inference_latency_p50_ms"] == 2.0
+    assert written["inference_rows"] == 13
+    assert written["inference_error_rate"] == 0.25
+    assert registry_record.metrics["rmse"] == 1.0
+    assert registry_record.metrics["serving"]["inference_latency_p50_ms"] == 5.0
+    assert stats.flush(MagicMock()) == 0 # Aggregates reset after a flush
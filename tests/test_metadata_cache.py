@@ -0,0 +1,76 @@
+import uuid
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from models.metadata import AssetMetadata, AssetOperationProfile, AssetShiftSchedule, OperationMode
+from services.cache import CacheService, InMemoryCache
+from services.metadata_service import MetadataService
+from schemas.metadata import AssetMetadataSnapshot
+
+def _metadata(asset_id, version):
+    meta = AssetMetadata(
+        id=uuid.uuid4(), asset_id=asset_id, version=version, asset_type="Pump",
+        criticality_level="HIGH", failure_impact_score=7, created_at=datetime.utcnow(), updated_at=datetime.utcnow()
+    )
+    meta.operation_profile = AssetOperationProfile(
+        operation_mode=OperationMode.SHIFT_BASED, duty_cycle_percentage=80.0, cycle_detection_enabled=False
+    )
+    meta.shift_schedule = AssetShiftSchedule(
+        shift_start_time="06:00", shift_end_time="14:00", active_days=["MON", "TUE"],
+        timezone="UTC", allowed_tolerance_minutes=15
+    )
+    return meta
+
+def test_full_snapshot_served_from_cache():
+    asset_id = uuid.uuid4()
+    tenant_id = str(uuid.uuid4())
+    db = MagicMock()
+    CacheService._client = InMemoryCache()
+    try:
+        with patch.object(MetadataService, "_resolve_tenant", return_value=tenant_id), \
+             patch.object(MetadataService, "_load_metadata", return_value=_metadata(asset_id, 3)) as load:
+            first = MetadataService.get_metadata(db, asset_id)
+            second = MetadataService.get_metadata(db, asset_id)
+
+        assert load.call_count == 1 # Second read is a pure cache hit
+        assert isinstance(second, AssetMetadataSnapshot)
+        assert second == first
+        assert second.version == 3
+        assert second.operation_profile.operation_mode == OperationMode.SHIFT_BASED
+        assert second.shift_schedule.active_days == ("MON", "TUE")
+    finally:
+        CacheService._client = None
+
+def test_new_version_supersedes_snapshot():
+    asset_id = uuid.uuid4()
+    tenant_id = str(uuid.uuid4())
+    CacheService._client = InMemoryCache()
+    try:
+        MetadataService._publish_snapshot(tenant_id, _metadata(asset_id, 1))
+        MetadataService._publish_snapshot(tenant_id, _metadata(asset_id, 2))
+        with patch.object(MetadataService, "_resolve_tenant", return_value=tenant_id), \
+             patch.object(MetadataService, "_load_metadata") as load:
+            snapshot = MetadataService.get_metadata(MagicMock(), asset_id)
+        load.assert_not_called()
+        assert snapshot.version == 2
+    finally:
+        CacheService._client = None
+
+def test_cross_org_asset_is_not_loaded_or_cached_under_caller_tenant():
+    from sqlalchemy.dialects import postgresql
+
+    asset_id = uuid.uuid4()
+    caller_tenant = str(uuid.uuid4())
+    db = MagicMock()
+    query = db.query.return_value.options.return_value.filter.return_value
+    query.join.return_value.filter.return_value.first.return_value = None # Asset belongs to another org
+    CacheService._client = InMemoryCache()
+    try:
+        with patch.object(MetadataService, "_resolve_tenant", return_value=caller_tenant):
+            assert MetadataService.get_metadata(db, asset_id) is None
+        (condition,), _ = query.join.return_value.filter.call_args
+        assert "asset.org_id" in str(condition.compile(dialect=postgresql.dialect()))
+        assert CacheService.get_json(caller_tenant, str(asset_id), "metadata") is None
+        query.first.assert_not_called()
+    finally:
+        CacheService._client = None
@@ -0,0 +1,53 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import joblib
+import numpy as np
+from sklearn.cluster import KMeans
+
+from ml.inference import InferenceEngine
+from models.registry import TaskType
+
+def _record(path, version):
+    return SimpleNamespace(
+        id=uuid.uuid4(), name="clustering_model", version=version,
+        task_type=TaskType.CLUSTERING, artifact_path=str(path)
+    )
+
+def _artifact(tmp_path, name, n_clusters):
+    model = KMeans(n_clusters=n_clusters, n_init=1, random_state=0).fit(np.random.rand(20, 2))
+    path = tmp_path / name
+    joblib.dump(model, path)
+    return path
+
+def test_refresh_swaps_only_changed_models(tmp_path):
+    engine = InferenceEngine()
+    v1 = _record(_artifact(tmp_path, "v1.pkl", 2), "v1")
+    v2 = _record(_artifact(tmp_path, "v2.pkl", 3), "v2")
+
+    with patch("ml.inference.ModelRegistryService") as registry:
+        registry.return_value.get_active_models.return_value = [v1]
+        assert engine.refresh_models(MagicMock()) == [TaskType.CLUSTERING]
+        first = engine.loaded_models[TaskType.CLUSTERING]
+        assert engine.refresh_models(MagicMock()) == [] # Unchanged -> no reload
+
+        registry.return_value.get_active_models.return_value = [v2]
+        assert engine.refresh_models(MagicMock()) == [TaskType.CLUSTERING]
+
+    assert engine.loaded_models[TaskType.CLUSTERING] is not first
+    assert engine.model_versions[TaskType.CLUSTERING]["version"] == "v2"
+
+def test_broken_artifact_keeps_current_model(tmp_path):
+    engine = InferenceEngine()
+    good = _record(_artifact(tmp_path, "good.pkl", 2), "v1")
+    broken = _record(tmp_path / "missing.pkl", "v2")
+
+    with patch("ml.inference.ModelRegistryService") as registry:
+        registry.return_value.get_active_models.return_value = [good]
+        engine.refresh_models(MagicMock())
+        registry.return_value.get_active_models.return_value = [broken]
+        assert engine.refresh_models(MagicMock()) == []
+
+    assert engine.model_versions[TaskType.CLUSTERING]["version"] == "v1"
+    assert "cluster" in engine.predict_batch(TaskType.CLUSTERING, [[0.1, 0.2]])[0]
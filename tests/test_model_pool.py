@@ -0,0 +1,85 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import joblib
+import numpy as np
+from sklearn.cluster import KMeans
+
+from ml.model_pool import ModelPool
+
+def _artifact(tmp_path, name):
+    path = tmp_path / name
+    joblib.dump(KMeans(n_clusters=2, n_init=1, random_state=0).fit(np.random.rand(50, 4)), path)
+    return str(path)
+
+def _db_returning(path, checksum=None):
+    record = SimpleNamespace(id=uuid.uuid4(), file_path=path, checksum=checksum)
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = record
+    return db
+
+def test_tenants_sharing_an_artifact_share_one_copy(tmp_path):
+    pool = ModelPool(max_bytes=10**9)
+    path = _artifact(tmp_path, "shared.pkl")
+
+    _, model_a = pool.get(_db_returning(path), "org-a", "Pump", "clustering")
+    _, model_b = pool.get(_db_returning(path), "org-b", "Pump", "clustering")
+
+    assert model_a is model_b
+    assert pool.stats()["artifacts"] == 1
+
+def test_lru_eviction_under_budget(tmp_path):
+    paths = [_artifact(tmp_path, f"m{i}.pkl") for i in range(3)]
+    size = max(len(open(p, "rb").read()) for p in paths)
+    pool = ModelPool(max_bytes=int(size * 2.5))
+
+    for i, path in enumerate(paths):
+        pool.get(_db_returning(path), f"org-{i}", "Pump", "clustering")
+
+    stats = pool.stats()
+    assert stats["artifacts"] == 2
+    assert stats["resident_bytes"] <= pool.max_bytes
+
+def test_no_active_tenant_model_returns_none():
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = None
+    assert ModelPool(max_bytes=10**9).get(db, "org", "Pump", "rul") is None
+
+def test_shadow_loads_never_evict_live_models(tmp_path):
+    live_path, shadow_a, shadow_b = (_artifact(tmp_path, f"{n}.pkl") for n in ("live", "sa", "sb"))
+    size = max(len(open(p, "rb").read()) for p in (live_path, shadow_a, shadow_b))
+    pool = ModelPool(max_bytes=int(size * 1.5), shadow_max_bytes=int(size * 1.5))
+    _, live = pool.get(_db_returning(live_path), "org", "Pump", "clustering")
+
+    for path in (shadow_a, shadow_b):
+        resolution = pool._resolution_for(SimpleNamespace(id=uuid.uuid4(), file_path=path, checksum=None), 0)
+        pool.acquire(resolution, shadow=True)
+
+    stats = pool.stats()
+    assert stats["artifacts"] == 2 # live + the most recent shadow
+    assert stats["shadow_resident_bytes"] <= pool.shadow_max_bytes
+    assert pool.get(_db_returning(live_path), "org", "Pump", "clustering")[1] is live
+
+def test_assembler_follows_row_changes_evictions_and_key_cap(tmp_path):
+    paths = [_artifact(tmp_path, f"m{i}.pkl") for i in range(2)]
+    size = max(len(open(p, "rb").read()) for p in paths)
+    pool = ModelPool(max_bytes=int(size * 1.5), resolve_ttl_seconds=0, max_keys=1)
+    record = SimpleNamespace(
+        id=uuid.uuid4(), file_path=paths[0], checksum=None,
+        input_feature_list=["temp"], normalization_params={"temp": {"mean": 50, "std": 5}}
+    )
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = record
+
+    model_id, _ = pool.get(db, "org-a", "Pump", "clustering")
+    assert pool.assembler(model_id).offset[0] == 50
+    record.normalization_params = {"temp": {"mean": 60, "std": 5}} # Row updated
+    pool.get(db, "org-a", "Pump", "clustering")
+    assert pool.assembler(model_id).offset[0] == 60
+
+    # Loading another artifact evicts the first; its layout and resolution go with it
+    pool.get(_db_returning(paths[1]), "org-b", "Pump", "clustering")
+    assert pool.assembler(model_id) is None
+    assert pool.resolved_model_id("org-a", "Pump", "clustering") is None
+    assert len(pool._assemblers) <= 1 and pool.stats()["tenant_keys"] <= 1
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+import numpy as np
+from sklearn.cluster import KMeans
+
+from ml.artifacts import save_artifact
+from ml.model_selector import ModelSelectionEngine
+from ml.optimization import benchmark_serving
+from models.registry import TaskType
+
+def _candidate(name, accuracy, p95_ms, memory_bytes):
+    return SimpleNamespace(name=name, metrics={
+        "accuracy": accuracy,
+        "serving_benchmark": {"latency_p95_ms": p95_ms, "memory_bytes": memory_bytes}
+    })
+
+def test_most_accurate_model_within_budget_is_selected():
+    candidates = [
+        _candidate("big-ensemble", 0.97, p95_ms=40.0, memory_bytes=900_000_000),
+        _candidate("forest", 0.93, p95_ms=4.0, memory_bytes=50_000_000),
+        _candidate("tiny", 0.88, p95_ms=0.5, memory_bytes=1_000_000),
+        SimpleNamespace(name="unbenchmarked", metrics={"accuracy": 0.99}),
+    ]
+    select = ModelSelectionEngine.select_registered_model
+
+    assert select(candidates, TaskType.PRECURSOR, max_latency_ms=10.0).name == "forest"
+    assert select(candidates, TaskType.PRECURSOR, max_memory_bytes=10_000_000).name == "tiny"
+    assert select(candidates, TaskType.PRECURSOR).name == "unbenchmarked" # No budget: accuracy only
+    assert select(candidates, TaskType.PRECURSOR, max_latency_ms=0.1) is None
+
+def test_rul_ranks_by_lowest_rmse():
+    candidates = [
+        SimpleNamespace(name="lstm", metrics={"rmse": 12.0, "serving_benchmark": {"latency_p95_ms": 3.0}}),
+        SimpleNamespace(name="gbr", metrics={"rmse": 15.0, "serving_benchmark": {"latency_p95_ms": 0.5}}),
+    ]
+    assert ModelSelectionEngine.select_registered_model(candidates, TaskType.RUL, max_latency_ms=5.0).name == "lstm"
+
+def test_serving_benchmark_reports_latency_throughput_and_memory(tmp_path):
+    X = np.random.rand(32, 4)
+    model = KMeans(n_clusters=2, n_init=1).fit(X)
+    path = save_artifact(model, str(tmp_path), "km")
+
+    bench = benchmark_serving(TaskType.CLUSTERING, model, X, path, repeats=5)
+    assert bench["latency_p50_ms"] <= bench["latency_p95_ms"]
+    assert bench["batch_size"] == 32 and bench["throughput_rows_per_s"] > 0
+    assert bench["memory_bytes"] > 0
+
+def test_drift_reference_is_activated_when_a_serving_budget_is_set(monkeypatch, tmp_path):
+    from unittest.mock import MagicMock
+    from core.config import settings
+    from pipelines.training import DriftDetectionPipeline
+
+    monkeypatch.setattr(settings, "MODEL_SELECTION_LATENCY_BUDGET_MS", 5.0)
+    pipeline = DriftDetectionPipeline(MagicMock(), str(tmp_path), str(tmp_path), {})
+    pipeline.registry_service = MagicMock()
+    pipeline.run("drift", "1.0", TaskType.DRIFT, "synthetic")
+
+    assert pipeline.registry_service.register_model.call_args.kwargs["is_active"] is True
+    pipeline.registry_service.activate_best_model.assert_not_called()
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from ml.artifacts import save_artifact, load_artifact
+from ml.inference import infer_arrays, format_results
+from ml.optimization import optimize_artifact
+from models.registry import TaskType
+from pipelines.training import SimpleLSTM
+
+pytest.importorskip("onnxruntime")
+
+def test_tree_ensemble_onnx_export_is_benchmarked(tmp_path):
+    pytest.importorskip("skl2onnx")
+    rng = np.random.default_rng(0)
+    X = rng.random((200, 5))
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, (X[:, 0] > 0.5).astype(int))
+    original = save_artifact(model, str(tmp_path), "rf")
+
+    path, report = optimize_artifact(model, TaskType.PRECURSOR, X[:32], original, str(tmp_path), "rf", repeats=3)
+
+    onnx = report["candidates"]["onnx"]
+    assert onnx["fidelity"] >= 0.99 and onnx["accepted"]
+    assert report["selected_backend"] in ("native", "onnx")
+    results = format_results(TaskType.PRECURSOR, infer_arrays(TaskType.PRECURSOR, load_artifact(path), X[:4]))
+    assert all(len(r["probabilities"]) == 2 for r in results)
+
+def test_lstm_onnx_artifact_matches_torch(tmp_path):
+    pytest.importorskip("onnx")
+    model = SimpleLSTM(4, 16, 1).eval()
+    X = np.random.default_rng(1).random((8, 30, 4)).astype(np.float32)
+    original = save_artifact(model, str(tmp_path), "lstm")
+
+    _, report = optimize_artifact(model, TaskType.RUL, X, original, str(tmp_path), "lstm", repeats=3)
+
+    exported = load_artifact(report["candidates"]["onnx"]["path"])
+    np.testing.assert_allclose(
+        infer_arrays(TaskType.RUL, exported, X), infer_arrays(TaskType.RUL, model, X), rtol=1e-4, atol=1e-5
+    )
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from fastapi import BackgroundTasks
+
+from api.routers import predictions
+from schemas.prediction import PredictionRequest
+
+def _health(**overrides):
+    values = dict(
+        mechanical_health_score=90.0, thermal_health_score=95.0, electrical_health_score=99.0,
+        operational_health_score=92.0, total_cumulative_damage=0.1, confidence_score=0.9,
+        damage_rate_history=[]
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+def test_health_and_inference_stages_overlap_and_side_effects_are_deferred(monkeypatch):
+    org_id = uuid.uuid4()
+    asset = SimpleNamespace(id=uuid.uuid4(), org_id=org_id, type="Pump")
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = asset
+    # Each stage waits for the other: a sequential pipeline would time out here
+    barrier = threading.Barrier(2, timeout=5)
+
+    def health_stage(db, asset_id):
+        barrier.wait()
+        return _health(damage_rate_history=[0.001] * 10 + [0.01] * 5, operational_health_score=50.0)
+
+    def inference_stage(db, task, data, **kwargs):
+        barrier.wait()
+        return {"rul": 42.0}
+
+    monkeypatch.setattr(predictions.IntelligenceService, "ingest_sensor_data", lambda db, asset_id, data: "batch")
+    monkeypatch.setattr(predictions.IntelligenceService, "get_asset_health_state", health_stage)
+    monkeypatch.setattr(predictions.IntelligenceService, "get_probabilistic_rul", lambda db, asset_id, **kw: {"mean": 10.0})
+    monkeypatch.setattr(predictions.engine, "predict_for_asset", inference_stage)
+    monkeypatch.setattr(predictions, "SessionLocal", MagicMock)
+    restore_threads = []
+    monkeypatch.setattr(
+        "services.monitoring_service.CacheService.get_json",
+        lambda *args: restore_threads.append(threading.current_thread())
+    )
+
+    background = BackgroundTasks()
+    response = asyncio.run(predictions.predict(
+        background_tasks=background,
+        db=db,
+        pred_in=PredictionRequest(asset_id=asset.id, data={"temperature": 70.0}),
+        current_user=SimpleNamespace(org_id=org_id)
+    ))
+
+    prediction = response["prediction"]
+    assert prediction["ml_prediction"] == {"rul": 42.0}
+    assert prediction["rul_estimate"] == {"mean": 10.0}
+    assert prediction["active_alert"]["pending"] is True
+    assert [t.func for t in background.tasks] == [predictions._raise_alert]
+    # The drift state restore (a Redis read) must not block the event loop
+    assert restore_threads and threading.main_thread() not in restore_threads
+
+def test_inference_error_waits_for_ingestion_to_finish(monkeypatch):
+    import time
+    import pytest
+    from fastapi import HTTPException
+
+    asset = SimpleNamespace(id=uuid.uuid4(), org_id=uuid.uuid4(), type="Pump")
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = asset
+    finished = []
+
+    def slow_ingest(db, asset_id, data):
+        time.sleep(0.2)
+        finished.append(True)
+
+    def failing_inference(db, task, data, **kwargs):
+        raise ValueError("No model available")
+
+    monkeypatch.setattr(predictions.IntelligenceService, "ingest_sensor_data", slow_ingest)
+    monkeypatch.setattr(predictions.IntelligenceService, "get_asset_health_state", lambda db, asset_id: _health())
+    monkeypatch.setattr(predictions.IntelligenceService, "get_probabilistic_rul", lambda db, asset_id, **kw: {"mean": 10.0})
+    monkeypatch.setattr(predictions.engine, "predict_for_asset", failing_inference)
+    monkeypatch.setattr(predictions, "SessionLocal", MagicMock)
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(predictions.predict(
+            background_tasks=BackgroundTasks(),
+            db=db,
+            pred_in=PredictionRequest(asset_id=asset.id, data={"temperature": 70.0}),
+            current_user=SimpleNamespace(org_id=asset.org_id)
+        ))
+    assert exc.value.status_code == 503
+    assert finished == [True]
+    db.commit.assert_called_once()
@@ -0,0 +1,32 @@
+import uuid
+from unittest.mock import MagicMock
+
+from services.prediction_writer import PredictionWriter
+
+def test_flush_writes_in_batches_and_buffer_is_bounded():
+    writer = PredictionWriter(max_buffer=5, batch_size=2)
+    org, asset = uuid.uuid4(), uuid.uuid4()
+    accepted = [writer.record(org, asset, None, {"rul": float(i)}) for i in range(7)]
+    assert accepted == [True] * 5 + [False] * 2
+
+    db = MagicMock()
+    assert writer.flush(db) == 5
+    batch_sizes = [len(call.args[1]) for call in db.execute.call_args_list]
+    assert batch_sizes == [2, 2, 1]
+    assert [row["result"]["rul"] for call in db.execute.call_args_list for row in call.args[1]] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert writer.pending() == 0
+
+def test_stop_drains_remaining_rows():
+    writer = PredictionWriter(max_buffer=100, batch_size=50)
+    sessions = []
+    def session_factory():
+        sessions.append(MagicMock())
+        return sessions[-1]
+
+    writer.start(session_factory, interval_seconds=60.0)
+    for i in range(3):
+        writer.record(uuid.uuid4(), uuid.uuid4(), None, {"class": i})
+    writer.stop()
+
+    assert writer.pending() == 0
+    assert sum(len(c.args[1]) for s in sessions for c in s.execute.call_args_list) == 3
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from sklearn.cluster import KMeans
+
+from ml.artifacts import save_artifact
+from ml.batching import BatcherOverloadedError
+from ml.inference import InferenceEngine
+from ml.process_pool import ProcessInferenceExecutor
+from models.registry import TaskType
+
+def test_worker_process_matches_in_process_inference(tmp_path):
+    model = KMeans(n_clusters=3, n_init=1, random_state=0).fit(np.random.rand(60, 4))
+    path = save_artifact(model, str(tmp_path), "km")
+    rows = np.random.rand(16, 4).tolist()
+
+    engine = InferenceEngine()
+    engine.loaded_models[TaskType.CLUSTERING] = model
+    engine.model_versions[TaskType.CLUSTERING] = {"id": "m1", "artifact_path": path}
+    expected = engine.predict_batch(TaskType.CLUSTERING, rows)
+
+    engine.start_process_executor(workers=1, max_pending=4)
+    try:
+        assert engine.predict_batch(TaskType.CLUSTERING, rows) == expected
+    finally:
+        engine.stop_process_executor()
+
+def test_executor_sheds_load_when_queue_is_full():
+    executor = ProcessInferenceExecutor(workers=1, max_pending=1)
+    executor._slots.acquire() # Simulate one call already in flight
+    try:
+        with pytest.raises(BatcherOverloadedError):
+            executor.infer(TaskType.CLUSTERING, "unused.pkl", np.zeros((1, 4)))
+    finally:
+        executor._slots.release()
+        executor.shutdown()
+
+def test_dead_worker_is_replaced_and_the_call_retried(tmp_path):
+    model = KMeans(n_clusters=2, n_init=1, random_state=0).fit(np.random.rand(40, 4))
+    path = save_artifact(model, str(tmp_path), "km")
+    X = np.random.rand(8, 4)
+
+    executor = ProcessInferenceExecutor(workers=1, max_pending=2, preload_paths=[path])
+    try:
+        expected = executor.infer(TaskType.CLUSTERING, path, X)
+        broken = executor._pool
+        for process in list(broken._processes.values()):
+            process.kill() # Simulate an OOM kill
+        assert np.array_equal(executor.infer(TaskType.CLUSTERING, path, X), expected)
+        assert executor._pool is not broken
+    finally:
+        executor.shutdown()
@@ -0,0 +1,71 @@
+import uuid
+
+import pytest
+
+from core import ratelimit
+from core.ratelimit import TokenBucketLimiter, parse_rate
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    return now
+
+def local_limiter(limits, overrides=None):
+    limiter = TokenBucketLimiter(limits, overrides or {})
+    limiter._redis_script = lambda: None # No Redis here: exercise the local buckets
+    return limiter
+
+def test_parse_rate():
+    assert parse_rate("600/minute") == (10.0, 600.0)
+    assert parse_rate("5/seconds") == (5.0, 5.0)
+
+def test_bucket_denies_when_empty_and_refills(clock):
+    limiter = local_limiter({"ingestion": "3/second"})
+    org = uuid.uuid4()
+    assert [limiter.acquire(org, "ingestion").allowed for _ in range(4)] == [True, True, True, False]
+
+    denied = limiter.acquire(org, "ingestion")
+    assert denied.retry_after == pytest.approx(1 / 3)
+    clock[0] += 0.5
+    assert limiter.acquire(org, "ingestion").allowed
+    assert not limiter.acquire(org, "ingestion").allowed
+
+def test_tenants_and_classes_are_isolated(clock):
+    limiter = local_limiter({"ingestion": "1/minute", "analytics": "1/minute"}, {"Enterprise": {"ingestion": "2/minute"}})
+    noisy, quiet, big = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    assert limiter.acquire(noisy, "ingestion").allowed
+    assert not limiter.acquire(noisy, "ingestion").allowed
+    assert limiter.acquire(noisy, "analytics").allowed
+    assert limiter.acquire(quiet, "ingestion").allowed
+    assert [limiter.acquire(big, "ingestion", tier="Enterprise").allowed for _ in range(3)] == [True, True, False]
+    assert limiter.acquire(noisy, "unlisted").allowed
+
+def test_redis_script_is_kept_when_redis_was_down_at_startup(monkeypatch):
+    from unittest.mock import MagicMock
+    from services.cache import CacheService
+
+    client = MagicMock() # A redis.Redis whose first ping failed
+    monkeypatch.setattr(CacheService, "_client", client)
+    limiter = TokenBucketLimiter({"ingestion": "3/second"}, {})
+    assert limiter._redis_script() is client.register_script.return_value
+
+def test_plan_changes_reach_the_limiter_after_the_tier_ttl(monkeypatch):
+    from unittest.mock import MagicMock
+    from api import deps
+
+    now = [1000.0]
+    monkeypatch.setattr("services.cache.time.monotonic", lambda: now[0])
+    monkeypatch.setattr(deps, "_tenant_tiers", None)
+    monkeypatch.setattr(deps.config.settings, "TENANT_TIER_CACHE_TTL_SECONDS", 60)
+    db = MagicMock()
+    lookup = db.query.return_value.join.return_value.filter.return_value.scalar
+    org = uuid.uuid4()
+
+    lookup.return_value = "Starter"
+    assert deps.get_tenant_tier(db, org) == "Starter"
+    lookup.return_value = "Enterprise" # Upgraded
+    assert deps.get_tenant_tier(db, org) == "Starter"
+    now[0] += 61
+    assert deps.get_tenant_tier(db, org) == "Enterprise"
+    assert lookup.call_count == 2
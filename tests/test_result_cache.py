@@ -0,0 +1,45 @@
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+
+from ml.inference import InferenceEngine
+from ml.result_cache import InferenceResultCache
+from models.registry import TaskType
+
+class _CountingModel:
+    def __init__(self, offset=0):
+        self.offset = offset
+        self.rows_seen = 0
+
+    def predict(self, X):
+        self.rows_seen += len(X)
+        return (X[:, 0] > 0.5).astype(int) + self.offset
+
+def _swap_in(engine, model):
+    record = SimpleNamespace(id=uuid.uuid4(), name="clf", version="v", artifact_path="unused.pkl")
+    engine._swap_model(TaskType.CLUSTERING, model, record)
+
+def test_repeated_inputs_skip_model_until_swap():
+    engine = InferenceEngine()
+    first = _CountingModel()
+    _swap_in(engine, first)
+
+    assert engine.predict_batch(TaskType.CLUSTERING, [[0.9], [0.1]]) == [{"cluster": 1}, {"cluster": 0}]
+    # Float noise below the quantization step still hits; only the new row runs
+    assert engine.predict_batch(TaskType.CLUSTERING, [[0.9000001], [0.7]]) == [{"cluster": 1}, {"cluster": 1}]
+    assert first.rows_seen == 3
+
+    second = _CountingModel(offset=10)
+    _swap_in(engine, second)
+    assert engine.predict_batch(TaskType.CLUSTERING, [[0.9]]) == [{"cluster": 11}]
+    assert second.rows_seen == 1
+    assert len(engine.result_cache) == 1 # Old model's entries were dropped
+
+def test_cache_is_bounded():
+    cache = InferenceResultCache(max_entries=2)
+    keys = [cache.make_key("m", TaskType.RUL, np.array([float(i)])) for i in range(3)]
+    for key in keys:
+        cache.put(key, {"rul": 1.0})
+    assert len(cache) == 2
+    assert cache.get(keys[0]) is None
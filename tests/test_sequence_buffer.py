@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+import torch
+
+from ml.inference import InferenceEngine
+from ml.sequence_buffer import SequenceRingBuffer, SequenceBufferStore
+from models.registry import TaskType
+
+def test_window_is_ordered_view_after_wraparound():
+    buffer = SequenceRingBuffer(seq_len=3, width=2)
+    for i in range(5):
+        buffer.append([i, i * 10])
+
+    window = buffer.window()
+    np.testing.assert_array_equal(window, [[2, 20], [3, 30], [4, 40]])
+    assert np.shares_memory(window, buffer._buf)
+    assert buffer.ready
+
+def test_window_is_edge_padded_until_full():
+    buffer = SequenceRingBuffer(seq_len=4, width=1)
+    buffer.append([7])
+    buffer.append([8])
+    np.testing.assert_array_equal(buffer.window().ravel(), [7, 7, 7, 8])
+    assert not buffer.ready
+
+def test_store_evicts_least_recent_asset():
+    store = SequenceBufferStore(seq_len=2, max_assets=2)
+    store.append("a", [1.0])
+    store.append("b", [1.0])
+    store.append("a", [2.0])
+    store.append("c", [1.0])
+    assert store.window("b") is None
+    assert store.window("a") is not None
+
+class _LastStepSum(torch.nn.Module):
+    """Records input shapes; 'RUL' is the sum of the most recent reading."""
+    def __init__(self):
+        super().__init__()
+        self.shapes = []
+
+    def forward(self, x):
+        self.shapes.append(tuple(x.shape))
+        return x[:, -1, :].sum(dim=1, keepdim=True)
+
+def test_rul_model_sees_asset_window(monkeypatch):
+    from core.config import settings
+    monkeypatch.setattr(settings, "INFERENCE_BATCHING_ENABLED", False)
+    engine = InferenceEngine()
+    model = _LastStepSum()
+    engine.loaded_models[TaskType.RUL] = model
+
+    for i in range(3):
+        result = engine.predict_for_asset(None, TaskType.RUL, {"a": float(i), "b": 1.0}, asset_id="pump-1")
+
+    # Last step = [a, b, a_mean, a_std, a_roc, a_slope, b_mean, b_std, b_roc, b_slope]
+    #          = [2, 1, 1,      1,     1,     0.2,     1,      0,     0,     0]
+    assert result["rul"] == pytest.approx(7.2)
+    assert model.shapes[-1] == (1, settings.RUL_SEQUENCE_LENGTH, 10)
+
+def test_appended_window_is_detached_from_the_ring_buffer():
+    engine = InferenceEngine()
+    first = engine._append_reading("pump-1", {"a": 1.0}, None)
+    snapshot = first.copy()
+    engine._append_reading("pump-1", {"a": 5.0}, None)
+    np.testing.assert_array_equal(first, snapshot)
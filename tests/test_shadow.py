@@ -0,0 +1,78 @@
+import time
+import uuid
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import joblib
+import numpy as np
+from sklearn.cluster import KMeans
+
+from ml.inference import InferenceEngine
+from ml.shadow import ShadowEvaluator
+from models.registry import TaskType
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+def test_agreement_and_latency_per_candidate():
+    candidates = [SimpleNamespace(model_id="close"), SimpleNamespace(model_id="far")]
+    outputs = {"close": 104.0, "far": 150.0}
+    evaluator = ShadowEvaluator(lambda task, c, data: {"rul": outputs[c.model_id]}, rul_tolerance=0.1)
+
+    for _ in range(3):
+        assert evaluator.submit(TaskType.RUL, [1.0], {"rul": 100.0}, candidates)
+
+    assert _wait_for(lambda: evaluator.stats("far").get("evaluated") == 3)
+    assert evaluator.stats("close")["agreement_rate"] == 1.0
+    assert evaluator.stats("far")["agreement_rate"] == 0.0
+    assert evaluator.stats("far")["mean_abs_diff"] == 50.0
+
+def test_full_queue_drops_instead_of_blocking():
+    release = threading.Event()
+    evaluator = ShadowEvaluator(lambda task, c, data: release.wait() and {"class": 0}, max_queue_size=1)
+    candidates = [SimpleNamespace(model_id="slow")]
+
+    results = [evaluator.submit(TaskType.PRECURSOR, {}, {"class": 0}, candidates) for _ in range(5)]
+    release.set()
+
+    assert results[0] and not all(results)
+
+def test_engine_mirrors_tenant_requests_to_shadow_models(tmp_path, monkeypatch):
+    monkeypatch.setattr("ml.inference.settings.INFERENCE_BATCHING_ENABLED", False)
+    X = np.random.RandomState(0).rand(50, 3)
+    paths = []
+    for name, seed in (("live.pkl", 0), ("shadow.pkl", 1)):
+        joblib.dump(KMeans(n_clusters=2, n_init=1, random_state=seed).fit(X), tmp_path / name)
+        paths.append(str(tmp_path / name))
+    live = SimpleNamespace(id=uuid.uuid4(), file_path=paths[0], checksum=None)
+    shadow = SimpleNamespace(id=uuid.uuid4(), file_path=paths[1], checksum=None)
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = live
+    db.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [shadow]
+
+    engine = InferenceEngine()
+    engine.result_cache = None
+    result = engine.predict_for_asset(db, TaskType.CLUSTERING, [0.2, 0.4, 0.6], org_id="org", asset_type="Pump")
+
+    assert "cluster" in result
+    assert _wait_for(lambda: engine.shadow.stats(str(shadow.id)).get("evaluated") == 1)
+    assert engine.shadow.stats(str(live.id)) == {}
+
+def test_legacy_shadow_rows_need_the_explicit_opt_in():
+    from db.timescaledb import init_timescaledb
+    from ml.model_pool import ModelPool
+
+    db = MagicMock()
+    db.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = []
+    ModelPool(max_bytes=10**9).shadow_candidates(db, uuid.uuid4(), "Pump", TaskType.RUL)
+    stages = [c.right.value for c in db.query.return_value.filter.call_args.args if getattr(c.left, "name", None) == "deployment_stage"]
+    assert stages == ["shadow_evaluation"]
+
+    db = MagicMock()
+    init_timescaledb(db)
+    statements = [str(call.args[0]) for call in db.execute.call_args_list]
+    assert any("SET deployment_stage" in s and "WHERE deployment_stage = 'shadow'" in s for s in statements)